@@ -4,6 +4,8 @@ import plotly.express as px
 import pandas as pd
 import pandas as pd
 from dashboards.usable_methods import default_if_empty, ensure_list, download_file
+from dashboards import figure_cache
+from config import Config
 import pandas as pd
 import plotly.express as px
 import random
@@ -43,6 +45,7 @@ class ResearchOutputPlot:
                 target_dict[value] = chosen_color
                 used_colors.add(chosen_color)
     
+    @figure_cache.cached('institutional_performance.update_line_plot', ttl=Config.FIGURE_CACHE_QUERY_TTL)
     def update_line_plot(self, user_id, college_colors, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, default_years, selected_pub_format):
         selected_colleges = ensure_list(selected_colleges)
         selected_programs = ensure_list(selected_programs)
@@ -138,6 +141,7 @@ class ResearchOutputPlot:
         
         return fig_line
 
+    @figure_cache.cached('institutional_performance.update_pie_chart', ttl=Config.FIGURE_CACHE_QUERY_TTL)
     def update_pie_chart(self, user_id, college_colors, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, selected_pub_format):
         selected_colleges = ensure_list(selected_colleges)
         selected_programs = ensure_list(selected_programs)
@@ -194,6 +198,7 @@ class ResearchOutputPlot:
         
         return fig_pie
     
+    @figure_cache.cached('institutional_performance.update_research_type_bar_plot', ttl=Config.FIGURE_CACHE_QUERY_TTL)
     def update_research_type_bar_plot(self, user_id, college_colors, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, selected_pub_format):
         selected_colleges = ensure_list(selected_colleges)
         selected_programs = ensure_list(selected_programs)
@@ -253,6 +258,7 @@ class ResearchOutputPlot:
         
         return fig
     
+    @figure_cache.cached('institutional_performance.update_research_status_bar_plot', ttl=Config.FIGURE_CACHE_QUERY_TTL)
     def update_research_status_bar_plot(self, user_id, college_colors, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, selected_pub_format):
         selected_colleges = ensure_list(selected_colleges)
         selected_programs = ensure_list(selected_programs)
@@ -294,6 +300,8 @@ class ResearchOutputPlot:
         status_count = df.groupby(['status', group_by_col]).size().reset_index(name='Count')
         pivot_df = status_count.pivot(index='status', columns=group_by_col, values='Count').fillna(0)
 
+        if group_by_col == 'program_id':
+            self.assign_colors(df, 'program_id')  # not left behind by other charts when they were cached
         colors = (
             college_colors if group_by_col == 'college_id' else 
             self.program_colors if user_id in ["02", "04"] else 
@@ -323,6 +331,7 @@ class ResearchOutputPlot:
 
         return fig
     
+    @figure_cache.cached('institutional_performance.create_publication_bar_chart', ttl=Config.FIGURE_CACHE_QUERY_TTL)
     def create_publication_bar_chart(self, user_id, college_colors, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, selected_pub_format):
         selected_colleges = ensure_list(selected_colleges)
         selected_programs = ensure_list(selected_programs)
@@ -374,6 +383,7 @@ class ResearchOutputPlot:
         
         return fig_bar
     
+    @figure_cache.cached('institutional_performance.update_publication_format_bar_plot', ttl=Config.FIGURE_CACHE_QUERY_TTL)
     def update_publication_format_bar_plot(self, user_id, college_colors, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, selected_pub_format):
         selected_colleges = ensure_list(selected_colleges)
         selected_programs = ensure_list(selected_programs)
@@ -435,6 +445,7 @@ class ResearchOutputPlot:
         
         return fig_bar
     
+    @figure_cache.cached('institutional_performance.update_sdg_chart', ttl=Config.FIGURE_CACHE_QUERY_TTL)
     def update_sdg_chart(self, user_id, college_colors, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, selected_pub_format):
         selected_colleges = ensure_list(selected_colleges)
         selected_programs = ensure_list(selected_programs)
@@ -568,6 +579,7 @@ class ResearchOutputPlot:
         
         return fig
 
+    @figure_cache.cached('institutional_performance.scopus_line_graph', ttl=Config.FIGURE_CACHE_QUERY_TTL)
     def scopus_line_graph(self, user_id, college_colors, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, default_years, selected_pub_format):
         selected_colleges = ensure_list(selected_colleges)
         selected_programs = ensure_list(selected_programs)
@@ -628,6 +640,7 @@ class ResearchOutputPlot:
         return fig_line
 
 
+    @figure_cache.cached('institutional_performance.scopus_pie_chart', ttl=Config.FIGURE_CACHE_QUERY_TTL)
     def scopus_pie_chart(self, user_id, college_colors, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, selected_pub_format):
         selected_colleges = ensure_list(selected_colleges)
         selected_programs = ensure_list(selected_programs)
@@ -679,6 +692,7 @@ class ResearchOutputPlot:
 
         return fig_pie
     
+    @figure_cache.cached('institutional_performance.publication_format_line_plot', ttl=Config.FIGURE_CACHE_QUERY_TTL)
     def publication_format_line_plot(self, user_id, college_colors, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, default_years, selected_pub_format):
         selected_colleges = ensure_list(selected_colleges)
         selected_programs = ensure_list(selected_programs)
@@ -757,6 +771,7 @@ class ResearchOutputPlot:
 
         return fig_line
 
+    @figure_cache.cached('institutional_performance.publication_format_pie_chart', ttl=Config.FIGURE_CACHE_QUERY_TTL)
     def publication_format_pie_chart(self, user_id, college_colors, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, selected_pub_format):
         selected_colleges = ensure_list(selected_colleges)
         selected_programs = ensure_list(selected_programs)
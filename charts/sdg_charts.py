@@ -2,7 +2,7 @@ from database.sdg_queries import get_research_count, get_research_percentage, ge
 import pandas as pd
 import plotly.express as px
 from services.sdg_colors import sdg_colors
-from dashboards import db_manager
+from dashboards import db_manager, figure_cache
 from models import ResearchTypes
 import numpy as np
 import matplotlib.pyplot as plt
@@ -14,7 +14,8 @@ import dash_html_components as html
 import plotly.graph_objects as go
 import networkx as nx
 from dashboards.usable_methods import get_gradient_color
-from config import stop_words,lemmatizer
+from services.graph_traces import graph_arrays, edge_coordinates
+from config import Config, stop_words,lemmatizer
 from collections import Counter
 from nltk.tag import pos_tag
 
@@ -22,6 +23,7 @@ import pandas as pd
 import plotly.express as px
 import numpy as np
 
+@figure_cache.cached('sdg_charts.create_sdg_plot', ttl=Config.FIGURE_CACHE_QUERY_TTL)
 def create_sdg_plot(selected_colleges, selected_status, selected_years, sdg_dropdown_value, selected_pub_form):
     all_sdgs = [f'SDG {i}' for i in range(1, 18)]
     
@@ -130,6 +132,7 @@ def create_sdg_plot(selected_colleges, selected_status, selected_years, sdg_drop
 
 
 
+@figure_cache.cached('sdg_charts.create_sdg_pie_chart', ttl=Config.FIGURE_CACHE_QUERY_TTL)
 def create_sdg_pie_chart(selected_colleges, selected_status, selected_years, sdg_dropdown_value,selected_pub_form):
     """
     Creates a pie chart showing the percentage distribution of research outputs by SDG or College.
@@ -210,6 +213,7 @@ def create_sdg_pie_chart(selected_colleges, selected_status, selected_years, sdg
     return fig
 
 
+@figure_cache.cached('sdg_charts.create_sdg_research_chart', ttl=Config.FIGURE_CACHE_QUERY_TTL)
 def create_sdg_research_chart(selected_colleges, selected_status, selected_years, sdg_dropdown_value, selected_pub_form):
     """
     Generates a stacked bar chart showing research type distribution by SDG or by research type (depending on selection).
@@ -324,6 +328,7 @@ def create_sdg_research_chart(selected_colleges, selected_status, selected_years
 
 
 
+@figure_cache.cached('sdg_charts.create_geographical_heatmap', ttl=Config.FIGURE_CACHE_QUERY_TTL)
 def create_geographical_heatmap(selected_colleges, selected_status, selected_years, sdg_dropdown_value):
     """
     Generates a choropleth heatmap for the geographical distribution of research outputs.
@@ -410,6 +415,7 @@ def create_geographical_heatmap(selected_colleges, selected_status, selected_yea
 
     return fig
 
+@figure_cache.cached('sdg_charts.create_geographical_treemap', ttl=Config.FIGURE_CACHE_QUERY_TTL)
 def create_geographical_treemap(selected_colleges, selected_status, selected_years, sdg_dropdown_value):
     """
     Generates a treemap for the geographical distribution of research outputs,
@@ -502,6 +508,7 @@ def create_geographical_treemap(selected_colleges, selected_status, selected_yea
 
     return fig
 
+@figure_cache.cached('sdg_charts.create_conference_participation_bar_chart', ttl=Config.FIGURE_CACHE_QUERY_TTL)
 def create_conference_participation_bar_chart(selected_colleges, selected_status, selected_years, sdg_dropdown_value):
     """
     Generates a bar chart showing the number of conference participations per year.
@@ -609,6 +616,7 @@ def create_conference_participation_bar_chart(selected_colleges, selected_status
 
 
 
+@figure_cache.cached('sdg_charts.create_local_vs_foreign_donut_chart', ttl=Config.FIGURE_CACHE_QUERY_TTL)
 def create_local_vs_foreign_donut_chart(selected_colleges, selected_status, selected_years, sdg_dropdown_value):
     """
     Generates a donut chart comparing local vs. foreign research proceedings.
@@ -715,6 +723,7 @@ def preprocess_text(text):
     return " ".join(processed_words)
 
 
+@figure_cache.cached('sdg_charts.get_word_cloud', ttl=Config.FIGURE_CACHE_QUERY_TTL)
 def get_word_cloud(selected_colleges, selected_status, selected_years, sdg_dropdown_value, pub_format_filter=None):
     """
     Generates a word cloud from research titles, abstracts, and keywords and returns it as a Plotly Figure.
@@ -843,6 +852,7 @@ def get_word_cloud(selected_colleges, selected_status, selected_years, sdg_dropd
 
 
 
+@figure_cache.cached('sdg_charts.generate_research_area_visualization', ttl=Config.FIGURE_CACHE_QUERY_TTL)
 def generate_research_area_visualization(selected_colleges, selected_status, selected_years, sdg_dropdown_value="ALL", pub_format_filter=None):
     """
     Generates an interactive stacked bar chart of research areas per SDG.
@@ -996,6 +1006,7 @@ def generate_research_area_visualization(selected_colleges, selected_status, sel
     return fig
 
 
+@figure_cache.cached('sdg_charts.visualize_sdg_impact', ttl=Config.FIGURE_CACHE_QUERY_TTL)
 def visualize_sdg_impact(selected_colleges, selected_status, selected_years, sdg_dropdown_value, selected_pub_form):
     """
     Visualizes SDG research impact using a bar graph.
@@ -1111,6 +1122,7 @@ def visualize_sdg_impact(selected_colleges, selected_status, selected_years, sdg
 
 
 
+@figure_cache.cached('sdg_charts.generate_sdg_bipartite_graph', ttl=Config.FIGURE_CACHE_QUERY_TTL)
 def generate_sdg_bipartite_graph(selected_colleges, selected_status, selected_years, sdg_dropdown_value, pub_format_filter=None):
     """
     Generates a bipartite graph showing relationships between SDGs based on shared research.
@@ -1208,14 +1220,11 @@ def generate_sdg_bipartite_graph(selected_colleges, selected_status, selected_ye
     # Get node positions
     pos = nx.spring_layout(G, seed=42)  # Position nodes
 
-    # Create edge traces
-    edge_x, edge_y = [], []
+    # Positions and edges as arrays
+    nodes, positions, edge_index = graph_arrays(G, pos)
 
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
+    # Create edge traces
+    edge_x, edge_y = edge_coordinates(positions, edge_index)
 
     edge_trace = go.Scatter(
         x=edge_x, y=edge_y,
@@ -1225,20 +1234,14 @@ def generate_sdg_bipartite_graph(selected_colleges, selected_status, selected_ye
     )
 
     # Create node traces
-    node_x, node_y, node_text, node_size, node_color = [], [], [], [], []
-
-    for node in G.nodes():
-        x, y = pos[node]
-        node_x.append(x)
-        node_y.append(y)
-        node_text.append(node)
-        node_size.append(10 + (degrees[node] / max_degree) * 30)  # Adjust size dynamically
-        node_color.append(node_colors[node])  # Apply SDG colors or gradient
+    node_degrees = np.array([degrees[node] for node in nodes], dtype=float)
+    node_size = 10 + (node_degrees / max_degree if max_degree else node_degrees) * 30  # Adjust size dynamically
+    node_color = [node_colors[node] for node in nodes]  # Apply SDG colors or gradient
 
     node_trace = go.Scatter(
-        x=node_x, y=node_y,
+        x=positions[:, 0], y=positions[:, 1],
         mode="markers+text",
-        text=node_text,
+        text=nodes,
         textposition="middle center",
         hoverinfo="text",
         marker=dict(
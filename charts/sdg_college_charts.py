@@ -17,6 +17,7 @@ import dash_html_components as html
 import plotly.graph_objects as go
 import networkx as nx
 from dashboards.usable_methods import get_gradient_color
+from services.graph_traces import graph_arrays, edge_coordinates
 from config import stop_words,lemmatizer
 from collections import Counter
 from nltk.tag import pos_tag
@@ -1170,14 +1171,11 @@ def generate_sdg_bipartite_graph(selected_programs, selected_status, selected_ye
     # Get node positions
     pos = nx.spring_layout(G, seed=42)  # Position nodes
 
-    # Create edge traces
-    edge_x, edge_y = [], []
+    # Positions and edges as arrays
+    nodes, positions, edge_index = graph_arrays(G, pos)
 
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
+    # Create edge traces
+    edge_x, edge_y = edge_coordinates(positions, edge_index)
 
     edge_trace = go.Scatter(
         x=edge_x, y=edge_y,
@@ -1187,20 +1185,14 @@ def generate_sdg_bipartite_graph(selected_programs, selected_status, selected_ye
     )
 
     # Create node traces
-    node_x, node_y, node_text, node_size, node_color = [], [], [], [], []
-
-    for node in G.nodes():
-        x, y = pos[node]
-        node_x.append(x)
-        node_y.append(y)
-        node_text.append(node)
-        node_size.append(10 + (degrees[node] / max_degree) * 30)  # Adjust size dynamically
-        node_color.append(node_colors[node])  # Apply SDG colors or gradient
+    node_degrees = np.array([degrees[node] for node in nodes], dtype=float)
+    node_size = 10 + (node_degrees / max_degree if max_degree else node_degrees) * 30  # Adjust size dynamically
+    node_color = [node_colors[node] for node in nodes]  # Apply SDG colors or gradient
 
     node_trace = go.Scatter(
-        x=node_x, y=node_y,
+        x=positions[:, 0], y=positions[:, 1],
         mode="markers+text",
-        text=node_text,
+        text=nodes,
         textposition="middle center",
         hoverinfo="text",
         marker=dict(
@@ -0,0 +1,19 @@
+import dash_bootstrap_components as dbc
+import dash_html_components as html
+import dash_core_components as dcc
+
+def LoadingState(message="Loading dashboard data...", interval=3000):
+    """
+    Placeholder layout shown while the dashboard data is loading.
+    The page reloads itself every interval ms (see defer_until_ready).
+    """
+    return html.Div(
+        [
+            dbc.Spinner(color="primary"),
+            html.P(message, className="mt-3", style={"color": "#08397C"}),
+            dcc.Interval(id="loading-state-interval", interval=interval),
+            html.Div(id="loading-state-reload", style={"display": "none"}),
+        ],
+        className="d-flex flex-column align-items-center justify-content-center",
+        style={"height": "100vh"},
+    )
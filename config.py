@@ -62,6 +62,70 @@ class Config:
     os.makedirs(BACKUP_ROOT, exist_ok=True)
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+    # Dashboard snapshot refresh (seconds between incremental refreshes of the shared dataset)
+    SNAPSHOT_REFRESH_INTERVAL = int(os.getenv('SNAPSHOT_REFRESH_INTERVAL', 30))
+
+    # Persistent cache of extracted top nouns (survives restarts, keyed by content hash)
+    NOUN_CACHE_PATH = os.getenv('NOUN_CACHE_PATH', os.path.join(BASE_DIR, 'cache', 'top_nouns.sqlite3'))
+
+    # Noun extraction pool (worker processes and texts per chunk for cold starts and bulk imports).
+    # Every app process starts its own pool, so keep this small; 1 extracts in-process.
+    NOUN_WORKERS = int(os.getenv('NOUN_WORKERS', 1))
+    NOUN_CHUNK_SIZE = int(os.getenv('NOUN_CHUNK_SIZE', 200))
+
+    # Rows fetched per round trip when streaming dashboard queries (server-side cursor)
+    QUERY_CHUNK_SIZE = int(os.getenv('QUERY_CHUNK_SIZE', 5000))
+
+    # Write-behind engagement events (events per batch insert and seconds between flushes)
+    ENGAGEMENT_FLUSH_SIZE = int(os.getenv('ENGAGEMENT_FLUSH_SIZE', 500))
+    ENGAGEMENT_FLUSH_INTERVAL = float(os.getenv('ENGAGEMENT_FLUSH_INTERVAL', 2.0))
+    # Failed flushes after which an engagement event is dropped (retries back off 1x, 2x, 4x ... the interval)
+    ENGAGEMENT_FLUSH_RETRIES = int(os.getenv('ENGAGEMENT_FLUSH_RETRIES', 5))
+    # Seconds the dashboard refresh looks back behind its engagement watermark for buffered events
+    # that landed late; keep it above the longest flush delay including retries
+    ENGAGEMENT_WATERMARK_LAG = int(os.getenv('ENGAGEMENT_WATERMARK_LAG', 60))
+
+    # Seconds between resets of the Redis engagement counters to the Postgres totals
+    ENGAGEMENT_RECONCILE_INTERVAL = int(os.getenv('ENGAGEMENT_RECONCILE_INTERVAL', 300))
+
+    # Daily engagement rollup (seconds between runs, days re-folded for late events, and
+    # optional days of raw events to keep; unset keeps all raw events)
+    ROLLUP_INTERVAL = int(os.getenv('ROLLUP_INTERVAL', 60))
+    ROLLUP_LATENESS_DAYS = int(os.getenv('ROLLUP_LATENESS_DAYS', 1))
+    ROLLUP_RETENTION_DAYS = int(os.getenv('ROLLUP_RETENTION_DAYS')) if os.getenv('ROLLUP_RETENTION_DAYS') else None
+
+    # Seconds between refreshes of the in-memory engagement cube behind the engagement dashboard
+    ENGAGEMENT_CUBE_REFRESH_INTERVAL = int(os.getenv('ENGAGEMENT_CUBE_REFRESH_INTERVAL', 30))
+
+    # Days a daily unique-viewer sketch is kept in Redis; must cover the engagement dashboard's
+    # longest date range (6M = 182 days)
+    UNIQUE_VIEWER_RETENTION_DAYS = int(os.getenv('UNIQUE_VIEWER_RETENTION_DAYS', 190))
+
+    # Monthly user_engagement partitions kept created ahead of the current month
+    ENGAGEMENT_PARTITION_MONTHS_AHEAD = int(os.getenv('ENGAGEMENT_PARTITION_MONTHS_AHEAD', 3))
+
+    # Directory of the dashboard snapshot shared by all worker processes (opt-in, empty disables;
+    # needs pyarrow and POSIX file locks)
+    SHARED_SNAPSHOT_DIR = os.getenv('SHARED_SNAPSHOT_DIR', '')
+    SHARED_SNAPSHOT_WAIT = int(os.getenv('SHARED_SNAPSHOT_WAIT', 120))  # seconds a worker waits for the first snapshot
+
+    # Memoized filtered views behind the institutional dashboard charts (seconds kept and maximum kept)
+    FILTERED_VIEW_TTL = int(os.getenv('FILTERED_VIEW_TTL', 10))
+    FILTERED_VIEW_MAX = int(os.getenv('FILTERED_VIEW_MAX', 64))
+
+    # Dashboard figure cache (figures kept per process, and whether workers share figures through
+    # Redis, which needs a shared snapshot store, with the seconds they are kept there)
+    FIGURE_CACHE_MAX = int(os.getenv('FIGURE_CACHE_MAX', 256))
+    FIGURE_CACHE_REDIS = os.getenv('FIGURE_CACHE_REDIS', 'true').lower() == 'true'
+    FIGURE_CACHE_REDIS_TTL = int(os.getenv('FIGURE_CACHE_REDIS_TTL', 3600))
+    # Seconds a figure of a chart that queries the database directly (not the snapshot) is reused
+    FIGURE_CACHE_QUERY_TTL = int(os.getenv('FIGURE_CACHE_QUERY_TTL', 60))
+
+    # Knowledge graph layouts (layouts kept, and the node count above which the fast
+    # Fruchterman-Reingold layout replaces the networkx layouts)
+    LAYOUT_CACHE_MAX = int(os.getenv('LAYOUT_CACHE_MAX', 64))
+    FAST_LAYOUT_NODES = int(os.getenv('FAST_LAYOUT_NODES', 300))
+
     # Set PG_BIN using the detection function
     PG_BIN = detect_pg_bin()
     PGDATA = 'C:/Program Files/PostgreSQL/16/data'  # Adjust this path to match your PostgreSQL data directory
@@ -70,11 +134,16 @@ class Config:
 engine = create_engine(Config.SQLALCHEMY_DATABASE_URI)
 Session = sessionmaker(bind=engine)
 
-# Download necessary NLTK datasets
-# Download required NLTK resources
-nltk.download('punkt', force=True)
-nltk.download('stopwords', force=True)
-nltk.download('averaged_perceptron_tagger', force=True)  # Needed for POS tagging
+# Download required NLTK resources (only when missing, so startup does not hit the network)
+def ensure_nltk_resource(resource_path, package):
+    try:
+        nltk.data.find(resource_path)
+    except LookupError:
+        nltk.download(package)
+
+ensure_nltk_resource('tokenizers/punkt', 'punkt')
+ensure_nltk_resource('corpora/stopwords', 'stopwords')
+ensure_nltk_resource('taggers/averaged_perceptron_tagger', 'averaged_perceptron_tagger')  # Needed for POS tagging
 
 custom_stopwords = set([
     "title", "study", "researchers", "respondents", "methodology", "data", 
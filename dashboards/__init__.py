@@ -1,7 +1,64 @@
 from services.database_manager import DatabaseManager  
 from services.user_engagement import UserEngagementManager
+from services.snapshot import SnapshotRefresher
+from services.shared_snapshot import SharedSnapshotStore
+from services.lazy_manager import LazyManager
+from services.engagement_rollup import EngagementRollup
+from services.engagement_cube import EngagementCube
+from services.filtered_views import FilteredViews
+from services.figure_cache import FigureCache
 from config import Config
 
-# Initialize the database manager
-db_manager = DatabaseManager(Config.SQLALCHEMY_DATABASE_URI)
-view_manager = UserEngagementManager(Config.SQLALCHEMY_DATABASE_URI)
\ No newline at end of file
+def build_snapshot_refresher():
+    # Workers share one snapshot file when a directory is configured and pyarrow is installed
+    shared_store = None
+    if Config.SHARED_SNAPSHOT_DIR and SharedSnapshotStore.available():
+        shared_store = SharedSnapshotStore(Config.SHARED_SNAPSHOT_DIR)
+
+    # Initialize the database manager (its frame is loaded by the snapshot refresher)
+    manager = DatabaseManager(Config.SQLALCHEMY_DATABASE_URI, load=False)
+
+    # Single background refresher per process; dashboards read its current snapshot
+    refresher = SnapshotRefresher(
+        manager,
+        interval=Config.SNAPSHOT_REFRESH_INTERVAL,
+        store=shared_store,
+        wait_timeout=Config.SHARED_SNAPSHOT_WAIT
+    )
+    refresher.start()
+    return refresher
+
+def build_view_manager():
+    # Bring the daily engagement rollup up to date before the engagement manager reads it
+    rollup = EngagementRollup(
+        Config.SQLALCHEMY_DATABASE_URI,
+        interval=Config.ROLLUP_INTERVAL,
+        lateness_days=Config.ROLLUP_LATENESS_DAYS,
+        retention_days=Config.ROLLUP_RETENTION_DAYS
+    )
+    rollup.roll_up()
+    manager = UserEngagementManager(Config.SQLALCHEMY_DATABASE_URI)
+    rollup.start()
+    return manager
+
+def build_engagement_cube():
+    cube = EngagementCube(
+        Config.SQLALCHEMY_DATABASE_URI,
+        refresh_interval=Config.ENGAGEMENT_CUBE_REFRESH_INTERVAL,
+        lateness_days=Config.ROLLUP_LATENESS_DAYS
+    )
+    cube.start()
+    return cube
+
+# The managers load in background threads so importing the dashboards (and starting
+# the API) does not wait for the dashboard queries; see defer_until_ready
+snapshot_refresher = LazyManager(build_snapshot_refresher, 'snapshot_refresher')
+db_manager = LazyManager(lambda: snapshot_refresher.wait().manager, 'db_manager')
+view_manager = LazyManager(build_view_manager, 'view_manager')
+engagement_cube = LazyManager(build_engagement_cube, 'engagement_cube')
+
+# Filtered frames shared by the chart callbacks of one filter change (per process)
+filtered_views = FilteredViews(db_manager, ttl=Config.FILTERED_VIEW_TTL, max_entries=Config.FILTERED_VIEW_MAX)
+
+# Built chart figures per data version, see FigureCache (Redis tier attached by the server)
+figure_cache = FigureCache(lambda: snapshot_refresher.version, max_entries=Config.FIGURE_CACHE_MAX)
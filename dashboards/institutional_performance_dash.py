@@ -2,7 +2,8 @@ import dash
 from dash import Dash, html, dcc
 import dash_bootstrap_components as dbc
 from dash.dependencies import Input, Output, State
-from . import db_manager
+from . import db_manager, snapshot_refresher, filtered_views
+from .usable_methods import defer_until_ready, add_data_version_gate
 import pandas as pd
 import numpy as np
 from database.institutional_performance_queries import get_data_for_modal_contents, get_data_for_text_displays
@@ -19,7 +20,6 @@ import json
 from flask_jwt_extended import get_jwt_identity
 from flask import session, current_app
 from config import Config
-from services.database_manager import DatabaseManager
 import datetime
 from sqlalchemy import func, distinct
 from sqlalchemy.orm import Session
@@ -62,21 +62,24 @@ class Institutional_Performance_Dash:
         self.program = None
         self.user_role = ""
 
+        self.default_programs = []
+        self.default_statuses = ["READY", "SUBMITTED", "ACCEPTED", "PUBLISHED", "PULLOUT"]
+
+        self.selected_colleges = []
+        self.selected_programs = []
+        
+        # Layout and callbacks need the loaded data; show a loading state until then
+        defer_until_ready(self.dash_app, [db_manager], self.setup)
+
+    def setup(self):
+        """Load the default filter values, then build the layout and register callbacks."""
         # Get default values from global db_manager for initial setup only
         self.palette_dict = db_manager.get_college_colors()
         self.default_colleges = db_manager.get_unique_values('college_id')
-        self.default_programs = []
-        self.default_statuses = ["READY", "SUBMITTED", "ACCEPTED", "PUBLISHED", "PULLOUT"]
         self.default_terms = db_manager.get_unique_values('term')
         self.default_years = [db_manager.get_min_value('year'), db_manager.get_max_value('year')]
         self.default_pub_format = db_manager.get_unique_values('journal')[db_manager.get_unique_values('journal') != "unpublished"]
 
-        self.selected_colleges = []
-        self.selected_programs = []
-        
-        # Add user database managers dictionary
-        self.user_db_managers = {}
-        
         self.setup_dashboard()
         self.set_callbacks()
 
@@ -363,6 +366,7 @@ class Institutional_Performance_Dash:
             dcc.Location(id='url', refresh=False),
             dcc.Store(id='session-store', storage_type='session'),
             dcc.Interval(id="data-refresh-interval", interval=30000, n_intervals=0),  # 30-second refresh interval
+            dcc.Store(id="data-version-store"),  # data version this client last saw
             dcc.Store(id="shared-data-store"),  # Shared data store to hold the updated dataset
             dcc.Download(id="total-download-link"), # For download feature (modal content)
             dcc.Download(id="ready-download-link"), # For download feature (modal content)
@@ -508,28 +512,13 @@ class Institutional_Performance_Dash:
         else:
             return value
     
-    def get_user_db_manager(self, user_id, role_id, college_id=None, program_id=None):
-        """
-        Get or create a database manager instance specific to this user.
-        """
-        # Check if we already have a manager for this user
-        if user_id in self.user_db_managers:
-            return self.user_db_managers[user_id]
-        
-        # Create a new manager for this user
-        print(f"Creating new database manager for user {user_id} with role {role_id}")
-        user_db = DatabaseManager(Config.SQLALCHEMY_DATABASE_URI)
-        user_db.get_all_data()  # Load the data
-        
-        # Store it in our dictionary
-        self.user_db_managers[user_id] = user_db
-        
-        return user_db
-    
     def set_callbacks(self):
         """
         Set up the interactive callbacks for the dashboard.
         """
+        # Interval ticks only reach the callbacks below when the data version changed
+        add_data_version_gate(self.dash_app, lambda: snapshot_refresher.version)
+
         @self.dash_app.callback(
             [Output('url', 'pathname'),
              Output('session-store', 'data')],
@@ -752,7 +741,7 @@ class Institutional_Performance_Dash:
              Output('nonscopus_scopus_bar_plot', 'figure'),
              Output('proceeding_conference_bar_plot', 'figure'),
              Output('sdg_bar_plot', 'figure')],
-            [Input('data-refresh-interval', 'n_intervals'),  # Add the interval directly
+            [Input("data-version-store", "data"),  # Add the interval directly
              Input('url', 'search'),
              Input('college', 'value'),
              Input('program', 'value'),
@@ -761,7 +750,7 @@ class Institutional_Performance_Dash:
              Input('terms', 'value'),
              Input('pub_form', 'value'),
              Input('reset_button', 'n_clicks')])
-        def update_dash_output(n_intervals, search, selected_colleges, selected_programs, selected_status, 
+        def update_dash_output(data_version, search, selected_colleges, selected_programs, selected_status, 
                             selected_years, selected_terms, selected_pub_format, n_clicks):
             # Get user identity
             try:
@@ -802,7 +791,7 @@ class Institutional_Performance_Dash:
             trigger = dash.callback_context.triggered[0]['prop_id'] if dash.callback_context.triggered else None
             
             # Log when interval triggers refresh for debugging
-            if trigger == 'data-refresh-interval.n_intervals':
+            if trigger == 'data-version-store.data':
                 print(f"Auto-refresh triggered at {datetime.now().strftime('%H:%M:%S')}")
             
             # Return all visualization components
@@ -890,7 +879,7 @@ class Institutional_Performance_Dash:
                 Output('open-pullout-modal', 'children')
             ],
             [
-                Input("data-refresh-interval", "n_intervals"),
+                Input("data-version-store", "data"),
                 Input('session-store', 'data'),
                 Input('college', 'value'),
                 Input('program', 'value'),
@@ -900,7 +889,7 @@ class Institutional_Performance_Dash:
                 Input('pub_form', 'value')
             ]
         )
-        def refresh_text_buttons(n_intervals, session_data, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, selected_pub_format):
+        def refresh_text_buttons(data_version, session_data, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, selected_pub_format):
             # CRITICAL FIX: Get database values but ALWAYS include all KNOWN statuses
             db_statuses = db_manager.get_unique_values('status')
             all_known_statuses = ["READY", "SUBMITTED", "ACCEPTED", "PUBLISHED", "PULLOUT"]
@@ -1712,7 +1701,7 @@ class Institutional_Performance_Dash:
 
         @self.dash_app.callback(
             Output("shared-data-store", "data"),
-            [Input("data-refresh-interval", "n_intervals")],
+            [Input("data-version-store", "data")],
             [State("college", "value"),
              State("program", "value"),
              State("status", "value"),
@@ -1720,8 +1709,8 @@ class Institutional_Performance_Dash:
              State("terms", "value"),
              State('pub_form', 'value')]
         )
-        def refresh_data(n_intervals, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, selected_pub_format):
-            """Fetch fresh data at regular intervals and store in shared data store"""
+        def refresh_data(data_version, selected_colleges, selected_programs, selected_status, selected_years, selected_terms, selected_pub_format):
+            """Store a handle (snapshot version and filters) to the current data in the shared data store"""
             # Use the predefined list of all statuses
             print(f"Using predefined statuses: {self.default_statuses}")
             
@@ -1754,24 +1743,21 @@ class Institutional_Performance_Dash:
             
             # Apply filters properly
             filter_kwargs = {
-                "selected_status": selected_status,
-                "selected_years": selected_years,
-                "selected_terms": selected_terms,
-                "selected_pub_format": selected_pub_format
+                "status": selected_status,
+                "term": selected_terms,
+                "journal": selected_pub_format
             }
 
             if selected_programs and self.user_role not in ("02", "03"):
-                filter_kwargs["selected_programs"] = selected_programs
+                filter_kwargs["program_id"] = selected_programs
             else:
-                filter_kwargs["selected_colleges"] = selected_colleges  
+                filter_kwargs["college_id"] = selected_colleges  
 
-            # Get fresh data
-            fresh_data = get_data_for_modal_contents(**filter_kwargs)
-            
             # Print a refresh notification for debugging
             print(f"Data refreshed at {datetime.now().strftime('%H:%M:%S')} with statuses: {selected_status}")
             
-            return fresh_data
+            # Only the snapshot version and filters go to the browser, never the rows
+            return filtered_views.handle(snapshot_refresher.version, years=selected_years, **filter_kwargs)
         
         @self.dash_app.callback(
             [Output("terms", "options"), 
@@ -1779,11 +1765,11 @@ class Institutional_Performance_Dash:
              Output("years", "max"),
              Output("status", "options"),
              Output('pub_form', 'options')],
-            [Input("data-refresh-interval", "n_intervals")],
+            [Input("data-version-store", "data")],
             [State("college", "value"),
              State("program", "value")]
         )
-        def update_filter_options(n_intervals, selected_colleges, selected_programs):
+        def update_filter_options(data_version, selected_colleges, selected_programs):
             """Update filter options without changing current selections"""
             # Create a session
             engine = db_manager.engine
@@ -1962,9 +1948,9 @@ class Institutional_Performance_Dash:
 
         @self.dash_app.callback(
             Output("timestamp", "children"),
-            [Input("data-refresh-interval", "n_intervals")]
+            [Input("data-version-store", "data")]
         )
-        def update_timestamp(n):
+        def update_timestamp(data_version):
             return html.P(f"as of {datetime.now():%B %d, %Y %I:%M %p}", 
                          style={
                              "color": "#6c757d",
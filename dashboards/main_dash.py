@@ -5,12 +5,13 @@ import dash
 from dash import Dash, html, dcc, dash_table
 import dash_bootstrap_components as dbc
 from dash.dependencies import Input, Output, State
-from . import db_manager
+from . import db_manager, snapshot_refresher, filtered_views, figure_cache
+from .usable_methods import defer_until_ready, add_data_version_gate
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import numpy as np
-from database.institutional_performance_queries import get_data_for_performance_overview, get_data_for_research_type_bar_plot, get_data_for_research_status_bar_plot, get_data_for_scopus_section, get_data_for_jounal_section, get_data_for_sdg, get_data_for_modal_contents, get_data_for_text_displays
+from database.institutional_performance_queries import get_data_for_modal_contents
 from urllib.parse import parse_qs, urlparse
 from components.DashboardHeader import DashboardHeader
 from components.Tabs import Tabs
@@ -61,6 +62,19 @@ class MainDashboard:
         self.dash_app = Dash(__name__, server=flask_app, url_base_pathname='/dashboard/overview/', 
                              external_stylesheets=[dbc.themes.BOOTSTRAP, "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css"])
 
+        self.all_sdgs = [
+            'SDG 1', 'SDG 2', 'SDG 3', 'SDG 4', 'SDG 5', 'SDG 6', 'SDG 7', 
+            'SDG 8', 'SDG 9', 'SDG 10', 'SDG 11', 'SDG 12', 'SDG 13', 
+            'SDG 14', 'SDG 15', 'SDG 16', 'SDG 17'
+        ]
+
+        # Layout and callbacks need the loaded data; show a loading state until then
+        defer_until_ready(self.dash_app, [db_manager], self.setup)
+
+    def setup(self):
+        """
+        Load the default filter values, then build the layout and register callbacks.
+        """
         self.palette_dict = db_manager.get_college_colors()
         
         # Get default values
@@ -71,12 +85,6 @@ class MainDashboard:
         self.create_layout()
         self.set_callbacks()
 
-        self.all_sdgs = [
-            'SDG 1', 'SDG 2', 'SDG 3', 'SDG 4', 'SDG 5', 'SDG 6', 'SDG 7', 
-            'SDG 8', 'SDG 9', 'SDG 10', 'SDG 11', 'SDG 12', 'SDG 13', 
-            'SDG 14', 'SDG 15', 'SDG 16', 'SDG 17'
-        ]
-
     def create_layout(self):
         """
         Create the layout of the dashboard.
@@ -326,6 +334,7 @@ class MainDashboard:
         self.dash_app.layout = html.Div([
             dcc.Location(id='url', refresh=False),
             dcc.Interval(id="data-refresh-interval", interval=1000, n_intervals=0),  # 1-second refresh interval
+            dcc.Store(id="data-version-store"),  # data version this client last saw
             dcc.Store(id="shared-data-store"),  # Shared data store to hold the updated dataset
             dcc.Download(id="total-download-link"), # For download feature (modal content)
             dcc.Download(id="ready-download-link"), # For download feature (modal content)
@@ -461,6 +470,15 @@ class MainDashboard:
             "overflow": "hidden",  # Prevent outer scrolling
         })
     
+    def filtered_view(self, selected_colleges, selected_status, selected_years, selected_terms):
+        # Every chart callback of one filter change reads the same memoized view
+        return filtered_views.get(
+            college_id=selected_colleges,
+            status=selected_status,
+            term=selected_terms,
+            years=selected_years
+        )
+
     def get_program_colors(self, df):
         unique_programs = df['program_id'].unique()
         if not hasattr(self, "program_colors"):
@@ -472,6 +490,7 @@ class MainDashboard:
             if program not in self.program_colors:
                 self.program_colors[program] = available_colors[i % len(available_colors)]
 
+    @figure_cache.cached('main_dash.update_line_plot')
     def update_line_plot(self, selected_colleges, selected_status, selected_years, selected_terms):
         # Ensure selected_colleges is a standard Python list or array
         selected_colleges = ensure_list(selected_colleges)
@@ -479,11 +498,8 @@ class MainDashboard:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_performance_overview
-        filtered_data_with_term = get_data_for_performance_overview(selected_colleges, None, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_colleges, selected_status, selected_years, selected_terms)
 
         if len(selected_colleges) == 1:
             grouped_df = df.groupby(['program_id', 'year']).size().reset_index(name='TitleCount')
@@ -515,6 +531,7 @@ class MainDashboard:
         )
         return fig_line
     
+    @figure_cache.cached('main_dash.update_pie_chart')
     def update_pie_chart(self, selected_colleges, selected_status, selected_years, selected_terms):
         # Ensure selected_colleges is a standard Python list or array
         selected_colleges = ensure_list(selected_colleges)
@@ -522,11 +539,8 @@ class MainDashboard:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_performance_overview
-        filtered_data_with_term = get_data_for_performance_overview(selected_colleges, None, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_colleges, selected_status, selected_years, selected_terms)
 
         if len(selected_colleges) == 1:
             college_name = selected_colleges[0]
@@ -555,6 +569,7 @@ class MainDashboard:
 
         return fig_pie
     
+    @figure_cache.cached('main_dash.update_research_type_bar_plot')
     def update_research_type_bar_plot(self, selected_colleges, selected_status, selected_years, selected_terms):
         # Ensure selected_colleges is a standard Python list or array
         selected_colleges = ensure_list(selected_colleges)
@@ -562,11 +577,8 @@ class MainDashboard:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_research_type_bar_plot
-        filtered_data_with_term = get_data_for_research_type_bar_plot(selected_colleges, None, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_colleges, selected_status, selected_years, selected_terms)
 
         if df.empty:
             return px.bar(title="No data available")
@@ -610,6 +622,7 @@ class MainDashboard:
 
         return fig
 
+    @figure_cache.cached('main_dash.update_research_status_bar_plot')
     def update_research_status_bar_plot(self, selected_colleges, selected_status, selected_years, selected_terms):
         # Ensure selected_colleges is a standard Python list or array
         selected_colleges = ensure_list(selected_colleges)
@@ -617,11 +630,8 @@ class MainDashboard:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_filtered_data_with_term
-        filtered_data_with_term = get_data_for_research_status_bar_plot(selected_colleges, None, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_colleges, selected_status, selected_years, selected_terms)
 
         if df.empty:
             return px.bar(title="No data available")
@@ -674,6 +684,7 @@ class MainDashboard:
 
         return fig
     
+    @figure_cache.cached('main_dash.create_publication_bar_chart')
     def create_publication_bar_chart(self, selected_colleges, selected_status, selected_years, selected_terms):
         # Ensure selected_colleges is a standard Python list or array
         selected_colleges = ensure_list(selected_colleges)
@@ -681,11 +692,8 @@ class MainDashboard:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_scopus_section
-        filtered_data_with_term = get_data_for_scopus_section(selected_colleges, None, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_colleges, selected_status, selected_years, selected_terms)
 
         df = df[df['scopus'] != 'N/A']
 
@@ -720,6 +728,7 @@ class MainDashboard:
 
         return fig_bar
     
+    @figure_cache.cached('main_dash.update_publication_format_bar_plot')
     def update_publication_format_bar_plot(self, selected_colleges, selected_status, selected_years, selected_terms):
         # Ensure selected_colleges is a standard Python list or array
         selected_colleges = ensure_list(selected_colleges)
@@ -727,11 +736,8 @@ class MainDashboard:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_jounal_section
-        filtered_data_with_term = get_data_for_jounal_section(selected_colleges, None, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_colleges, selected_status, selected_years, selected_terms)
 
         df = df[df['journal'] != 'unpublished']
         df = df[df['status'] != 'PULLOUT']
@@ -768,6 +774,7 @@ class MainDashboard:
         return fig_bar
 
 
+    @figure_cache.cached('main_dash.update_sdg_chart')
     def update_sdg_chart(self, selected_colleges, selected_status, selected_years, selected_terms):
         # Ensure selected_colleges is a standard Python list or array
         selected_colleges = ensure_list(selected_colleges)
@@ -775,11 +782,8 @@ class MainDashboard:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_sdg
-        filtered_data_with_term = get_data_for_sdg(selected_colleges, None, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_colleges, selected_status, selected_years, selected_terms)
 
         if df.empty:
             return px.scatter(title="No data available")
@@ -858,6 +862,7 @@ class MainDashboard:
 
         return fig
     
+    @figure_cache.cached('main_dash.scopus_line_graph')
     def scopus_line_graph(self, selected_colleges, selected_status, selected_years, selected_terms):
         # Ensure selected_colleges is a standard Python list or array
         selected_colleges = ensure_list(selected_colleges)
@@ -865,11 +870,8 @@ class MainDashboard:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_scopus_section
-        filtered_data_with_term = get_data_for_scopus_section(selected_colleges, None, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_colleges, selected_status, selected_years, selected_terms)
  
         # Filter out rows where 'scopus' is 'N/A'
         df = df[df['scopus'] != 'N/A']
@@ -920,6 +922,7 @@ class MainDashboard:
 
         return fig_line
     
+    @figure_cache.cached('main_dash.scopus_pie_chart')
     def scopus_pie_chart(self, selected_colleges, selected_status, selected_years, selected_terms):
         # Ensure selected_colleges is a standard Python list or array
         selected_colleges = ensure_list(selected_colleges)
@@ -927,11 +930,8 @@ class MainDashboard:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_scopus_section
-        filtered_data_with_term = get_data_for_scopus_section(selected_colleges, None, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_colleges, selected_status, selected_years, selected_terms)
         
         # Filter out rows where 'scopus' is 'N/A'
         df = df[df['scopus'] != 'N/A']
@@ -966,6 +966,7 @@ class MainDashboard:
 
         return fig_pie
 
+    @figure_cache.cached('main_dash.publication_format_line_plot')
     def publication_format_line_plot(self, selected_colleges, selected_status, selected_years, selected_terms):
         # Ensure selected_colleges is a standard Python list or array
         selected_colleges = ensure_list(selected_colleges)
@@ -973,11 +974,8 @@ class MainDashboard:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_jounal_section
-        filtered_data_with_term = get_data_for_jounal_section(selected_colleges, None, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_colleges, selected_status, selected_years, selected_terms)
         
         # Filter out rows with 'unpublished' journals and 'PULLOUT' status
         df = df[df['journal'] != 'unpublished']
@@ -1029,6 +1027,7 @@ class MainDashboard:
 
         return fig_line
     
+    @figure_cache.cached('main_dash.publication_format_pie_chart')
     def publication_format_pie_chart(self, selected_colleges, selected_status, selected_years, selected_terms):
         # Ensure selected_colleges is a standard Python list or array
         selected_colleges = ensure_list(selected_colleges)
@@ -1036,11 +1035,8 @@ class MainDashboard:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_jounal_section
-        filtered_data_with_term = get_data_for_jounal_section(selected_colleges, None, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_colleges, selected_status, selected_years, selected_terms)
         
         # Filter out rows with 'unpublished' journals and 'PULLOUT' status
         df = df[df['journal'] != 'unpublished']
@@ -1080,6 +1076,9 @@ class MainDashboard:
         """
         Set up the callback functions for the dashboard.
         """
+        # Interval ticks only reach the callbacks below when the data version changed
+        add_data_version_gate(self.dash_app, lambda: snapshot_refresher.version)
+
 
         @self.dash_app.callback(
             Output("dynamic-header", "children"),
@@ -1234,11 +1233,28 @@ class MainDashboard:
         
         @self.dash_app.callback(
             Output("shared-data-store", "data"),
-            Input("data-refresh-interval", "n_intervals")
+            [
+                Input("data-version-store", "data"),
+                Input('college', 'value'),
+                Input('status', 'value'),
+                Input('years', 'value'),
+                Input('terms', 'value')
+            ]
         )
-        def refresh_shared_data_store(n_intervals):
-            updated_data = db_manager.get_all_data()
-            return updated_data.to_dict('records')
+        def refresh_shared_data_store(data_version, selected_colleges, selected_status, selected_years, selected_terms):
+            selected_colleges = default_if_empty(selected_colleges, self.default_colleges)
+            selected_status = default_if_empty(selected_status, self.default_statuses)
+            selected_years = selected_years if selected_years else self.default_years
+            selected_terms = default_if_empty(selected_terms, self.default_terms)
+
+            # Only the snapshot version and filters go to the browser; callbacks resolve the rows server-side
+            return filtered_views.handle(
+                snapshot_refresher.version,
+                college_id=ensure_list(selected_colleges),
+                status=ensure_list(selected_status),
+                term=ensure_list(selected_terms),
+                years=ensure_list(selected_years)
+            )
         
         @self.dash_app.callback(
             Output('nonscopus_scopus_graph', 'figure'),
@@ -1292,40 +1308,14 @@ class MainDashboard:
                 Output('open-published-modal', 'children'),
                 Output('open-pullout-modal', 'children')
             ],
-            [
-                Input("data-refresh-interval", "n_intervals"),
-                Input('college', 'value'),
-                Input('status', 'value'),
-                Input('years', 'value'),
-                Input('terms', 'value')
-            ]
+            Input("shared-data-store", "data")
         )
-        def refresh_text_buttons(n_intervals, selected_colleges, selected_status, selected_years, selected_terms):
-            selected_colleges = default_if_empty(selected_colleges, self.default_colleges)
-            selected_status = default_if_empty(selected_status, self.default_statuses)
-            selected_years = selected_years if selected_years else self.default_years
-            selected_terms = default_if_empty(selected_terms, self.default_terms)
-
-            selected_colleges = ensure_list(selected_colleges)
-            selected_status = ensure_list(selected_status)
-            selected_years = ensure_list(selected_years)
-            selected_terms = ensure_list(selected_terms)
-
-            # Apply filters
-            filtered_data = get_data_for_text_displays(
-                selected_colleges=selected_colleges, 
-                selected_status=selected_status,
-                selected_years=selected_years,
-                selected_terms=selected_terms
-            )
-
-            df_filtered_data = pd.DataFrame(filtered_data)
-
-            # Convert DataFrame to list of dictionaries
-            df_filtered_data = df_filtered_data.to_dict(orient='records')
+        def refresh_text_buttons(data_handle):
+            if not data_handle:
+                return (dash.no_update,) * 6
 
-            # Create a dictionary for status counts
-            status_counts = {d["status"]: d["total_count"] for d in df_filtered_data}
+            # Count the statuses of the view the handle refers to
+            status_counts = filtered_views.resolve(data_handle)['status'].value_counts().to_dict()
 
             total_research_outputs = sum(status_counts.values())
 
@@ -6,9 +6,10 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 from urllib.parse import parse_qs, urlparse
-from . import db_manager
+from . import db_manager, snapshot_refresher, filtered_views
+from .usable_methods import defer_until_ready, add_data_version_gate
 import dash
-from database.institutional_performance_queries import get_data_for_performance_overview, get_data_for_research_type_bar_plot, get_data_for_research_status_bar_plot, get_data_for_scopus_section, get_data_for_jounal_section, get_data_for_sdg, get_data_for_modal_contents, get_data_for_text_displays
+from database.institutional_performance_queries import get_data_for_modal_contents
 from components.DashboardHeader import DashboardHeader
 from components.Tabs import Tabs
 from components.KPI_Card import KPI_Card
@@ -42,6 +43,17 @@ class ProgDashApp:
         self.college = college
         self.program = program
 
+        self.all_sdgs = [
+            'SDG 1', 'SDG 2', 'SDG 3', 'SDG 4', 'SDG 5', 'SDG 6', 'SDG 7', 
+            'SDG 8', 'SDG 9', 'SDG 10', 'SDG 11', 'SDG 12', 'SDG 13', 
+            'SDG 14', 'SDG 15', 'SDG 16', 'SDG 17'
+        ]
+
+        # Layout and callbacks need the loaded data; show a loading state until then
+        defer_until_ready(self.dash_app, [db_manager], self.setup)
+
+    def setup(self):
+        """Load the default filter values, then build the layout and register callbacks."""
         self.palette_dict = db_manager.get_college_colors()
         self.default_colleges = db_manager.get_unique_values('college_id')
         self.default_programs = []
@@ -52,12 +64,6 @@ class ProgDashApp:
         self.set_layout()
         self.add_callbacks()
 
-        self.all_sdgs = [
-            'SDG 1', 'SDG 2', 'SDG 3', 'SDG 4', 'SDG 5', 'SDG 6', 'SDG 7', 
-            'SDG 8', 'SDG 9', 'SDG 10', 'SDG 11', 'SDG 12', 'SDG 13', 
-            'SDG 14', 'SDG 15', 'SDG 16', 'SDG 17'
-        ]
-
     def set_layout(self):
         """Common layout shared across all dashboards."""
 
@@ -338,6 +344,7 @@ class ProgDashApp:
             # URL tracking
             dcc.Location(id='url', refresh=False),
             dcc.Interval(id="data-refresh-interval", interval=1000, n_intervals=0),  # 1 second
+            dcc.Store(id="data-version-store"),  # data version this client last saw
             dcc.Store(id="shared-data-store"),  # Shared data store to hold the updated dataset
             dbc.Container([
                 dbc.Row([
@@ -437,6 +444,15 @@ class ProgDashApp:
             "overflow": "hidden",  # Prevent outer scrolling
         })
 
+    def filtered_view(self, selected_programs, selected_status, selected_years, selected_terms):
+        # Every chart callback of one filter change reads the same memoized view
+        return filtered_views.get(
+            program_id=selected_programs,
+            status=selected_status,
+            term=selected_terms,
+            years=selected_years
+        )
+
     def get_program_colors(self, df, color_column='program_id'):
         """
         Generate a color mapping for the unique values in the specified column of the DataFrame.
@@ -460,11 +476,8 @@ class ProgDashApp:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_performance_overview
-        filtered_data_with_term = get_data_for_performance_overview(None, selected_program, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_program, selected_status, selected_years, selected_terms)
      
         if len(selected_program) == 1:
             grouped_df = df.groupby(['program_id', 'year']).size().reset_index(name='TitleCount')
@@ -510,11 +523,8 @@ class ProgDashApp:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_performance_overview
-        filtered_data_with_term = get_data_for_performance_overview(None, selected_programs, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_programs, selected_status, selected_years, selected_terms)
 
         if len(selected_programs) == 1:
             # Handle single program selection
@@ -568,11 +578,8 @@ class ProgDashApp:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_research_type_bar_plot
-        filtered_data_with_term = get_data_for_research_type_bar_plot(None, selected_programs, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_programs, selected_status, selected_years, selected_terms)
         
         if df.empty:
             return px.bar(title="No data available")
@@ -616,11 +623,8 @@ class ProgDashApp:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_research_status_bar_plot
-        filtered_data_with_term = get_data_for_research_status_bar_plot(None, selected_programs, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_programs, selected_status, selected_years, selected_terms)
 
         if df.empty:
             return px.bar(title="No data available")
@@ -672,11 +676,8 @@ class ProgDashApp:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_sdg
-        filtered_data_with_term = get_data_for_sdg(None, selected_programs, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_programs, selected_status, selected_years, selected_terms)
 
         if df.empty:
             return px.scatter(title="No data available")
@@ -738,11 +739,8 @@ class ProgDashApp:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_scopus_section
-        filtered_data_with_term = get_data_for_scopus_section(None, selected_programs, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_programs, selected_status, selected_years, selected_terms)
 
         df = df[df['scopus'] != 'N/A']
         self.get_program_colors(df)
@@ -778,11 +776,8 @@ class ProgDashApp:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_jounal_section
-        filtered_data_with_term = get_data_for_jounal_section(None, selected_programs, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_programs, selected_status, selected_years, selected_terms)
 
         df = df[df['journal'] != 'unpublished']
         df = df[df['status'] != 'PULLOUT']
@@ -820,11 +815,8 @@ class ProgDashApp:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_scopus_section
-        filtered_data_with_term = get_data_for_scopus_section(None, selected_programs, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_programs, selected_status, selected_years, selected_terms)
 
         # Filter out rows where 'scopus' is 'N/A'
         df = df[df['scopus'] != 'N/A']
@@ -882,11 +874,8 @@ class ProgDashApp:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_scopus_section
-        filtered_data_with_term = get_data_for_scopus_section(None, selected_programs, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_programs, selected_status, selected_years, selected_terms)
 
         # Filter out rows where 'scopus' is 'N/A'
         df = df[df['scopus'] != 'N/A']
@@ -927,11 +916,8 @@ class ProgDashApp:
         selected_status = ensure_list(selected_status)
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
-        # Fetch data using get_data_for_jounal_section
-        filtered_data_with_term = get_data_for_jounal_section(None, selected_programs, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_programs, selected_status, selected_years, selected_terms)
         
         # Filter out rows with 'unpublished' journals and 'PULLOUT' status
         df = df[df['journal'] != 'unpublished']
@@ -990,11 +976,8 @@ class ProgDashApp:
         selected_years = ensure_list(selected_years)
         selected_terms = ensure_list(selected_terms)
 
-        # Fetch data using get_data_for_jounal_section
-        filtered_data_with_term = get_data_for_jounal_section(None, selected_programs, selected_status, selected_years, selected_terms)
-
-        # Convert data to DataFrame
-        df = pd.DataFrame(filtered_data_with_term)
+        # Shared filtered view for these filters (computed once per filter change)
+        df = self.filtered_view(selected_programs, selected_status, selected_years, selected_terms)
 
         # Filter out rows with 'unpublished' journals and 'PULLOUT' status
         df = df[df['journal'] != 'unpublished']
@@ -1031,6 +1014,9 @@ class ProgDashApp:
         return fig_pie
 
     def add_callbacks(self):
+        # Interval ticks only reach the callbacks below when the data version changed
+        add_data_version_gate(self.dash_app, lambda: snapshot_refresher.version)
+
         @self.dash_app.callback(
         Output('college', 'value'),  # Update the checklist value
         Input('url', 'search'),  # Listen to URL changes
@@ -1230,11 +1216,28 @@ class ProgDashApp:
         
         @self.dash_app.callback(
             Output("shared-data-store", "data"),
-            Input("data-refresh-interval", "n_intervals")
+            [
+                Input("data-version-store", "data"),
+                Input('program', 'value'),
+                Input('status', 'value'),
+                Input('years', 'value'),
+                Input('terms', 'value')
+            ]
         )
-        def refresh_shared_data_store(n_intervals):
-            updated_data = db_manager.get_all_data()
-            return updated_data.to_dict('records')
+        def refresh_shared_data_store(data_version, selected_programs, selected_status, selected_years, selected_terms):
+            selected_programs = default_if_empty(selected_programs, self.default_programs)
+            selected_status = default_if_empty(selected_status, self.default_statuses)
+            selected_years = selected_years if selected_years else self.default_years
+            selected_terms = default_if_empty(selected_terms, self.default_terms)
+
+            # Only the snapshot version and filters go to the browser; callbacks resolve the rows server-side
+            return filtered_views.handle(
+                snapshot_refresher.version,
+                program_id=ensure_list(selected_programs),
+                status=ensure_list(selected_status),
+                term=ensure_list(selected_terms),
+                years=ensure_list(selected_years)
+            )
         
         # for text button (dynamic)
         @self.dash_app.callback(
@@ -1246,41 +1249,14 @@ class ProgDashApp:
                 Output('open-published-modal', 'children'),
                 Output('open-pullout-modal', 'children')
             ],
-            [
-                Input("data-refresh-interval", "n_intervals"),
-                Input('program', 'value'),
-                Input('status', 'value'),
-                Input('years', 'value'),
-                Input('terms', 'value')
-            ] 
+            Input("shared-data-store", "data")
         )
-        def refresh_text_buttons(n_intervals, selected_programs, selected_status, selected_years, selected_terms):
-            selected_programs = default_if_empty(selected_programs, self.default_programs)
-            selected_status = default_if_empty(selected_status, self.default_statuses)
-            selected_years = selected_years if selected_years else self.default_years
-            selected_terms = default_if_empty(selected_terms, self.default_terms)
-
-            selected_programs = ensure_list(selected_programs)
-            selected_status = ensure_list(selected_status)
-            selected_years = ensure_list(selected_years)
-            selected_terms = ensure_list(selected_terms)
-
-            # Apply filters
-            filtered_data = get_data_for_text_displays(
-                None,
-                selected_programs=selected_programs, 
-                selected_status=selected_status,
-                selected_years=selected_years,
-                selected_terms=selected_terms
-            )
-
-            df_filtered_data = pd.DataFrame(filtered_data)
-
-            # Convert DataFrame to list of dictionaries
-            df_filtered_data = df_filtered_data.to_dict(orient='records')
+        def refresh_text_buttons(data_handle):
+            if not data_handle:
+                return (dash.no_update,) * 6
 
-            # Create a dictionary for status counts
-            status_counts = {d["status"]: d["total_count"] for d in df_filtered_data}
+            # Count the statuses of the view the handle refers to
+            status_counts = filtered_views.resolve(data_handle)['status'].value_counts().to_dict()
 
             total_research_outputs = sum(status_counts.values())
 
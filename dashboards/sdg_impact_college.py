@@ -7,14 +7,14 @@ from components.KPI_Card import KPI_Card
 from components.CollageContainer import CollageContainer
 from dash import dcc
 from urllib.parse import parse_qs, urlparse
-from . import db_manager
+from . import db_manager, snapshot_refresher
+from .usable_methods import defer_until_ready, add_data_version_gate
 import dash_html_components as html
 from services.sdg_colors import sdg_colors
 from charts.sdg_college_charts import get_total_proceeding_count,generate_sdg_bipartite_graph,visualize_sdg_impact,create_sdg_plot, create_sdg_pie_chart,create_sdg_research_chart,create_geographical_heatmap,create_geographical_treemap,create_conference_participation_bar_chart,create_local_vs_foreign_donut_chart,get_word_cloud,generate_research_area_visualization
 import json
 import numpy as np
 import datetime
-from services.database_manager import DatabaseManager
 import plotly.graph_objects as go
 from dashboards.usable_methods import default_if_empty, ensure_list, download_file
 from flask_jwt_extended import get_jwt_identity
@@ -59,9 +59,15 @@ class SDG_Impact_College:
         self.program = program
         self.user_role = ""
 
-        self.palette_dict = db_manager.get_college_colors()
         self.sdg_colors = sdg_colors
         self.all_sdgs = [f'SDG {i}' for i in range(1, 18)]
+
+        # Layout and callbacks need the loaded data; show a loading state until then
+        defer_until_ready(self.dash_app, [db_manager], self.setup)
+
+    def setup(self):
+        """Load the default filter values, then build the layout and register callbacks."""
+        self.palette_dict = db_manager.get_college_colors()
         
         # Get default values
         self.default_colleges = db_manager.get_unique_values('college_id')
@@ -69,9 +75,6 @@ class SDG_Impact_College:
         self.default_statuses = db_manager.get_unique_values('status')
         self.default_years = [db_manager.get_min_value('year'), db_manager.get_max_value('year')]
         self.default_pub_format = db_manager.get_unique_values('journal')[db_manager.get_unique_values('journal') != "unpublished"]
-        
-        # Add user database managers dictionary
-        self.user_db_managers = {}
 
         self.set_layout()
         self.add_callbacks()
@@ -365,6 +368,7 @@ class SDG_Impact_College:
         self.dash_app.layout = html.Div([
             dbc.Container([
                 dcc.Interval(id="data-refresh-interval", interval=30000, n_intervals=0),
+                dcc.Store(id="data-version-store"),  # data version this client last saw
                 dcc.Store(id='user-session-data'),  # Add user session storage
                 dcc.Store(id='shared-data-store'),  # Add shared data store
                 dcc.Location(id="url", refresh=False),  # Make sure URL is tracked
@@ -383,6 +387,9 @@ class SDG_Impact_College:
 
 
     def add_callbacks(self):
+        # Interval ticks only reach the callbacks below when the data version changed
+        add_data_version_gate(self.dash_app, lambda: snapshot_refresher.version)
+
         @self.dash_app.callback(
             Output("pub_form_container", "style"),
             Input("tabs", "active_tab")  # This refers to the id of the Tabs component
@@ -494,7 +501,7 @@ class SDG_Impact_College:
         # Update shared data store based on user session
         @self.dash_app.callback(
             Output("shared-data-store", "data"),
-            [Input("data-refresh-interval", "n_intervals"),
+            [Input("data-version-store", "data"),
             Input("user-session-data", "data"),
             Input("college", "value"),
             Input("program", "value"),
@@ -505,7 +512,7 @@ class SDG_Impact_College:
             Input('pub_form', 'value')],
             prevent_initial_call=False
         )
-        def refresh_data(n_intervals, user_data, selected_college, selected_programs, 
+        def refresh_data(data_version, user_data, selected_college, selected_programs, 
                         selected_status, selected_years, sdg_value, reset_clicks, selected_pub_format):
             try:
                 from flask_jwt_extended import get_jwt_identity
@@ -545,7 +552,7 @@ class SDG_Impact_College:
             if not selected_programs:
                 selected_programs = db_manager.get_unique_values_by("program_id", "college_id", college_id)
 
-            if ctx.triggered and 'data-refresh-interval' in ctx.triggered[0]['prop_id']:
+            if ctx.triggered and 'data-version-store' in ctx.triggered[0]['prop_id']:
                 print(f"Auto-refresh for user {user_id} at college {college_id} at {datetime.datetime.now().strftime('%H:%M:%S')}")
 
             if user_id != 'anonymous':
@@ -880,9 +887,9 @@ class SDG_Impact_College:
 
         @self.dash_app.callback(
             Output("timestamp", "children"),  
-            [Input("data-refresh-interval", "n_intervals")]  
+            [Input("data-version-store", "data")]  
         )
-        def update_timestamp(n_intervals):
+        def update_timestamp(data_version):
             # Use datetime.datetime.now() instead of datetime.now()
             return html.P(f"as of {datetime.datetime.now():%B %d, %Y %I:%M %p}", 
                          style={
@@ -912,24 +919,6 @@ class SDG_Impact_College:
         else:
             return value
             
-    def get_user_db_manager(self, user_id, role_id, college_id=None, program_id=None):
-        """
-        Get or create a database manager instance specific to this user.
-        """
-        # Check if we already have a manager for this user
-        if user_id in self.user_db_managers:
-            return self.user_db_managers[user_id]
-        
-        # Create a new manager for this user
-        print(f"Creating new database manager for user {user_id} with role {role_id}")
-        user_db = DatabaseManager(Config.SQLALCHEMY_DATABASE_URI)
-        user_db.get_all_data()  # Load the data
-        
-        # Store it in our dictionary
-        self.user_db_managers[user_id] = user_db
-        
-        return user_db
-        
     def get_user_specific_data(self, user_id, role_id, college_id=None, program_id=None):
         """
         Get or create user-specific data store in Redis or memory
@@ -8,6 +8,7 @@ from components.CollageContainer import CollageContainer
 from dash import dcc
 from urllib.parse import parse_qs, urlparse
 from . import db_manager
+from .usable_methods import defer_until_ready
 from services.sdg_colors import sdg_colors
 from charts.sdg_charts import get_total_proceeding_count,create_sdg_plot, create_sdg_pie_chart,create_sdg_research_chart,create_geographical_heatmap,create_geographical_treemap,create_conference_participation_bar_chart,create_local_vs_foreign_donut_chart,get_word_cloud,generate_research_area_visualization,generate_sdg_bipartite_graph,visualize_sdg_impact
 
@@ -27,9 +28,15 @@ class SDG_Impact_Dash:
         self.college = college
         self.program = program
 
-        self.palette_dict = db_manager.get_college_colors()
         self.sdg_colors=sdg_colors
         self.all_sdgs = [f'SDG {i}' for i in range(1, 18)]
+
+        # Layout and callbacks need the loaded data; show a loading state until then
+        defer_until_ready(self.dash_app, [db_manager], self.setup)
+
+    def setup(self):
+        """Load the default filter values, then build the layout and register callbacks."""
+        self.palette_dict = db_manager.get_college_colors()
         # Get default values
         self.default_colleges = db_manager.get_unique_values('college_id')
         self.default_statuses = db_manager.get_unique_values('status')
@@ -7,6 +7,10 @@ import dash_core_components as dcc
 import dash_bootstrap_components as dbc
 from io import BytesIO
 import base64
+import dash
+from dash.dependencies import Input, Output, State
+from components.LoadingState import LoadingState
+from services.lazy_manager import when_all_ready
 
 def default_if_empty(selected_values, default_values):
     """
@@ -72,4 +76,55 @@ def create_graph_card(graph_id, loading_id):
         ),
         body=True,
         className="flex-fill"
-    )
\ No newline at end of file
+    )
+
+def defer_until_ready(dash_app, managers, setup):
+    """
+    Runs setup() (layout and callbacks) once all managers have loaded.
+    Until then dash_app serves a loading state that reloads the page periodically.
+    """
+    if all(manager.is_ready() for manager in managers):
+        setup()
+        return
+
+    dash_app.layout = LoadingState()
+    dash_app.clientside_callback(
+        "function(n) { if (n) { window.location.reload(); } return ''; }",
+        Output("loading-state-reload", "children"),
+        Input("loading-state-interval", "n_intervals")
+    )
+
+    def finish_setup():
+        # Runs on the loader thread, so push the Flask app context the dashboards were created in
+        with dash_app.server.app_context():
+            setup()
+        # Keep the reload components (disabled) so the callback above still finds its ids
+        layout = dash_app.layout
+        hidden = [
+            dcc.Interval(id="loading-state-interval", disabled=True),
+            html.Div(id="loading-state-reload", style={"display": "none"}),
+        ]
+        if callable(layout):
+            dash_app.layout = lambda: html.Div([layout(), *hidden])
+        else:
+            dash_app.layout = html.Div([layout, *hidden])
+
+    when_all_ready(managers, finish_setup)
+
+def add_data_version_gate(dash_app, version_source, interval_id="data-refresh-interval", store_id="data-version-store"):
+    """
+    Turns the polling interval into a data-change signal. Each tick compares the server's
+    data version with the one the client last saw and only writes store_id when they
+    differ, so callbacks listening to store_id instead of the interval skip every tick
+    where nothing changed. The layout needs a dcc.Store with id store_id.
+    """
+    @dash_app.callback(
+        Output(store_id, "data"),
+        Input(interval_id, "n_intervals"),
+        State(store_id, "data")
+    )
+    def check_data_version(n_intervals, seen_version):
+        version = version_source()
+        if version == seen_version:
+            return dash.no_update
+        return version
@@ -7,9 +7,10 @@ from components.KPI_Card import KPI_Card
 from components.CollageContainer import CollageContainer
 from dash import dcc
 from urllib.parse import parse_qs, urlparse
-from . import view_manager,db_manager
+from . import view_manager,db_manager,engagement_cube
+from .usable_methods import defer_until_ready, add_data_version_gate
 from datetime import datetime, timedelta
-from database.engagement_queries import get_user_engagement_summary,get_top_10_users_by_unique_views,get_engagement_over_time,get_top_10_research_ids_by_downloads, get_research_funnel_data,get_top_10_research_ids_by_views, get_funnel_data, get_engagement_by_day_of_week, get_engagement_summary,get_user_funnel_data, get_top_10_users_by_engagement, get_top_10_users_by_downloads
+from database.engagement_queries import get_user_engagement_summary,get_top_10_users_by_unique_views, get_research_funnel_data,get_user_funnel_data, get_top_10_users_by_engagement, get_top_10_users_by_downloads
 import pandas as pd
 import numpy as np
 import plotly.express as px
@@ -36,11 +37,8 @@ class UserEngagementDash:
         self.college = college
         self.program = program
 
-        self.palette_dict = view_manager.get_college_colors()
-        self.default_colleges = view_manager.get_unique_values('college_id')
-        self.default_programs = []
-        self.default_statuses = view_manager.get_unique_values('status')
-        self.default_years = [view_manager.get_min_value('year'), view_manager.get_max_value('year')]
+        # HyperLogLog unique-viewer sketches (None when the server has no Redis)
+        self.unique_viewers = getattr(server, 'unique_viewers', None)
 
         self.all_sdgs = [
             'SDG 1', 'SDG 2', 'SDG 3', 'SDG 4', 'SDG 5', 'SDG 6', 'SDG 7', 
@@ -48,6 +46,17 @@ class UserEngagementDash:
             'SDG 14', 'SDG 15', 'SDG 16', 'SDG 17'
         ]
 
+        # Layout and callbacks need the loaded data; show a loading state until then
+        defer_until_ready(self.dash_app, [view_manager, db_manager, engagement_cube], self.setup)
+
+    def setup(self):
+        """Load the default filter values, then build the layout and register callbacks."""
+        self.palette_dict = view_manager.get_college_colors()
+        self.default_colleges = view_manager.get_unique_values('college_id')
+        self.default_programs = []
+        self.default_statuses = view_manager.get_unique_values('status')
+        self.default_years = [view_manager.get_min_value('year'), view_manager.get_max_value('year')]
+
         self.set_layout()
         self.add_callbacks()
 
@@ -201,6 +210,7 @@ class UserEngagementDash:
 
         self.dash_app.layout = dbc.Container([
             dcc.Interval(id="data-refresh-interval", interval=30000, n_intervals=0),
+            dcc.Store(id="data-version-store"),  # data version this client last saw
             dbc.Row([sidebar, 
                      main_content], className="g-0")
         ], fluid=True,style={
@@ -234,12 +244,11 @@ class UserEngagementDash:
         elif isinstance(selected_colleges, str):
             selected_colleges = [selected_colleges]  # Ensure single college is in a list
         
-        # Fetch data using get_engagement_over_time
-        # Assuming get_engagement_over_time returns a list of tuples [(date, total_views, total_unique_views, total_downloads), ...]
-        engagement_data = get_engagement_over_time(start_date, end_date, selected_colleges)
+        # Daily totals from the engagement cube
+        engagement_data = engagement_cube.rollup('day', start_date, end_date, college_id=selected_colleges)
 
         # Convert data to DataFrame
-        df = pd.DataFrame(engagement_data, columns=['engagement_date', 'total_views', 'total_unique_views', 'total_downloads'])
+        df = engagement_data.rename(columns={'day': 'engagement_date'})[['engagement_date', 'total_views', 'total_unique_views', 'total_downloads']]
         if df.empty:
             # Return a blank figure with centered text
             fig = go.Figure()
@@ -318,8 +327,13 @@ class UserEngagementDash:
         elif isinstance(selected_colleges, str):
             selected_colleges = [selected_colleges]  # Ensure single college is in a list
 
-        # Get funnel data from the database
-        funnel_data = get_funnel_data(start_date, end_date, college_ids=selected_colleges)
+        # Get funnel data from the engagement cube
+        totals = engagement_cube.totals(start_date, end_date, college_id=selected_colleges)
+        funnel_data = [
+            {'stage': 'Total Views', 'total_views': totals['total_views']},
+            {'stage': 'Total Unique Views', 'total_views': totals['total_unique_views']},
+            {'stage': 'Total Downloads', 'total_views': totals['total_downloads']}
+        ] if any(totals.values()) else []
 
         if not funnel_data:
             print("Debug: Funnel data is empty or could not be fetched.")
@@ -450,12 +464,9 @@ class UserEngagementDash:
         elif isinstance(selected_colleges, str):
             selected_colleges = [selected_colleges]  # Ensure single college is in a list
 
-        # Get engagement data from the database
-        engagement_data = get_engagement_by_day_of_week(start_date, end_date, selected_colleges)
-        print(engagement_data)
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(engagement_data)
+        # Get engagement totals per day of the week from the engagement cube
+        df = engagement_cube.rollup('weekday', start_date, end_date, college_id=selected_colleges)
+        df['day_of_week'] = df['day_of_week'].astype(str)
         if df.empty:
             # Return a blank figure with centered text
             fig = go.Figure()
@@ -534,11 +545,9 @@ class UserEngagementDash:
         if not selected_colleges:
             raise ValueError("No colleges selected.")
         
-        # Call get_top_10_research_ids_by_views to get the top 10 research IDs by views
-        top_views_data = get_top_10_research_ids_by_views(start_date, end_date, selected_colleges, view_type)
-        
-        # Convert the result to a DataFrame
-        df = pd.DataFrame(top_views_data)
+        # Top 10 research IDs by views from the engagement cube
+        df = engagement_cube.top(view_type, 'research_id', 10, start_date, end_date, college_id=selected_colleges)
+        df = df.rename(columns={view_type: 'total_value'})
 
 
         if df.empty or df['total_value'].sum() == 0:
@@ -710,12 +719,8 @@ class UserEngagementDash:
         if not selected_colleges:
             raise ValueError("No colleges selected.")
 
-        # Call get_top_10_research_ids_by_downloads to get the top 10 research IDs by downloads
-        top_downloads_data = get_top_10_research_ids_by_downloads(start_date, end_date, selected_colleges)
-        
-
-        # Convert the result to a DataFrame
-        df = pd.DataFrame(top_downloads_data)
+        # Top 10 research IDs by downloads from the engagement cube
+        df = engagement_cube.top('total_downloads', 'research_id', 10, start_date, end_date, college_id=selected_colleges)
 
         if df.empty or df['total_downloads'].sum() == 0:
             # Return a blank figure with centered text
@@ -880,6 +885,9 @@ class UserEngagementDash:
 
 
     def add_callbacks(self):
+        # Interval ticks only reach the callbacks below when the data version changed
+        add_data_version_gate(self.dash_app, lambda: f"{engagement_cube.version}:{datetime.now().date()}")
+
         # Callback for reset button
 
         
@@ -927,13 +935,13 @@ class UserEngagementDash:
                 Output("kpi-avg-views", "children")
             ],
             [
-                Input("data-refresh-interval", "n_intervals"),
+                Input("data-version-store", "data"),
                 Input("college", "value"),
                 Input("date-range-dropdown", "value"),
                 Input('url', 'search')
             ]
         )
-        def refresh_text_display(n_intervals, selected_colleges, selected_range, search):
+        def refresh_text_display(data_version, selected_colleges, selected_range, search):
             if search:
                 params = parse_qs(search.lstrip("?"))  # Parse query parameters
                 user_role = params.get("user-role",["Guest"])[0]
@@ -941,7 +949,7 @@ class UserEngagementDash:
                 program = params.get("program", [""])[0]
                 self.college = college
                 self.program = program
-            print(f"🔄 Refresh triggered! Interval: {n_intervals}")
+            print(f"🔄 Refresh triggered! Data version: {data_version}")
             print(f"📌 Colleges selected: {selected_colleges}")
             print(f"📌 Date Range selected: {selected_range}")
 
@@ -954,8 +962,8 @@ class UserEngagementDash:
             start, end = self.get_date_range(selected_range)
             print(f"📅 Date range applied: {start} to {end}")
 
-            # Fetch engagement data
-            engagement_data = get_engagement_summary(start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'), selected_colleges)
+            # Fetch engagement totals from the engagement cube
+            engagement_data = [engagement_cube.totals(start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'), college_id=selected_colleges)]
             users_data = get_user_engagement_summary(start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'), selected_colleges)
             if not users_data:
                 active_users=0
@@ -969,6 +977,12 @@ class UserEngagementDash:
                 total_views = sum(item["total_views"] for item in engagement_data)
                 total_unique_views = sum(item["total_unique_views"] for item in engagement_data)
                 total_downloads = sum(item["total_downloads"] for item in engagement_data)
+
+            # Distinct viewers over the whole range from the merged daily sketches, when available
+            if self.unique_viewers is not None:
+                sketch_count = self.unique_viewers.count(start.date(), end.date(), college_ids=selected_colleges)
+                if sketch_count is not None:
+                    total_unique_views = sketch_count
                 
 
 
@@ -986,10 +1000,10 @@ class UserEngagementDash:
             [
                 Input('college', 'value'),
                 Input('date-range-dropdown', 'value'),
-                Input("data-refresh-interval", "n_intervals")
+                Input("data-version-store", "data")
             ]
         )
-        def update_linechart(selected_colleges, selected_range, n_intervals):
+        def update_linechart(selected_colleges, selected_range, data_version):
             selected_colleges = default_if_empty(selected_colleges, self.default_colleges)
             # Default to last 7 days
             start,end = self.get_date_range(selected_range)
@@ -1001,10 +1015,10 @@ class UserEngagementDash:
             [
                 Input('college', 'value'),
                 Input('date-range-dropdown', 'value'),
-                Input("data-refresh-interval", "n_intervals")
+                Input("data-version-store", "data")
             ]
         )
-        def update_user_funnel(selected_colleges, selected_range, n_intervals):
+        def update_user_funnel(selected_colleges, selected_range, data_version):
             selected_colleges = default_if_empty(selected_colleges, self.default_colleges)
             start,end = self.get_date_range(selected_range)
             return self.create_user_funnel(selected_colleges, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
@@ -1014,10 +1028,10 @@ class UserEngagementDash:
             [
                 Input('college', 'value'),
                 Input('date-range-dropdown', 'value'),
-                Input("data-refresh-interval", "n_intervals")
+                Input("data-version-store", "data")
             ]
         )
-        def update_research_funnel(selected_colleges, selected_range, n_intervals):
+        def update_research_funnel(selected_colleges, selected_range, data_version):
             selected_colleges = default_if_empty(selected_colleges, self.default_colleges)
             start,end = self.get_date_range(selected_range)
             return self.create_research_funnel(selected_colleges, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
@@ -1027,10 +1041,10 @@ class UserEngagementDash:
             [
                 Input('college', 'value'),
                 Input('date-range-dropdown', 'value'),
-                Input("data-refresh-interval", "n_intervals")
+                Input("data-version-store", "data")
             ]
         )
-        def update_area_chart(selected_colleges, selected_range, n_intervals):
+        def update_area_chart(selected_colleges, selected_range, data_version):
             selected_colleges = default_if_empty(selected_colleges, self.default_colleges)
             start,end = self.get_date_range(selected_range)
             
@@ -1108,9 +1122,9 @@ class UserEngagementDash:
 
         @self.dash_app.callback(
             Output("timestamp", "children"),  
-            [Input("data-refresh-interval", "n_intervals")]  
+            [Input("data-version-store", "data")]  
         )
-        def update_timestamp(n):
+        def update_timestamp(data_version):
             # Generate a new timestamp each time the callback is triggered
             return html.P(f"as of {datetime.now():%B %d, %Y %I:%M %p}", 
                          style={
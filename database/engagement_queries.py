@@ -8,17 +8,16 @@ def get_aggregated_user_engagement():
     session = Session()
 
     try:
-        # Execute the SQL query to get aggregated user engagement data
+        # Read the daily per-paper rollup (see services/engagement_rollup.py)
         result = session.execute(
             text("""
                 SELECT 
-                    DATE(timestamp) AS engagement_date, 
+                    day AS engagement_date, 
                     research_id,
-                    COUNT(DISTINCT user_id) AS total_unique_views,  
-                    SUM(view) AS total_views,                       
-                    SUM(download) AS total_downloads                
-                FROM user_engagement
-                GROUP BY DATE(timestamp), research_id
+                    unique_views AS total_unique_views,  
+                    total_views,                       
+                    total_downloads                
+                FROM user_engagement_daily
                 ORDER BY engagement_date, research_id;
             """)
         )
@@ -34,6 +33,7 @@ def get_engagement_summary(start_date, end_date, college_filter=None):
     session = Session()
     """
     Fetches aggregated user engagement summary between given dates, with an optional college filter.
+    Reads the daily rollup, so unique views are summed per paper and day.
     
     :param session: SQLAlchemy session object
     :param start_date: Start date for filtering engagement data
@@ -41,11 +41,20 @@ def get_engagement_summary(start_date, end_date, college_filter=None):
     :param college_filter: Optional college ID filter
     :return: List of dictionaries containing engagement summary
     """
+    if isinstance(college_filter, np.ndarray):
+        college_filter = college_filter.tolist()
+
     try:
         # Prepare the SQL query
         query = text("""
-            SELECT * 
-            FROM get_engagement_kpi(:start_date, :end_date, :college_filter)
+            SELECT 
+                COALESCE(SUM(a.total_views), 0) AS total_views,
+                COALESCE(SUM(a.unique_views), 0) AS total_unique_views,
+                COALESCE(SUM(a.total_downloads), 0) AS total_downloads
+            FROM user_engagement_daily a
+            JOIN research_outputs r ON r.research_id = a.research_id
+            WHERE a.day BETWEEN :start_date AND :end_date
+              AND (CAST(:college_filter AS TEXT[]) IS NULL OR r.college_id = ANY(CAST(:college_filter AS TEXT[])))
         """
         )
 
@@ -93,17 +102,26 @@ def get_engagement_kpi(start_date, end_date, college_filter=None):
 
 
 def get_engagement_over_time(start_date, end_date, college_filter=None):
-    """Fetches user engagement metrics over time within a date range, optionally filtering by college."""
+    """Fetches user engagement metrics over time within a date range, optionally filtering by college.
+    Reads the daily rollup, so unique views are summed per paper and day."""
     
+    if isinstance(college_filter, np.ndarray):
+        college_filter = college_filter.tolist()
+
     session = Session()
     try:
         query = text("""
             SELECT 
-                engagement_date,
-                total_views,
-                total_unique_views,
-                total_downloads
-            FROM get_engagement_over_time(:start_date, :end_date, :college_filter)
+                a.day AS engagement_date,
+                SUM(a.total_views) AS total_views,
+                SUM(a.unique_views) AS total_unique_views,
+                SUM(a.total_downloads) AS total_downloads
+            FROM user_engagement_daily a
+            JOIN research_outputs r ON r.research_id = a.research_id
+            WHERE a.day BETWEEN :start_date AND :end_date
+              AND (CAST(:college_filter AS TEXT[]) IS NULL OR r.college_id = ANY(CAST(:college_filter AS TEXT[])))
+            GROUP BY a.day
+            ORDER BY a.day
         """)
 
         result = session.execute(query, {
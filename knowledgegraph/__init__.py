@@ -1,5 +1,7 @@
-from services.database_manager import DatabaseManager  
+# Share the dashboards' (lazily loaded) database manager instead of building a second one
+from dashboards import db_manager
+from services.graph_layout import LayoutCache
 from config import Config
 
-# Initialize the database manager
-db_manager = DatabaseManager(Config.SQLALCHEMY_DATABASE_URI)
\ No newline at end of file
+# Node positions of the knowledge graphs, reused across callbacks (see LayoutCache)
+graph_layouts = LayoutCache(max_entries=Config.LAYOUT_CACHE_MAX, fast_layout_nodes=Config.FAST_LAYOUT_NODES)
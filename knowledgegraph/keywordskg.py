@@ -7,16 +7,22 @@ from collections import defaultdict, Counter
 import pandas as pd
 import numpy as np
 from database.knowledgegraph_queries import get_program_research_aggregation
+from dashboards import snapshot_refresher
+from . import graph_layouts
+from services.keyword_index import KeywordUsageIndex
+from services.graph_traces import graph_arrays, edge_coordinates, node_frame
 
 # Define color for keywords (Distinct Purple)
 keyword_color = '#8A2BE2'
 
-# Global variable to store node positions
-global_pos = {}
+# Keyword usage per program, queried and indexed once per dashboard data version
+# (before the dashboard snapshot has loaded the index is built without a version)
+keyword_index = KeywordUsageIndex(
+    get_program_research_aggregation,
+    lambda: snapshot_refresher.version if snapshot_refresher.is_ready() else None
+)
 
 def create_research_network(flask_app):
-    global global_pos
-
     # Initialize Dash app
     dash_app = Dash(__name__, server=flask_app, url_base_pathname='/knowledgegraph/research-network/')
 
@@ -87,62 +93,15 @@ def create_research_network(flask_app):
         }
     }
 
-    # Process data to collect usage per program information
-    program_data = get_program_research_aggregation()
+    # Keyword usage per program of the current data version
+    co_usage = keyword_index.current()
+    program_data = co_usage.rows
 
-    # Calculate initial thresholds based on per-program usage
-    keyword_program_usage = defaultdict(lambda: defaultdict(int))
-    
-    for _, row in program_data.iterrows():
-        if pd.notnull(row['concatenated_keywords']):
-            keywords = [k.strip().lower() for k in row['concatenated_keywords'].split(';')]
-            program = row['program_name']
-            for keyword in keywords:
-                keyword_program_usage[keyword][program] += 1
-
-    # Find the highest number where any keyword has at least 2 programs using it that many times
-    max_threshold = 1
-    # Test each possible threshold from 1 up
-    for test_threshold in range(1, 100):  # Set a reasonable upper limit
-        found_valid_keyword = False
-        # Check each keyword
-        for keyword, program_counts in keyword_program_usage.items():
-            # Count programs that used this keyword at least test_threshold times
-            programs_meeting_threshold = sum(
-                1 for count in program_counts.values() 
-                if count >= test_threshold
-            )
-            # If at least 2 programs meet this threshold
-            if programs_meeting_threshold >= 2:
-                found_valid_keyword = True
-                break
-        
-        if found_valid_keyword:
-            max_threshold = test_threshold
-        else:
-            # If no keywords have 2+ programs meeting this threshold, we've found our max
-            break
-
-    min_usage_threshold = 1
-    max_usage_threshold = max_threshold
-    default_threshold = (min_usage_threshold + max_usage_threshold) // 2
+    # Slider bounds and marks from the threshold histogram of all data
+    min_usage_threshold, max_usage_threshold, default_threshold, usage_marks = threshold_slider(co_usage.select())
 
     print(f"Initial thresholds - min: {min_usage_threshold}, max: {max_usage_threshold}, default: {default_threshold}")
 
-    # Create marks for usage threshold
-    if max_usage_threshold > 10:
-        step = max(1, max_usage_threshold // 6)
-        usage_marks = {
-            i: f'≥{i} uses each by 2+ programs' for i in range(
-                min_usage_threshold, 
-                max_usage_threshold + 1, 
-                step
-            )
-        }
-        usage_marks[max_usage_threshold] = f'≥{max_usage_threshold} uses each by 2+ programs'
-    else:
-        usage_marks = {i: f'≥{i} uses each by 2+ programs' for i in range(min_usage_threshold, max_usage_threshold + 1)}
-
     # Define layout with single filter
     dash_app.layout = html.Div([
         dcc.Store(id='clicked-node', data=None),
@@ -226,65 +185,17 @@ def create_research_network(flask_app):
     def update_usage_threshold_range(year_range, selected_colleges, n_intervals):
         print(f"Updating threshold range. Interval trigger: {n_intervals}")
         
-        # Get filtered data
-        filtered_data = get_program_research_aggregation(
+        # Slice the keyword usage of the selected years and colleges
+        usage = keyword_index.select(
             start_year=year_range[0] if year_range else None,
             end_year=year_range[1] if year_range else None,
-            selected_colleges=selected_colleges if selected_colleges else None
+            colleges=selected_colleges
         )
 
-        # Calculate keyword usage per program
-        keyword_program_usage = defaultdict(lambda: defaultdict(int))
-        for _, row in filtered_data.iterrows():
-            if pd.notnull(row['concatenated_keywords']):
-                keywords = [k.strip().lower() for k in row['concatenated_keywords'].split(';')]
-                program = row['program_name']
-                for keyword in keywords:
-                    keyword_program_usage[keyword][program] += 1
-
-        # Find the highest number where any keyword has at least 2 programs using it that many times
-        max_threshold = 1
-        # Test each possible threshold from 1 up
-        for test_threshold in range(1, 100):  # Set a reasonable upper limit
-            found_valid_keyword = False
-            # Check each keyword
-            for keyword, program_counts in keyword_program_usage.items():
-                # Count programs that used this keyword at least test_threshold times
-                programs_meeting_threshold = sum(
-                    1 for count in program_counts.values() 
-                    if count >= test_threshold
-                )
-                # If at least 2 programs meet this threshold
-                if programs_meeting_threshold >= 2:
-                    found_valid_keyword = True
-                    break
-            
-            if found_valid_keyword:
-                max_threshold = test_threshold
-            else:
-                # If no keywords have 2+ programs meeting this threshold, we've found our max
-                break
-
-        min_usage_threshold = 1
-        max_usage_threshold = max_threshold
-        default_threshold = (min_usage_threshold + max_usage_threshold) // 2
+        min_usage_threshold, max_usage_threshold, default_threshold, usage_marks = threshold_slider(usage)
 
         print(f"Setting threshold range: min={min_usage_threshold}, max={max_usage_threshold}, default={default_threshold}")
 
-        # Create marks for usage threshold
-        if max_usage_threshold > 10:
-            step = max(1, max_usage_threshold // 6)
-            usage_marks = {
-                i: f'≥{i} uses each by 2+ programs' for i in range(
-                    min_usage_threshold, 
-                    max_usage_threshold + 1, 
-                    step
-                )
-            }
-            usage_marks[max_usage_threshold] = f'≥{max_usage_threshold} uses each by 2+ programs'
-        else:
-            usage_marks = {i: f'≥{i} uses each by 2+ programs' for i in range(min_usage_threshold, max_usage_threshold + 1)}
-
         return min_usage_threshold, max_usage_threshold, default_threshold, usage_marks
 
     @dash_app.callback(
@@ -300,48 +211,15 @@ def create_research_network(flask_app):
     def update_graph(year_range, selected_colleges, usage_threshold, clickData, n_intervals, previous_clicked):
         print(f"Updating graph. Interval trigger: {n_intervals}")
         
-        # Get filtered data
-        filtered_data = get_program_research_aggregation(
+        # Slice the keyword usage of the selected years and colleges
+        usage = keyword_index.select(
             start_year=year_range[0] if year_range else None,
             end_year=year_range[1] if year_range else None,
-            selected_colleges=selected_colleges if selected_colleges else None
+            colleges=selected_colleges
         )
 
-        # Recalculate keyword usage based on filtered data
-        keyword_program_usage = defaultdict(lambda: defaultdict(int))
-        for _, row in filtered_data.iterrows():
-            if pd.notnull(row['concatenated_keywords']):
-                keywords = [k.strip().lower() for k in row['concatenated_keywords'].split(';')]
-                program = row['program_name']
-                for keyword in keywords:
-                    keyword_program_usage[keyword][program] += 1
-
         # Find the highest number where any keyword has at least 2 programs using it that many times
-        max_threshold = 1
-        # Get the absolute maximum any program used any keyword
-        absolute_max = max(
-            count 
-            for program_counts in keyword_program_usage.values() 
-            for count in program_counts.values()
-        )
-        
-        # Test each possible threshold from 1 to absolute_max
-        for test_threshold in range(1, absolute_max + 1):
-            # Check each keyword
-            for keyword, program_counts in keyword_program_usage.items():
-                # Count programs that used this keyword at least test_threshold times
-                programs_meeting_threshold = sum(
-                    1 for count in program_counts.values() 
-                    if count >= test_threshold
-                )
-                # If at least 2 programs meet this threshold
-                if programs_meeting_threshold >= 2:
-                    max_threshold = test_threshold
-                    break  # Found a keyword with 2+ programs meeting this threshold
-            else:
-                # If we complete the keyword loop without finding any keywords
-                # with 2+ programs meeting this threshold, we've found our max
-                break
+        max_threshold = usage.max_threshold()
 
         # Ensure usage_threshold is within valid range
         if usage_threshold is None:
@@ -361,7 +239,7 @@ def create_research_network(flask_app):
         
         # Build network
         G = build_keyword_network(
-            filtered_data,
+            usage,
             clicked_keyword=clicked_keyword,
             usage_threshold=usage_threshold
         )
@@ -369,11 +247,12 @@ def create_research_network(flask_app):
         traces = build_network_traces(G, clicked_keyword)
 
         title = f'Research Synergy Knowledge Graph (Min. {usage_threshold} uses per program)'
-        if selected_colleges or year_range != [filtered_data['school_year'].min(), filtered_data['school_year'].max()]:
+        data_years = list(usage.years) if usage.years else None
+        if selected_colleges or year_range != data_years:
             filter_desc = []
             if selected_colleges:
                 filter_desc.append(f"Colleges: {', '.join(selected_colleges)}")
-            if year_range != [filtered_data['school_year'].min(), filtered_data['school_year'].max()]:
+            if year_range != data_years:
                 filter_desc.append(f"Years: {year_range[0]}-{year_range[1]}")
             title += f" ({' | '.join(filter_desc)})"
 
@@ -397,164 +276,128 @@ def create_research_network(flask_app):
     return dash_app
 
 
-def build_keyword_network(df, clicked_keyword=None, usage_threshold=1):
+def threshold_slider(usage):
+    """
+    Bounds, default and marks of the usage threshold slider. The max is the highest
+    threshold some keyword still meets in 2+ programs, and each mark shows how many
+    keywords remain at that threshold.
+    """
+    keyword_counts = usage.threshold_histogram()
+    min_usage_threshold = 1
+    max_usage_threshold = max(len(keyword_counts) - 1, 1)
+    default_threshold = (min_usage_threshold + max_usage_threshold) // 2
+
+    # Create marks for usage threshold
+    step = max(1, max_usage_threshold // 6) if max_usage_threshold > 10 else 1
+    thresholds = set(range(min_usage_threshold, max_usage_threshold + 1, step)) | {max_usage_threshold}
+    usage_marks = {
+        i: f'≥{i} uses each by 2+ programs ({keyword_counts[i]} keywords)'
+        for i in sorted(thresholds)
+    }
+    return min_usage_threshold, max_usage_threshold, default_threshold, usage_marks
+
+def build_keyword_network(usage, clicked_keyword=None, usage_threshold=1):
     print(f"Building network with threshold: {usage_threshold}")  # Debug print
     G = nx.Graph()
-    
-    # Get aggregated program data
-    program_data = get_program_research_aggregation()
-    
-    # Collect keyword statistics
-    keyword_program_usage = defaultdict(lambda: defaultdict(int))
-    program_colors = {}
-    
-    # Process the DataFrame rows to get keyword usage per program
-    for _, row in program_data.iterrows():
-        program = row['program_name']
-        program_colors[program] = row['color_code']
-        
-        if pd.notnull(row['concatenated_keywords']):
-            keywords = [k.strip().lower() for k in row['concatenated_keywords'].split(';')]
-            for keyword in keywords:
-                keyword_program_usage[keyword][program] += 1
-    
-    # Filter keywords: must have at least 2 programs that EACH used it >= threshold times
-    valid_keywords = set()
-    for keyword, program_counts in keyword_program_usage.items():
-        # Get programs that used it at least threshold times
-        high_usage_programs = [prog for prog, count in program_counts.items() 
-                             if count >= usage_threshold]
-        if len(high_usage_programs) >= 2:  # At least 2 programs must meet threshold
-            valid_keywords.add(keyword)
-    
+
+    # Keywords must have at least 2 programs that EACH used it >= threshold times
+    programs_meeting = usage.programs_meeting(usage_threshold)
+    valid_keywords = np.flatnonzero(programs_meeting >= 2)
+
     print(f"Found {len(valid_keywords)} valid keywords")  # Debug print
-    
-    if clicked_keyword and clicked_keyword in valid_keywords:
+
+    clicked = usage.keyword_position(clicked_keyword)
+    if clicked is not None and programs_meeting[clicked] >= 2:
         # Show clicked keyword and ONLY its connected programs that meet the threshold
-        high_usage_programs = [prog for prog, count in keyword_program_usage[clicked_keyword].items() 
-                             if count >= usage_threshold]
-        
-        G.add_node(clicked_keyword, 
+        programs, counts = usage.keyword_programs(clicked, usage_threshold)
+
+        G.add_node(clicked_keyword,
                   type='keyword',
-                  usage_count=sum(count for prog, count in keyword_program_usage[clicked_keyword].items()
-                                if prog in high_usage_programs),
-                  program_count=len(high_usage_programs))
-        
+                  usage_count=int(counts.sum()),
+                  program_count=len(programs))
+
         # Add ONLY programs that used it >= threshold times
-        for program in high_usage_programs:
-            count = keyword_program_usage[clicked_keyword][program]
-            research_count = program_data[program_data['program_name'] == program]['research_count'].iloc[0]
-            G.add_node(program, 
+        research_counts = usage.research_counts
+        for program, count in zip(programs, counts):
+            program_name = usage.programs[program]
+            G.add_node(program_name,
                       type='program',
-                      usage_count=count,
-                      research_count=research_count,
+                      usage_count=int(count),
+                      research_count=int(research_counts[program]),
                       relative_size=1.0,
-                      color_code=program_colors[program])
-            G.add_edge(clicked_keyword, program)
+                      color_code=usage.colors[program])
+            G.add_edge(clicked_keyword, program_name)
     else:
         # Show all valid keywords
+        usage_counts = usage.usage_counts(usage_threshold)
         for keyword in valid_keywords:
-            high_usage_programs = [prog for prog, count in keyword_program_usage[keyword].items() 
-                                 if count >= usage_threshold]
-            G.add_node(keyword, 
+            G.add_node(usage.keywords[keyword],
                       type='keyword',
-                      usage_count=sum(count for prog, count in keyword_program_usage[keyword].items()
-                                    if prog in high_usage_programs),
-                      program_count=len(high_usage_programs))
-    
+                      usage_count=int(usage_counts[keyword]),
+                      program_count=int(programs_meeting[keyword]))
+
     return G
 
 def build_network_traces(G, clicked_node):
-    global global_pos
-
     # Use Kamada-Kawai layout when a node is clicked, spring layout otherwise
+    # (both cached per graph structure, see LayoutCache)
     if clicked_node:
-        pos = nx.kamada_kawai_layout(G)
+        pos = graph_layouts.layout(G, 'kamada_kawai')
     else:
-        # Check if global_pos has all current nodes, if not recalculate
-        current_nodes = set(G.nodes())
-        if global_pos and set(global_pos.keys()) == current_nodes:
-            pos = global_pos
-        else:
-            pos = nx.spring_layout(G, k=1, iterations=50)
-            global_pos = pos
+        pos = graph_layouts.layout(G, 'spring', k=1, iterations=50)
+
+    # Positions and edges as arrays; nodes without a position are skipped
+    nodes, positions, edge_index = graph_arrays(G, pos)
+    frame = node_frame(G, nodes, positions,
+                       columns=['type', 'usage_count', 'program_count', 'relative_size', 'color_code'])
 
     traces = []
-    
+
     # Create keyword nodes trace
-    keyword_nodes = [node for node, attr in G.nodes(data=True) if attr['type'] == 'keyword']
-    if keyword_nodes:
-        keyword_hovertext = []
-        for node in keyword_nodes:
-            usage_count = G.nodes[node]['usage_count']
-            high_usage_programs = G.nodes[node]['program_count']  # This is now correctly counted in build_keyword_network
-            keyword_hovertext.append(f"{node}\nUsed {usage_count} times in {high_usage_programs} programs")
-
-        # Filter nodes that have positions
-        positioned_keyword_nodes = [node for node in keyword_nodes if node in pos]
-        
-        if positioned_keyword_nodes:
-            traces.append(go.Scatter(
-                x=[pos[node][0] for node in positioned_keyword_nodes],
-                y=[pos[node][1] for node in positioned_keyword_nodes],
-                mode='markers+text',
-                text=[node for node in positioned_keyword_nodes],
-                hovertext=[keyword_hovertext[keyword_nodes.index(node)] for node in positioned_keyword_nodes],
-                textposition="bottom center",
-                marker=dict(
-                    size=[20 + (G.nodes[node]['program_count'] * 2) for node in positioned_keyword_nodes],
-                    color=keyword_color,
-                    symbol='diamond'
-                ),
-                name='Keywords',
-                hoverinfo='text'
-            ))
+    keywords = frame[frame['type'] == 'keyword']
+    if not keywords.empty:
+        keyword_hovertext = (keywords['node'].astype(str) + '\nUsed ' + keywords['usage_count'].astype(int).astype(str)
+                             + ' times in ' + keywords['program_count'].astype(int).astype(str) + ' programs')
+        traces.append(go.Scatter(
+            x=keywords['x'].to_numpy(),
+            y=keywords['y'].to_numpy(),
+            mode='markers+text',
+            text=keywords['node'].tolist(),
+            hovertext=keyword_hovertext.tolist(),
+            textposition="bottom center",
+            marker=dict(
+                size=(20 + keywords['program_count'] * 2).to_numpy(),
+                color=keyword_color,
+                symbol='diamond'
+            ),
+            name='Keywords',
+            hoverinfo='text'
+        ))
 
     # Create program nodes trace if a keyword is clicked
-    program_nodes = [node for node, attr in G.nodes(data=True) if attr['type'] == 'program']
-    if program_nodes:
-        program_hovertext = []
-        node_colors = []
-        for node in program_nodes:
-            usage_count = G.nodes[node]['usage_count']
-            color_code = G.nodes[node]['color_code']
-            program_hovertext.append(f"{node}\nUses keyword {usage_count} times")
-            node_colors.append(color_code or '#0A438F')  # Default to '#0A438F' if color_code is None
-
-        # Filter nodes that have positions
-        positioned_program_nodes = [node for node in program_nodes if node in pos]
-        
-        if positioned_program_nodes:
-            # Get corresponding colors and hover text for positioned nodes
-            positioned_colors = [node_colors[program_nodes.index(node)] for node in positioned_program_nodes]
-            positioned_hovertext = [program_hovertext[program_nodes.index(node)] for node in positioned_program_nodes]
-            
-            traces.append(go.Scatter(
-                x=[pos[node][0] for node in positioned_program_nodes],
-                y=[pos[node][1] for node in positioned_program_nodes],
-                mode='markers+text',
-                text=[node for node in positioned_program_nodes],
-                hovertext=positioned_hovertext,
-                textposition="top center",
-                marker=dict(
-                    size=[30 * G.nodes[node]['relative_size'] for node in positioned_program_nodes],
-                    color=positioned_colors,
-                    symbol='circle'
-                ),
-                name='Programs',
-                hoverinfo='text'
-            ))
+    programs = frame[frame['type'] == 'program']
+    if not programs.empty:
+        program_hovertext = (programs['node'].astype(str) + '\nUses keyword '
+                             + programs['usage_count'].astype(int).astype(str) + ' times')
+        traces.append(go.Scatter(
+            x=programs['x'].to_numpy(),
+            y=programs['y'].to_numpy(),
+            mode='markers+text',
+            text=programs['node'].tolist(),
+            hovertext=program_hovertext.tolist(),
+            textposition="top center",
+            marker=dict(
+                size=(30 * programs['relative_size']).to_numpy(),
+                color=programs['color_code'].fillna('#0A438F').tolist(),  # Default to '#0A438F' if color_code is None
+                symbol='circle'
+            ),
+            name='Programs',
+            hoverinfo='text'
+        ))
 
     # Add edges if a keyword is clicked
     if clicked_node:
-        edge_x = []
-        edge_y = []
-        for edge in G.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
-
+        edge_x, edge_y = edge_coordinates(positions, edge_index)
         traces.insert(0, go.Scatter(
             x=edge_x,
             y=edge_y,
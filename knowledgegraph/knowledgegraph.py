@@ -11,8 +11,11 @@ from database.knowledgegraph_queries import get_filtered_kgdata, get_filtered_sd
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 from models import db  # Import db from models
-from . import db_manager
+from . import db_manager, graph_layouts
+from dashboards import snapshot_refresher
+from dashboards.usable_methods import defer_until_ready, add_data_version_gate
 from services.sdg_colors import sdg_colors
+from services.graph_traces import graph_arrays, edge_coordinates, node_frame
 import json
 from dash import clientside_callback
 import dash_bootstrap_components as dbc
@@ -25,7 +28,8 @@ dragmode = 'pan'  # Allows users to move the graph freely
 # Global position variable
 pos = {}
 
-def create_kg_area(flask_app):
+def build_kg_area(dash_app):
+    """Build the knowledge graph layout and callbacks once the data has loaded."""
     # Get min and max years from the database manager
     sdg_counts_df = get_filtered_sdg_counts()
     min_year = db_manager.get_min_value('year')
@@ -100,14 +104,9 @@ def create_kg_area(flask_app):
                 # Create a subgraph of remaining nodes
                 remaining_subgraph = G.subgraph(remaining_nodes)
                 
-                # Use Kamada-Kawai layout for remaining nodes
-                other_pos = nx.kamada_kawai_layout(
-                    remaining_subgraph,
-                    dist=None,
-                    weight=None,
-                    pos={node: (np.random.rand() * 2 - 1, np.random.rand() * 2 - 1) 
-                        for node in remaining_nodes}  # Random initial positions
-                )
+                # Use Kamada-Kawai layout for remaining nodes (cached, warm-started from
+                # the previous layout instead of random initial positions)
+                other_pos = graph_layouts.layout(remaining_subgraph, 'kamada_kawai', weight=None)
                 
                 # Update positions
                 pos.update(other_pos)
@@ -123,14 +122,11 @@ def create_kg_area(flask_app):
         MIN_SIZE = 76
         MAX_SIZE = 130
 
+        # Positions and edges as arrays; nodes without a position are skipped
+        nodes, positions, edge_index = graph_arrays(G, pos, edges=edges)
+
         # Create edge trace
-        edge_x = []
-        edge_y = []
-        for edge in edges:
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
+        edge_x, edge_y = edge_coordinates(positions, edge_index)
 
         edge_trace = go.Scatter(
             x=edge_x,
@@ -140,92 +136,72 @@ def create_kg_area(flask_app):
             mode='lines'
         )
 
-        # Create separate traces for SDG nodes and area nodes
-        sdg_x, sdg_y = [], []
-        sdg_hover_text = []
-        sdg_images = []
-        sdg_sizes = []
-        sdg_data = []
-
-        area_x, area_y = [], []
-        area_text = []
-        area_hover_text = []
-        area_color = []
-        area_size = []
-        area_data = []
+        frame = node_frame(G, nodes, positions, columns=['type', 'study_count', 'node_size'])
+        frame['study_count'] = pd.to_numeric(frame['study_count'], errors='coerce').fillna(0).astype(int)
 
         # Get max study count for relative sizing
-        max_study_count = max([G.nodes[node].get('study_count', 0) for node in G.nodes()], default=1)
-
-        for node in G.nodes():
-            x, y = pos[node]
-            node_type = G.nodes[node].get('type', '')
-            study_count = G.nodes[node].get('study_count', 0)
-
-            if node_type == 'sdg':
-                sdg_x.append(x)
-                sdg_y.append(y)
-                
-                # Only show study count in overall view
-                if len(G.edges()) == 0:  # In overall view (no edges)
-                    hover_text = f"{node}<br>Research Count: {study_count}"
-                else:  # In detail view
-                    hover_text = f"{node}"
-                sdg_hover_text.append(hover_text)
-                
-                # Calculate size based on study count
-                if max_study_count > 0:
-                    relative_size = MIN_SIZE + ((study_count / max_study_count) * (MAX_SIZE - MIN_SIZE))
-                else:
-                    relative_size = MIN_SIZE
-                size = G.nodes[node].get('node_size', relative_size)
-                sdg_sizes.append(size)
-                
-                sdg_data.append({
-                    'id': node,
-                    'type': node_type,
-                    'study_count': study_count
-                })
-
-                # Add SDG image
-                sdg_number = node.split()[-1].zfill(2)
-                sdg_images.append(dict(
-                    source=f"/static/assets/sdg_icons/E-WEB-Goal-{sdg_number}.png",
-                    x=x,
-                    y=y,
-                    xref="x",
-                    yref="y",
-                    sizex=size/8,
-                    sizey=size/8,
-                    xanchor="center",
-                    yanchor="middle",
-                    layer="above",
-                    sizing="contain"
-                ))
-
-            elif node_type == 'area':
-                area_x.append(x)
-                area_y.append(y)
-                area_text.append(node)
-                area_hover_text.append(f"{node}<br>Research Count: {study_count}")
-                area_color.append('#9F7AEA')
-                size = G.nodes[node].get('node_size', MIN_SIZE)
-                area_size.append(size)
-                area_data.append({
-                    'id': node,
-                    'type': node_type,
-                    'study_count': study_count
-                })
+        max_study_count = frame['study_count'].max() if not frame.empty else 1
+
+        # Separate SDG nodes and area nodes
+        sdg_nodes = frame[frame['type'] == 'sdg']
+        area_nodes = frame[frame['type'] == 'area']
+
+        # Only show study count in overall view (no edges)
+        sdg_names = sdg_nodes['node'].astype(str)
+        if len(G.edges()) == 0:
+            sdg_hover_text = (sdg_names + '<br>Research Count: ' + sdg_nodes['study_count'].astype(str)).tolist()
+        else:
+            sdg_hover_text = sdg_names.tolist()
+
+        # Calculate size based on study count, unless the node has a fixed size
+        if max_study_count > 0:
+            relative_sizes = MIN_SIZE + (sdg_nodes['study_count'] / max_study_count) * (MAX_SIZE - MIN_SIZE)
+        else:
+            relative_sizes = pd.Series(MIN_SIZE, index=sdg_nodes.index)
+        sdg_sizes = sdg_nodes['node_size'].fillna(relative_sizes).to_numpy(dtype=float)
+
+        sdg_data = [
+            {'id': node, 'type': 'sdg', 'study_count': count}
+            for node, count in zip(sdg_nodes['node'], sdg_nodes['study_count'].tolist())
+        ]
+
+        # Add SDG images
+        sdg_images = [
+            dict(
+                source=f"/static/assets/sdg_icons/E-WEB-Goal-{node.split()[-1].zfill(2)}.png",
+                x=x,
+                y=y,
+                xref="x",
+                yref="y",
+                sizex=size/8,
+                sizey=size/8,
+                xanchor="center",
+                yanchor="middle",
+                layer="above",
+                sizing="contain"
+            )
+            for node, x, y, size in zip(sdg_nodes['node'], sdg_nodes['x'].tolist(),
+                                        sdg_nodes['y'].tolist(), sdg_sizes.tolist())
+        ]
+
+        area_text = area_nodes['node'].tolist()
+        area_hover_text = (area_nodes['node'].astype(str) + '<br>Research Count: '
+                           + area_nodes['study_count'].astype(str)).tolist()
+        area_size = area_nodes['node_size'].fillna(MIN_SIZE).to_numpy(dtype=float)
+        area_data = [
+            {'id': node, 'type': 'area', 'study_count': count}
+            for node, count in zip(area_nodes['node'], area_nodes['study_count'].tolist())
+        ]
 
         # Create SDG nodes trace (using images directly)
         sdg_trace = go.Scatter(
-            x=sdg_x,
-            y=sdg_y,
+            x=sdg_nodes['x'].to_numpy(),
+            y=sdg_nodes['y'].to_numpy(),
             mode='markers',
             hoverinfo='text',
             hovertext=sdg_hover_text,
             marker=dict(
-                size=[s*7 for s in sdg_sizes],  # Increased multiplier to match image size
+                size=sdg_sizes * 7,  # Increased multiplier to match image size
                 symbol='square',
                 opacity=0.5,  # Make markers completely invisible
                 sizemode='area'
@@ -241,14 +217,14 @@ def create_kg_area(flask_app):
 
         # Create area nodes trace
         area_trace = go.Scatter(
-            x=area_x,
-            y=area_y,
+            x=area_nodes['x'].to_numpy(),
+            y=area_nodes['y'].to_numpy(),
             mode='markers+text' if show_labels else 'markers',
             text=area_text,
             textposition="middle center",
             hovertext=area_hover_text,
             marker=dict(
-                color=area_color,
+                color='#9F7AEA',
                 size=area_size,
                 line_width=2,
                 line=dict(color='white'),
@@ -266,11 +242,11 @@ def create_kg_area(flask_app):
         )
 
         traces = []
-        if edges:
+        if len(edge_index):
             traces.append(edge_trace)
-        if area_x:
+        if not area_nodes.empty:
             traces.append(area_trace)
-        if sdg_x:
+        if not sdg_nodes.empty:
             traces.append(sdg_trace)
 
         return traces, sdg_images
@@ -293,12 +269,6 @@ def create_kg_area(flask_app):
     # Build initial traces
     edge_trace, sdg_images = build_traces(G, [], pos=pos, show_labels=True)
 
-    # Initialize Dash app
-    dash_app = Dash(__name__, 
-                   server=flask_app, 
-                   url_base_pathname='/knowledgegraph/',
-                   external_stylesheets=[dbc.themes.BOOTSTRAP])  # Add Bootstrap theme
-
     # Define styles as Python dictionaries
     styles = {
         'filter_container': {
@@ -469,12 +439,13 @@ def create_kg_area(flask_app):
         dcc.Store(id='panel-visibility', data={'visible': True}),
         dcc.Store(id='threshold-store', storage_type='memory'),
         
-        # Add interval component at the top
+        # Add interval component at the top (only checks the data version, see below)
         dcc.Interval(
             id='refresh-interval',
             interval=5000,  # 5 second in milliseconds
             n_intervals=0
         ),
+        dcc.Store(id='data-version-store'),  # data version this client last saw
         
         html.Div([
             html.Label('Filters', style=styles['main_label']),
@@ -654,6 +625,9 @@ def create_kg_area(flask_app):
         ),
     ], style=styles['main_container'])
 
+    # Interval ticks only rebuild the graph when the data version changed
+    add_data_version_gate(dash_app, lambda: snapshot_refresher.version, interval_id='refresh-interval')
+
     # Add a simple callback to test clicks
     @dash_app.callback(
         Output('click-store', 'data'),
@@ -705,9 +679,9 @@ def create_kg_area(flask_app):
          Input('college-dropdown', 'value'),
          Input('threshold-slider', 'value'),
          Input('parent-sdg-store', 'data'),
-         Input('refresh-interval', 'n_intervals')]
+         Input('data-version-store', 'data')]
     )
-    def update_graph_on_filter(year_range, selected_colleges, threshold, parent_sdg, n_intervals):
+    def update_graph_on_filter(year_range, selected_colleges, threshold, parent_sdg, data_version):
         try:
             if not selected_colleges:
                 selected_colleges = colleges
@@ -832,9 +806,9 @@ def create_kg_area(flask_app):
                         area_node = area_nodes[0]
                         pos[area_node] = np.array([MINIMUM_DISTANCE, 0])
                     else:
-                        # For multiple areas, use Kamada-Kawai layout
+                        # For multiple areas, use Kamada-Kawai layout (cached per area set)
                         area_subgraph = G.subgraph(area_nodes)
-                        area_pos = nx.kamada_kawai_layout(area_subgraph)
+                        area_pos = graph_layouts.layout(area_subgraph, 'kamada_kawai')
                         
                         # Ensure minimum distance from center
                         for node, coords in area_pos.items():
@@ -1149,4 +1123,14 @@ def create_kg_area(flask_app):
         
         return page1_display, page2_display, page3_display, prev_disabled, next_disabled
 
+def create_kg_area(flask_app):
+    # Initialize Dash app
+    dash_app = Dash(__name__, 
+                   server=flask_app, 
+                   url_base_pathname='/knowledgegraph/',
+                   external_stylesheets=[dbc.themes.BOOTSTRAP])  # Add Bootstrap theme
+
+    # Layout and callbacks need the loaded data; show a loading state until then
+    defer_until_ready(dash_app, [db_manager], lambda: build_kg_area(dash_app))
+
     return dash_app
\ No newline at end of file
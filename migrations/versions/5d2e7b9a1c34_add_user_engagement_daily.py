@@ -0,0 +1,38 @@
+"""Add the user_engagement_daily rollup table.
+
+Revision ID: 5d2e7b9a1c34
+Revises: c4a81e2f6b10
+Create Date: 2026-10-18 15:40:12.208374
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e7b9a1c34'
+down_revision = 'c4a81e2f6b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # server.py runs db.create_all() on import, so `flask db upgrade` may find the table already created
+    if sa.inspect(op.get_bind()).has_table('user_engagement_daily'):
+        return
+
+    # Filled by services/engagement_rollup.py on its first run (a full build from user_engagement)
+    op.create_table(
+        'user_engagement_daily',
+        sa.Column('research_id', sa.String(length=15), sa.ForeignKey('research_outputs.research_id'), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total_views', sa.Integer(), nullable=True),
+        sa.Column('total_downloads', sa.Integer(), nullable=True),
+        sa.Column('unique_views', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('research_id', 'day')
+    )
+
+
+def downgrade():
+    if sa.inspect(op.get_bind()).has_table('user_engagement_daily'):
+        op.drop_table('user_engagement_daily')
@@ -0,0 +1,37 @@
+"""Add the research_change_log table.
+
+Revision ID: 8b3f6a0d2e57
+Revises: 5d2e7b9a1c34
+Create Date: 2026-10-18 17:05:48.331902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b3f6a0d2e57'
+down_revision = '5d2e7b9a1c34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # server.py runs db.create_all() on import, so `flask db upgrade` may find the table already created
+    if sa.inspect(op.get_bind()).has_table('research_change_log'):
+        return
+
+    # Written by services/change_log.py, read by the dashboard refresh watermark
+    op.create_table(
+        'research_change_log',
+        sa.Column('log_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('research_id', sa.String(length=15), nullable=True),
+        sa.Column('operation', sa.String(length=10), nullable=True),
+        sa.Column('timestamp', sa.TIMESTAMP(), nullable=True),
+        sa.PrimaryKeyConstraint('log_id')
+    )
+
+
+def downgrade():
+    if sa.inspect(op.get_bind()).has_table('research_change_log'):
+        op.drop_table('research_change_log')
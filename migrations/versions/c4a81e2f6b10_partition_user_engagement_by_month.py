@@ -0,0 +1,95 @@
+"""Partition user_engagement by month.
+
+Revision ID: c4a81e2f6b10
+Revises: 09dcde64e36b
+Create Date: 2026-10-18 09:12:41.503117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a81e2f6b10'
+down_revision = '09dcde64e36b'
+branch_labels = None
+depends_on = None
+
+# Months of empty partitions created ahead of today (the scheduled job keeps extending this)
+MONTHS_AHEAD = 3
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    # Keep the existing rows aside while the partitioned table is created in its place
+    op.execute("ALTER TABLE IF EXISTS user_engagement RENAME TO user_engagement_unpartitioned")
+    op.execute("""
+        CREATE TABLE user_engagement (
+            research_id VARCHAR(15) NOT NULL REFERENCES research_outputs (research_id),
+            user_id VARCHAR(15) NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            view INTEGER,
+            download INTEGER,
+            PRIMARY KEY (research_id, user_id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+
+    # One partition per month from the oldest event (or this month) through MONTHS_AHEAD ahead
+    had_table = conn.execute(sa.text("SELECT to_regclass('user_engagement_unpartitioned') IS NOT NULL")).scalar()
+    first = None
+    if had_table:
+        first = conn.execute(sa.text("SELECT date_trunc('month', min(timestamp))::date FROM user_engagement_unpartitioned")).scalar()
+    first_month = f"DATE '{first.isoformat()}'" if first else "date_trunc('month', now())::date"
+    op.execute(sa.text(f"""
+        DO $$
+        DECLARE
+            month DATE := {first_month};
+            last DATE := (date_trunc('month', now()) + INTERVAL '{MONTHS_AHEAD} months')::date;
+        BEGIN
+            WHILE month <= last LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF user_engagement FOR VALUES FROM (%L) TO (%L)',
+                    'user_engagement_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'),
+                    month, (month + INTERVAL '1 month')::date
+                );
+                month := (month + INTERVAL '1 month')::date;
+            END LOOP;
+        END $$;
+    """))
+    op.execute("CREATE TABLE IF NOT EXISTS user_engagement_default PARTITION OF user_engagement DEFAULT")
+
+    # BRIN suits the append-only timestamp order; the composite index serves per-paper ranges
+    op.create_index('ix_user_engagement_timestamp_brin', 'user_engagement', ['timestamp'], postgresql_using='brin')
+    op.create_index('ix_user_engagement_research_timestamp', 'user_engagement', ['research_id', 'timestamp'])
+
+    if had_table:
+        op.execute("""
+            INSERT INTO user_engagement (research_id, user_id, timestamp, view, download)
+            SELECT research_id, user_id, timestamp, view, download
+            FROM user_engagement_unpartitioned
+            WHERE timestamp IS NOT NULL
+            ON CONFLICT DO NOTHING
+        """)
+        op.execute("DROP TABLE user_engagement_unpartitioned")
+
+
+def downgrade():
+    op.execute("ALTER TABLE user_engagement RENAME TO user_engagement_partitioned")
+    op.execute("""
+        CREATE TABLE user_engagement (
+            research_id VARCHAR(15) NOT NULL REFERENCES research_outputs (research_id),
+            user_id VARCHAR(15) NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            view INTEGER,
+            download INTEGER,
+            PRIMARY KEY (research_id, user_id, timestamp)
+        )
+    """)
+    op.execute("""
+        INSERT INTO user_engagement (research_id, user_id, timestamp, view, download)
+        SELECT research_id, user_id, timestamp, view, download
+        FROM user_engagement_partitioned
+    """)
+    # Dropping the parent drops every monthly partition with it
+    op.execute("DROP TABLE user_engagement_partitioned")
@@ -27,7 +27,9 @@ from .research_types import ResearchTypes
 from .publication_format import PublicationFormat
 from .user_engagement import UserEngagement
 from .aggr_user_engagement import AggrUserEngagement
+from .user_engagement_daily import UserEngagementDaily
 from .backup import Backup
+from .research_change_log import ResearchChangeLog
 
 def check_db(db_name, user, password, host='localhost', port='5432'):
     cursor = None  # Initialize cursor outside try block
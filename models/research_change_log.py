@@ -0,0 +1,9 @@
+from models import db
+from models.base import BaseModel
+
+class ResearchChangeLog(BaseModel):
+    __tablename__ = 'research_change_log'
+    log_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    research_id = db.Column(db.String(15))  # no FK so dropped/deleted outputs can still be logged
+    operation = db.Column(db.String(10))  # UPDATE, PULLOUT
+    timestamp = db.Column(db.TIMESTAMP)
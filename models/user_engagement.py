@@ -3,8 +3,16 @@ from models.base import BaseModel
 
 class UserEngagement(BaseModel):
     __tablename__ = 'user_engagement'
-    research_id = db.Column(db.String(15), db.ForeignKey('research_outputs.research_id'), primary_key=True,unique=True)
+    # Append-only event log, range-partitioned by month on timestamp. Monthly partitions
+    # are created by services/engagement_partitions.py; a partitioned table cannot have a
+    # unique constraint without the partition key, so research_id is not unique on its own.
+    __table_args__ = (
+        db.Index('ix_user_engagement_timestamp_brin', 'timestamp', postgresql_using='brin'),
+        db.Index('ix_user_engagement_research_timestamp', 'research_id', 'timestamp'),
+        {'postgresql_partition_by': 'RANGE (timestamp)'}
+    )
+    research_id = db.Column(db.String(15), db.ForeignKey('research_outputs.research_id'), primary_key=True)
     user_id = db.Column(db.String(15), primary_key=True)
     timestamp = db.Column(db.TIMESTAMP, primary_key=True)
     view = db.Column(db.Integer)
-    download = db.Column(db.Integer)
\ No newline at end of file
+    download = db.Column(db.Integer)
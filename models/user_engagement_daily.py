@@ -0,0 +1,13 @@
+from models import db
+from models.base import BaseModel
+
+class UserEngagementDaily(BaseModel):
+    __tablename__ = 'user_engagement_daily'
+    # Daily per-paper rollup of user_engagement, owned by services/engagement_rollup.py.
+    # Unlike aggr_user_engagement (archived engagement no longer in user_engagement) every
+    # row here is derived from raw events, so it is never added to raw sums of the same days.
+    research_id = db.Column(db.String(15), db.ForeignKey('research_outputs.research_id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    total_views = db.Column(db.Integer)
+    total_downloads = db.Column(db.Integer)
+    unique_views = db.Column(db.Integer)
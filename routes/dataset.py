@@ -7,6 +7,8 @@ import pandas as pd
 from models import College, Program, ResearchOutput, Publication, Status, Conference, ResearchOutputAuthor, Account, UserProfile, Keywords, Panel, SDG, db, ResearchArea, ResearchOutputArea, ResearchTypes, PublicationFormat, UserEngagement, AggrUserEngagement
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import case
+from services.engagement_rollup import engagement_totals
+from config import Config
 
 dataset = Blueprint('dataset', __name__)
 
@@ -146,12 +148,8 @@ def retrieve_dataset(research_id=None):
         func.sum(AggrUserEngagement.total_downloads).label("total_aggr_downloads")
     ).group_by(AggrUserEngagement.research_id).distinct().subquery()
 
-    # Define subquery for Engagement aggregation
-    engagement_subquery = db.session.query(
-        UserEngagement.research_id,
-        func.sum(UserEngagement.view).label("total_views"),
-        func.sum(UserEngagement.download).label("total_downloads")
-    ).group_by(UserEngagement.research_id).distinct().subquery()
+    # Define subquery for Engagement aggregation (daily rollup + raw events, one source per day)
+    engagement_subquery = engagement_totals(Config.ROLLUP_LATENESS_DAYS).subquery()
 
     # Join the two subqueries and calculate the combined totals
     combined_engagement_subquery = db.session.query(
@@ -396,12 +394,8 @@ def fetch_ordered_dataset(research_id=None):
         func.sum(AggrUserEngagement.total_downloads).label("total_aggr_downloads")
     ).group_by(AggrUserEngagement.research_id).distinct().subquery()
 
-    # Define subquery for Engagement aggregation
-    engagement_subquery = db.session.query(
-        UserEngagement.research_id,
-        func.sum(UserEngagement.view).label("total_views"),
-        func.sum(UserEngagement.download).label("total_downloads")
-    ).group_by(UserEngagement.research_id).distinct().subquery()
+    # Define subquery for Engagement aggregation (daily rollup + raw events, one source per day)
+    engagement_subquery = engagement_totals(Config.ROLLUP_LATENESS_DAYS).subquery()
 
     # Join the two subqueries and calculate the combined totals
     combined_engagement_subquery = db.session.query(
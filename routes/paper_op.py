@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify, send_file, session, Response
+from flask import Blueprint, request, jsonify, send_file, session, Response, current_app
 from models import (
     db, 
     ResearchOutput, 
@@ -18,6 +18,8 @@ from models import (
     College
 )
 from services import auth_services
+from services.change_log import log_research_change
+from services.engagement_buffer import engagement_buffer
 import os
 from werkzeug.utils import secure_filename
 from datetime import datetime
@@ -490,6 +492,7 @@ def update_paper(research_id):
             operation='UPDATE',
             action_desc=f"Updated research paper with the following changes:\n{formatted_changes}"
         )
+        log_research_change(research_id)
 
         print(f"Updated research paper with the following changes:\n{formatted_changes}")
 
@@ -640,7 +643,6 @@ def increment_views(research_id):
         # Get query parameter
         is_increment = request.args.get('is_increment', 'false').lower() == 'true'
         user_id = get_jwt_identity()
-        philippine_tz = pytz.timezone('Asia/Manila')
 
         # Fetch the record using SQLAlchemy query
         research_output = ResearchOutput.query.filter_by(research_id=research_id).first()
@@ -648,34 +650,19 @@ def increment_views(research_id):
             return jsonify({"message": "Research record not found"}), 404
 
         if is_increment:
-            # Log user engagement
-            new_engagement = UserEngagement(
-                research_id=research_id,
-                user_id=user_id,
-                timestamp=datetime.now(philippine_tz).replace(tzinfo=None),
-                view=1,
-                download=0
-            )
-            db.session.add(new_engagement)
-            db.session.commit()
-
-        # Aggregate views for the research_id in UserEngagement
-        total_views = (
-            db.session.query(func.sum(UserEngagement.view))
-            .filter(UserEngagement.research_id == research_id)
-            .scalar()
-        )
-        total_downloads = (
-                db.session.query(func.sum(UserEngagement.download))
-                .filter(UserEngagement.research_id == research_id)
-                .scalar()
-            )
+            # Log user engagement (written in batches by the engagement buffer)
+            engagement_buffer.add(research_id, user_id, view=1)
+            current_app.engagement_counters.increment(research_id, views=1)
+            current_app.unique_viewers.add(research_id, research_output.college_id, user_id)
+
+        # Running totals for the research_id (Redis counters)
+        total_views, total_downloads = current_app.engagement_counters.totals(research_id)
         print(f'total views: {total_views}')
 
         return jsonify({
             "message": "View count updated",
-            "updated_views": total_views or 0,
-            "download_count": total_downloads or 0
+            "updated_views": total_views,
+            "download_count": total_downloads
         }), 200
 
     except Exception as e:
@@ -693,15 +680,14 @@ def increment_downloads(research_id):
     try:
         # Get query parameter
         user_id = get_jwt_identity()
-        philippine_tz = pytz.timezone('Asia/Manila')
 
         # Fetch the research record using SQLAlchemy query
         research_output = ResearchOutput.query.filter_by(research_id=research_id).first()
         if not research_output:
             return jsonify({"message": "Research record not found"}), 404
 
-        # Check if the user has already downloaded this research
-        existing_download = UserEngagement.query.filter_by(
+        # Check if the user has already downloaded this research (claimed by any worker or written)
+        existing_download = not current_app.engagement_counters.claim_download(research_id, user_id) or UserEngagement.query.filter_by(
             research_id=research_id,
             user_id=user_id,
             download=1
@@ -709,40 +695,26 @@ def increment_downloads(research_id):
 
         if existing_download:
             # If a download already exists, do not record a new one
-            total_downloads = (
-                db.session.query(func.sum(UserEngagement.download))
-                .filter(UserEngagement.research_id == research_id)
-                .scalar()
-            )
+            total_downloads = current_app.engagement_counters.totals(research_id)[1]
             print(f'existing download: {total_downloads}')
             return jsonify({
                 "message": "Download already recorded for this user",
                 "updated_downloads": total_downloads
             }), 200
 
-        # Log user engagement for a new download
-        new_engagement = UserEngagement(
-            research_id=research_id,
-            user_id=user_id,
-            timestamp=datetime.now(philippine_tz).replace(tzinfo=None),
-            view=0,
-            download=1
-        )
-        db.session.add(new_engagement)
-        db.session.commit()
+        # Log user engagement for a new download (written in batches by the engagement buffer)
+        engagement_buffer.add(research_id, user_id, download=1)
+        current_app.engagement_counters.increment(research_id, downloads=1)
+        current_app.unique_viewers.add(research_id, research_output.college_id, user_id)
 
-        # Aggregate downloads for the research_id in UserEngagement
-        total_downloads = (
-            db.session.query(func.sum(UserEngagement.download))
-            .filter(UserEngagement.research_id == research_id)
-            .scalar()
-        )
+        # Running total of downloads for the research_id (Redis counters)
+        total_downloads = current_app.engagement_counters.totals(research_id)[1]
 
         print(f'total downloads: {total_downloads}')
 
         return jsonify({
             "message": "Download count incremented",
-            "updated_downloads": total_downloads or 0
+            "updated_downloads": total_downloads
         }), 200
 
     except Exception as e:
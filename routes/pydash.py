@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, redirect, session
 from models import db, Conference, Role, UserProfile, Program, College, Account
 from flask_jwt_extended import get_jwt_identity, jwt_required
+from dashboards import figure_cache
 
 pydash = Blueprint('dash', __name__)
 
@@ -208,4 +209,11 @@ def combined_dash():
             }), 200
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+@pydash.route('/figure-cache', methods=['GET'])
+@jwt_required()
+def figure_cache_stats():
+    # Hit/miss counters of the dashboard figure cache in this worker
+    return jsonify(figure_cache.stats()), 200
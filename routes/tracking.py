@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, send_file
 from sqlalchemy.exc import SQLAlchemyError
 from models import db, Publication , ResearchOutput, Status, Conference, PublicationFormat, Account
 from services.auth_services import formatting_id, log_audit_trail
+from services.change_log import log_research_change
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, date
 from services.tracking_services import insert_status, update_status
@@ -213,6 +214,7 @@ def pullout_paper(research_id):
             operation='DELETE',
             action_desc=f'Dropped Publication Details: {publication.publication_name}'
         )
+        log_research_change(research_id, 'PULLOUT')
 
         return jsonify({"message": f'Publication Dropped successfully'}), 200
 
@@ -343,6 +345,7 @@ def publication_papers(research_id=None):
                 operation='CREATE',
                 action_desc=f"Added new publication: {new_publication.publication_name}"
             )
+            log_research_change(research_id)
 
             return jsonify({'message': 'Publication created successfully'}), 201
 
@@ -425,6 +428,7 @@ def publication_papers(research_id=None):
                 operation='UPDATE',
                 action_desc=action_desc
             )
+            log_research_change(research_id)
 
             return jsonify({'message': 'Publication updated successfully'}), 200
 
@@ -705,6 +709,7 @@ def manage_publication(status, research_id):
             operation='UPDATE',
             action_desc=f"Published publication: {publication.publication_name}"
         )
+        log_research_change(research_id)
 
         status = update_status(research_id)
         if not status:
@@ -1,5 +1,6 @@
 import psycopg2
 import schedule
+import threading
 import time
 from flask import Flask, request, jsonify
 from flask_cors import CORS
@@ -15,6 +16,9 @@ from datetime import datetime, timezone, timedelta
 import json
 from urllib.parse import urlparse
 from models import Account
+from services.engagement_counters import EngagementCounters
+from services.unique_viewers import UniqueViewers
+from services.engagement_partitions import maintain_partitions
 
 
 def update_to_inactive():
@@ -37,6 +41,23 @@ def update_to_inactive():
     cur.close()
     conn.close()
 
+def maintain_engagement_partitions():
+    # Pre-create the upcoming monthly partitions of user_engagement
+    with app.app_context():
+        maintain_partitions(db.engine, months_ahead=app.config['ENGAGEMENT_PARTITION_MONTHS_AHEAD'])
+
+def start_partition_maintenance(interval=86400):
+    """
+    Re-run the partition maintenance daily in every app process (gunicorn workers included,
+    not only the dev server's scheduler), so long-running processes never outlive the
+    partitions created at startup. An advisory lock keeps concurrent runs apart.
+    """
+    def run():
+        while True:
+            time.sleep(interval)
+            maintain_engagement_partitions()
+    threading.Thread(target=run, name='engagement-partitions', daemon=True).start()
+
 schedule.every().day.at("10:49").do(update_to_inactive) # Happens every 12AM
 
 def run_scheduler():
@@ -54,6 +75,23 @@ def initialize_redis(app):
     )
     app.redis_client = redis_client
 
+def initialize_engagement_counters(app):
+    """Attach the Redis-backed engagement counters and unique-viewer sketches and start their jobs."""
+    app.engagement_counters = EngagementCounters(
+        app.redis_client,
+        app.config['SQLALCHEMY_DATABASE_URI'],
+        reconcile_interval=app.config['ENGAGEMENT_RECONCILE_INTERVAL'],
+        lateness_days=app.config['ROLLUP_LATENESS_DAYS']
+    )
+    app.engagement_counters.start()
+
+    app.unique_viewers = UniqueViewers(
+        app.redis_client,
+        app.config['SQLALCHEMY_DATABASE_URI'],
+        retention_days=app.config['UNIQUE_VIEWER_RETENTION_DAYS']
+    )
+    app.unique_viewers.start()
+
 def initialize_db(app):
     """Initialize the database and check table creation."""
     db.init_app(app)
@@ -76,6 +114,7 @@ def initialize_db(app):
     
     with app.app_context():
         db.create_all()
+        maintain_engagement_partitions()
 
 # Initialize the app
 app = Flask(__name__,
@@ -100,9 +139,11 @@ def index():
 app.config.from_object(Config)
 
 initialize_db(app)
+start_partition_maintenance()
 mail = Mail(app)
 migrate = Migrate(app, db)
 initialize_redis(app)
+initialize_engagement_counters(app)
 jwt = JWTManager(app)
 
 @app.after_request
@@ -137,6 +178,11 @@ def refresh_expiring_jwts(response):
     except (RuntimeError, KeyError):
         return response
 
+@app.cli.command('maintain-engagement-partitions')
+def maintain_engagement_partitions_command():
+    """Create the upcoming user_engagement partitions (for a cron job or deploy step)."""
+    maintain_engagement_partitions()
+
 def has_table_data(session, table_model):
     return session.query(table_model).first() is not None
 
@@ -178,6 +224,7 @@ from dashboards.user_engagement_dash import UserEngagementDash
 from dashboards.sdg_impact_dash import SDG_Impact_Dash
 from dashboards.sdg_impact_college import SDG_Impact_College
 from dashboards.institutional_performance_dash import Institutional_Performance_Dash
+from dashboards import figure_cache, snapshot_refresher
 
 def create_dash_apps(app):
     with app.app_context():
@@ -195,10 +242,20 @@ def create_dash_apps(app):
         else:
             print("Dash apps cannot be created as no data is present in the ResearchOutput table.")
 
+def enable_shared_figure_cache(app):
+    """Share built dashboard figures between workers through Redis."""
+    def attach():
+        # Snapshot versions only mean the same data in every worker when they share one store
+        if snapshot_refresher.store is not None:
+            figure_cache.use_redis(app.redis_client, ttl=app.config['FIGURE_CACHE_REDIS_TTL'])
+
+    if app.config['FIGURE_CACHE_REDIS']:
+        snapshot_refresher.when_ready(attach)
+
 create_dash_apps(app)
+enable_shared_figure_cache(app)
 
 if __name__ == "__main__":
-    import threading
     scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
     scheduler_thread.start()
     app.run(host="0.0.0.0",debug=True, port=5000)
\ No newline at end of file
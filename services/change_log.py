@@ -0,0 +1,20 @@
+import datetime
+from models import db
+from models.research_change_log import ResearchChangeLog
+
+# Function for logging research output changes that the dashboard watermarks cannot see
+# (edits to existing papers and publication pullouts)
+def log_research_change(research_id, operation='UPDATE'):
+    try:
+        new_change = ResearchChangeLog(
+            research_id=research_id,
+            operation=operation,
+            timestamp=datetime.datetime.now()
+        )
+
+        db.session.add(new_change)
+        db.session.commit()
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error logging research change: {e}")
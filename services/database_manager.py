@@ -1,194 +1,321 @@
+from datetime import timedelta
 import pandas as pd
+import numpy as np
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine, func, desc
-from models import College, Program, ResearchOutput, Publication, Status, Conference, ResearchOutputAuthor, Account, UserProfile, Keywords, SDG, ResearchArea, ResearchOutputArea, ResearchTypes, PublicationFormat, UserEngagement
+from sqlalchemy import create_engine, func, desc, true
+from models import College, Program, ResearchOutput, Publication, Status, Conference, ResearchOutputAuthor, Account, UserProfile, Keywords, SDG, ResearchArea, ResearchOutputArea, ResearchTypes, PublicationFormat, UserEngagement, ResearchChangeLog
 from services.data_fetcher import ResearchDataFetcher
-from collections import Counter
-import re
-import nltk
+from services.noun_cache import NounCache
+from services.noun_extraction import NounExtractor, top_nouns
+from services.frame_schema import compact_frame, to_python
+from services.filter_index import FilterIndex
+from services.frame_loader import read_query_frame, fill_defaults, venue_country, year_of
+from config import Config, ensure_nltk_resource
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk import pos_tag
 
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('averaged_perceptron_tagger')
-nltk.download('averaged_perceptron_tagger_eng')
-nltk.download('punkt_tab')
+ensure_nltk_resource('taggers/averaged_perceptron_tagger_eng', 'averaged_perceptron_tagger_eng')
+ensure_nltk_resource('tokenizers/punkt_tab', 'punkt_tab')
+
+# Query columns renamed for the dashboard frame
+RESULT_COLUMNS = {
+    'school_year': 'year',
+    'concatenated_sdg': 'sdg',
+    'research_type_name': 'research_type',
+    'pub_format_name': 'journal',
+    'sum_views': 'views',
+    'sum_downloads': 'downloads',
+    'distinct_user_ids': 'unique_views'
+}
+
+# Values used where the query returned NULL
+RESULT_DEFAULTS = {
+    'research_id': 'Unknown',
+    'college_id': 'Unknown',
+    'color_code': '#000',
+    'program_name': 'N/A',
+    'title': 'Untitled',
+    'concatenated_authors': 'Unknown Authors',
+    'concatenated_keywords': 'No Keywords',
+    'sdg': 'Not Specified',
+    'research_type': 'Unknown Type',
+    'journal': 'unpublished',
+    'scopus': 'N/A',
+    'conference_venue': 'Unknown Venue',
+    'conference_title': 'No Conference Title',
+    'status': 'READY',
+    'country': 'Unknown Country',
+    'abstract': '',
+    'concatenated_areas': 'No Research Areas'
+}
+
+# Column order of the dashboard frame (before the derived text columns)
+FRAME_COLUMNS = ['research_id', 'college_id', 'color_code', 'program_name', 'program_id', 'title', 'year',
+                 'term', 'concatenated_authors', 'concatenated_keywords', 'sdg', 'research_type', 'journal',
+                 'scopus', 'date_published', 'date_uploaded', 'published_year', 'conference_venue',
+                 'conference_title', 'conference_date', 'status', 'country', 'abstract', 'concatenated_areas',
+                 'views', 'downloads', 'unique_views']
 
 class DatabaseManager:
-    def __init__(self, database_uri):
+    def __init__(self, database_uri, load=True):
         self.engine = create_engine(database_uri)
         self.Session = sessionmaker(bind=self.engine)
         self.df = None
+        self.watermark = None
+        self.memory_usage = None
+        self.filter_index = None
         self.stop_words = set(stopwords.words('english'))
+        self.noun_cache = NounCache(Config.NOUN_CACHE_PATH, self.stop_words)
+        self.noun_extractor = NounExtractor(self.stop_words, workers=Config.NOUN_WORKERS, chunk_size=Config.NOUN_CHUNK_SIZE)
 
-        self.get_all_data()
+        # load=False leaves the frame empty, e.g. when it comes from a shared snapshot (set_frame)
+        if load:
+            self.get_all_data()
 
     def get_data_from_model(self,model):
         fetcher = ResearchDataFetcher(model)
         data = fetcher.get_data_from_model()
         return data
 
-    def get_all_data(self):
+    def get_all_data(self, incremental=False):
+        """
+        Load the dashboard dataset into self.df.
+
+        With incremental=True and a previous load available, only the research outputs
+        that changed since the last watermark are re-fetched (see refresh_data).
+        """
+        if incremental and self.df is not None and self.watermark is not None:
+            self.refresh_data()
+            return self.df
+
         session = self.Session()
         try:
-            # Subquery to get the latest status for each publication
-            latest_status_subquery = session.query(
-                Status.publication_id,
-                Status.status,
-                func.row_number().over(
-                    partition_by=Status.publication_id,
-                    order_by=desc(Status.timestamp)
-                ).label('rn')
-            ).subquery()
-
-            # Subquery to concatenate authors
-            authors_subquery = session.query(
-                ResearchOutputAuthor.research_id,
-                func.string_agg(
-                    func.concat(
-                        ResearchOutputAuthor.author_last_name, ', ',  # Surname first
-                        func.substring(ResearchOutputAuthor.author_first_name, 1, 1), '. ',  # First name initial
-                        func.coalesce(func.substring(ResearchOutputAuthor.author_middle_name, 1, 1) + '.', '') 
-                    ), '; '
-                ).label('concatenated_authors')
-            ).group_by(ResearchOutputAuthor.research_id).subquery()
-
-            # Subquery to concatenate keywords
-            keywords_subquery = session.query(
-                Keywords.research_id,
-                func.string_agg(Keywords.keyword, '; ').label('concatenated_keywords')
-            ).group_by(Keywords.research_id).subquery()
-
-            # Subquery to concatenate SDG
-            sdg_subquery = session.query(
-                SDG.research_id,
-                func.string_agg(SDG.sdg, '; ').label('concatenated_sdg')
-            ).group_by(SDG.research_id).subquery()
-
-            # Subquery to get the research areas for each publication
-            area_subquery = session.query(
-                ResearchOutputArea.research_id,
-                func.string_agg(
-                    func.concat(
-                        ResearchArea.research_area_name), '; '
-                ).label('concatenated_areas')
-            ).join(ResearchArea, ResearchOutputArea.research_area_id == ResearchArea.research_area_id) \
-            .group_by(ResearchOutputArea.research_id).subquery()
-
-            agg_user_engage = session.query(
-                UserEngagement.research_id,
-                func.sum(UserEngagement.view).label('sum_views'),
-                func.count(func.distinct(UserEngagement.user_id)).label('distinct_user_ids'),
-                func.sum(UserEngagement.download).label('sum_downloads')
-            ).group_by(
-                UserEngagement.research_id
-            ).subquery()
-
-            # Main query
-            query = session.query(
-                College.college_id,
-                College.color_code,
-                Program.program_id,
-                Program.program_name,
-                sdg_subquery.c.concatenated_sdg,
-                ResearchOutput.research_id,
-                ResearchOutput.title,
-                ResearchOutput.school_year,
-                ResearchOutput.term,
-                ResearchOutput.date_uploaded,
-                ResearchTypes.research_type_name,
-                authors_subquery.c.concatenated_authors,
-                keywords_subquery.c.concatenated_keywords,
-                Publication.publication_name,
-                PublicationFormat.pub_format_name,
-                Publication.scopus,
-                Publication.date_published,
-                Conference.conference_venue,
-                Conference.conference_title,
-                Conference.conference_date,
-                latest_status_subquery.c.status,
-                area_subquery.c.concatenated_areas,
-                ResearchOutput.abstract,
-                agg_user_engage.c.sum_views,
-                agg_user_engage.c.distinct_user_ids,
-                agg_user_engage.c.sum_downloads,
-            ).join(College, ResearchOutput.college_id == College.college_id) \
-            .join(Program, ResearchOutput.program_id == Program.program_id) \
-            .outerjoin(Publication, ResearchOutput.research_id == Publication.research_id) \
-            .outerjoin(Conference, Publication.conference_id == Conference.conference_id) \
-            .outerjoin(latest_status_subquery, (Publication.publication_id == latest_status_subquery.c.publication_id) & (latest_status_subquery.c.rn == 1)) \
-            .outerjoin(authors_subquery, ResearchOutput.research_id == authors_subquery.c.research_id) \
-            .outerjoin(keywords_subquery, ResearchOutput.research_id == keywords_subquery.c.research_id) \
-            .outerjoin(sdg_subquery, ResearchOutput.research_id == sdg_subquery.c.research_id) \
-            .outerjoin(area_subquery, ResearchOutput.research_id == area_subquery.c.research_id) \
-            .outerjoin(ResearchTypes, ResearchOutput.research_type_id == ResearchTypes.research_type_id) \
-            .outerjoin(PublicationFormat, Publication.pub_format_id == PublicationFormat.pub_format_id) \
-            .outerjoin(agg_user_engage, agg_user_engage.c.research_id == ResearchOutput.research_id)
-
-            result = query.all()
+            # Read the watermark first so changes made during the load are picked up next refresh
+            watermark = self.get_watermark(session)
+            df = self.load_frame(session)
 
             # Add this check for empty results
-            if not result:
+            if df.empty:
                 print("Warning: Query returned no results. Creating empty DataFrame.")
-                # Create an empty DataFrame with all expected columns
-                columns = ['research_id', 'college_id', 'color_code', 'program_name', 'program_id', 
-                           'title', 'school_year', 'term', 'date_uploaded', 'research_type_name', 
-                           'concatenated_authors', 'concatenated_keywords', 'publication_name',
-                           'pub_format_name', 'scopus', 'date_published', 'conference_venue',
-                           'conference_title', 'conference_date', 'status', 'concatenated_areas',
-                           'abstract', 'sum_views', 'distinct_user_ids', 'sum_downloads']
-                
-                self.df = pd.DataFrame(columns=columns)
-                self.df['combined'] = ''  # Add empty combined column
-                self.df['top_nouns'] = [[]]  # Add empty top_nouns column
-                return
-
-            # Formatting results into a list of dictionaries with safe handling for missing data
-            data = [{
-                'research_id': row.research_id if pd.notnull(row.research_id) else 'Unknown',
-                'college_id': row.college_id if pd.notnull(row.college_id) else 'Unknown',
-                'color_code': row.color_code if pd.notnull(row.color_code) else '#000',
-                'program_name': row.program_name if pd.notnull(row.program_name) else 'N/A',
-                'program_id': row.program_id if pd.notnull(row.program_id) else None,
-                'title': row.title if pd.notnull(row.title) else 'Untitled',
-                'year': row.school_year if pd.notnull(row.school_year) else None,
-                'term': row.term if pd.notnull(row.term) else None,
-                'concatenated_authors': row.concatenated_authors if pd.notnull(row.concatenated_authors) else 'Unknown Authors',
-                'concatenated_keywords': row.concatenated_keywords if pd.notnull(row.concatenated_keywords) else 'No Keywords',
-                'sdg': row.concatenated_sdg if pd.notnull(row.concatenated_sdg) else 'Not Specified',
-                'research_type': row.research_type_name if pd.notnull(row.research_type_name) else 'Unknown Type',
-                'journal': row.pub_format_name if pd.notnull(row.pub_format_name) else 'unpublished',
-                'scopus': row.scopus if pd.notnull(row.scopus) else 'N/A',
-                'date_published': row.date_published,
-                'date_uploaded': row.date_uploaded,
-                'published_year': int(row.date_published.year) if pd.notnull(row.date_published) else None,
-                'conference_venue': row.conference_venue if pd.notnull(row.conference_venue) else 'Unknown Venue',
-                'conference_title': row.conference_title if pd.notnull(row.conference_title) else 'No Conference Title',
-                'conference_date': row.conference_date,
-                'status': row.status if pd.notnull(row.status) else "READY",
-                'country': row.conference_venue.split(",")[-1].strip() if pd.notnull(row.conference_venue) else 'Unknown Country',
-                'abstract': row.abstract if pd.notnull(row.abstract) else '',
-                'concatenated_areas': row.concatenated_areas if pd.notnull(row.concatenated_areas) else 'No Research Areas',
-                'views': row.sum_views,
-                'downloads': row.sum_downloads,
-                'unique_views':row.distinct_user_ids
-
-            } for row in result]
-
-            # Convert the list of dictionaries to a DataFrame
-            self.df = pd.DataFrame(data)
-            # Combine the title and concatenated_keywords columns
-            self.df['combined'] = self.df['title'].astype(str) + ' ' + self.df['concatenated_keywords'].astype(str) + ' ' + self.df['abstract'].astype(str)
-
-            # Apply the function to extract top nouns
-            self.df['top_nouns'] = self.df['combined'].apply(lambda x: self.top_nouns(x, 10))
+
+            self.df = self.compact(df)
+            self.watermark = watermark
 
         finally:
             session.close()
 
         return self.df
+
+    def refresh_data(self):
+        """
+        Incrementally refresh self.df using the stored watermark.
+
+        Only research outputs that were uploaded, had a status change, received engagement
+        or were logged in the research change log since the last refresh are re-fetched.
+        Returns the set of research_ids that were refreshed (empty when nothing changed).
+        """
+        if self.df is None or self.watermark is None:
+            self.get_all_data()
+            return set(self.df['research_id'])
+
+        session = self.Session()
+        try:
+            watermark = self.get_watermark(session)
+
+            # A watermark moving backwards means the database was restored; reload everything
+            if any(
+                self.watermark[key] is not None and (watermark[key] is None or watermark[key] < self.watermark[key])
+                for key in watermark
+            ):
+                print("Warning: Data watermark moved backwards. Reloading the full dataset.")
+                session.close()
+                self.get_all_data()
+                return set(self.df['research_id'])
+
+            changed_ids = self.get_changed_research_ids(session, self.watermark)
+            if not changed_ids:
+                self.watermark = watermark
+                return changed_ids
+
+            fresh_df = self.load_frame(session, research_ids=changed_ids)
+
+            # Rows of changed ids are replaced; ids missing from the fresh rows were deleted
+            kept_df = self.df[~self.df['research_id'].isin(changed_ids)]
+            self.df = self.compact(pd.concat([kept_df, fresh_df], ignore_index=True), report=False)
+            self.watermark = watermark
+
+        finally:
+            session.close()
+
+        return changed_ids
+
+    def get_watermark(self, session):
+        """Return the latest change markers of every table feeding the dashboard dataset."""
+        row = session.query(
+            session.query(func.max(ResearchOutput.date_uploaded)).scalar_subquery().label('date_uploaded'),
+            session.query(func.max(Status.timestamp)).scalar_subquery().label('status'),
+            session.query(func.max(UserEngagement.timestamp)).scalar_subquery().label('engagement'),
+            session.query(func.max(ResearchChangeLog.log_id)).scalar_subquery().label('change_log')
+        ).one()
+
+        return {
+            'date_uploaded': row.date_uploaded,
+            'status': row.status,
+            'engagement': row.engagement,
+            'change_log': row.change_log
+        }
+
+    def get_changed_research_ids(self, session, watermark):
+        """Return the research_ids touched after the given watermark."""
+        def after(column, value):
+            return column > value if value is not None else true()
+
+        uploaded = session.query(ResearchOutput.research_id) \
+            .filter(after(ResearchOutput.date_uploaded, watermark['date_uploaded']))
+        status_changed = session.query(Publication.research_id) \
+            .join(Status, Status.publication_id == Publication.publication_id) \
+            .filter(after(Status.timestamp, watermark['status']))
+        # Buffered engagement events land after their timestamp, so look back a little
+        engagement_since = watermark['engagement']
+        if engagement_since is not None:
+            engagement_since -= timedelta(seconds=Config.ENGAGEMENT_WATERMARK_LAG)
+        engaged = session.query(UserEngagement.research_id) \
+            .filter(after(UserEngagement.timestamp, engagement_since))
+        logged = session.query(ResearchChangeLog.research_id) \
+            .filter(after(ResearchChangeLog.log_id, watermark['change_log']))
+
+        rows = uploaded.union(status_changed, engaged, logged).all()
+        return {row[0] for row in rows if row[0] is not None}
+
+    def build_query(self, session, research_ids=None):
+        """Build the dashboard query, optionally restricted to the given research_ids."""
+        def scoped(query, column):
+            return query.filter(column.in_(research_ids)) if research_ids is not None else query
+
+        # Subquery to get the latest status for each publication
+        latest_status_query = session.query(
+            Status.publication_id,
+            Status.status,
+            func.row_number().over(
+                partition_by=Status.publication_id,
+                order_by=desc(Status.timestamp)
+            ).label('rn')
+        )
+        if research_ids is not None:
+            latest_status_query = latest_status_query.filter(Status.publication_id.in_(
+                session.query(Publication.publication_id).filter(Publication.research_id.in_(research_ids))
+            ))
+        latest_status_subquery = latest_status_query.subquery()
+
+        # Subquery to concatenate authors
+        authors_subquery = scoped(session.query(
+            ResearchOutputAuthor.research_id,
+            func.string_agg(
+                func.concat(
+                    ResearchOutputAuthor.author_last_name, ', ',  # Surname first
+                    func.substring(ResearchOutputAuthor.author_first_name, 1, 1), '. ',  # First name initial
+                    func.coalesce(func.substring(ResearchOutputAuthor.author_middle_name, 1, 1) + '.', '') 
+                ), '; '
+            ).label('concatenated_authors')
+        ), ResearchOutputAuthor.research_id).group_by(ResearchOutputAuthor.research_id).subquery()
+
+        # Subquery to concatenate keywords
+        keywords_subquery = scoped(session.query(
+            Keywords.research_id,
+            func.string_agg(Keywords.keyword, '; ').label('concatenated_keywords')
+        ), Keywords.research_id).group_by(Keywords.research_id).subquery()
+
+        # Subquery to concatenate SDG
+        sdg_subquery = scoped(session.query(
+            SDG.research_id,
+            func.string_agg(SDG.sdg, '; ').label('concatenated_sdg')
+        ), SDG.research_id).group_by(SDG.research_id).subquery()
+
+        # Subquery to get the research areas for each publication
+        area_subquery = scoped(session.query(
+            ResearchOutputArea.research_id,
+            func.string_agg(
+                func.concat(
+                    ResearchArea.research_area_name), '; '
+            ).label('concatenated_areas')
+        ).join(ResearchArea, ResearchOutputArea.research_area_id == ResearchArea.research_area_id),
+            ResearchOutputArea.research_id
+        ).group_by(ResearchOutputArea.research_id).subquery()
+
+        agg_user_engage = scoped(session.query(
+            UserEngagement.research_id,
+            func.sum(UserEngagement.view).label('sum_views'),
+            func.count(func.distinct(UserEngagement.user_id)).label('distinct_user_ids'),
+            func.sum(UserEngagement.download).label('sum_downloads')
+        ), UserEngagement.research_id).group_by(
+            UserEngagement.research_id
+        ).subquery()
+
+        # Main query
+        query = session.query(
+            College.college_id,
+            College.color_code,
+            Program.program_id,
+            Program.program_name,
+            sdg_subquery.c.concatenated_sdg,
+            ResearchOutput.research_id,
+            ResearchOutput.title,
+            ResearchOutput.school_year,
+            ResearchOutput.term,
+            ResearchOutput.date_uploaded,
+            ResearchTypes.research_type_name,
+            authors_subquery.c.concatenated_authors,
+            keywords_subquery.c.concatenated_keywords,
+            Publication.publication_name,
+            PublicationFormat.pub_format_name,
+            Publication.scopus,
+            Publication.date_published,
+            Conference.conference_venue,
+            Conference.conference_title,
+            Conference.conference_date,
+            latest_status_subquery.c.status,
+            area_subquery.c.concatenated_areas,
+            ResearchOutput.abstract,
+            agg_user_engage.c.sum_views,
+            agg_user_engage.c.distinct_user_ids,
+            agg_user_engage.c.sum_downloads,
+        ).join(College, ResearchOutput.college_id == College.college_id) \
+        .join(Program, ResearchOutput.program_id == Program.program_id) \
+        .outerjoin(Publication, ResearchOutput.research_id == Publication.research_id) \
+        .outerjoin(Conference, Publication.conference_id == Conference.conference_id) \
+        .outerjoin(latest_status_subquery, (Publication.publication_id == latest_status_subquery.c.publication_id) & (latest_status_subquery.c.rn == 1)) \
+        .outerjoin(authors_subquery, ResearchOutput.research_id == authors_subquery.c.research_id) \
+        .outerjoin(keywords_subquery, ResearchOutput.research_id == keywords_subquery.c.research_id) \
+        .outerjoin(sdg_subquery, ResearchOutput.research_id == sdg_subquery.c.research_id) \
+        .outerjoin(area_subquery, ResearchOutput.research_id == area_subquery.c.research_id) \
+        .outerjoin(ResearchTypes, ResearchOutput.research_type_id == ResearchTypes.research_type_id) \
+        .outerjoin(PublicationFormat, Publication.pub_format_id == PublicationFormat.pub_format_id) \
+        .outerjoin(agg_user_engage, agg_user_engage.c.research_id == ResearchOutput.research_id)
+
+        return scoped(query, ResearchOutput.research_id)
+
+    def load_frame(self, session, research_ids=None):
+        """Run the dashboard query and format it into the dashboard DataFrame."""
+        query = self.build_query(session, research_ids=research_ids)
+        return self.format_results(read_query_frame(session, query, Config.QUERY_CHUNK_SIZE))
+
+    def format_results(self, df):
+        """Format the raw query frame into the dashboard DataFrame, including the derived text columns."""
+        df = df.rename(columns=RESULT_COLUMNS)
+
+        # Derived columns are computed from the raw values, before defaults are applied
+        df['published_year'] = year_of(df['date_published'])
+        df['country'] = venue_country(df['conference_venue'])
+
+        # Safe handling for missing data
+        df = fill_defaults(df, RESULT_DEFAULTS)[FRAME_COLUMNS]
+
+        # Combine the title and concatenated_keywords columns
+        df['combined'] = df['title'].astype(str) + ' ' + df['concatenated_keywords'].astype(str) + ' ' + df['abstract'].astype(str)
+
+        # Extract top nouns, re-tagging only texts missing from the cache
+        df['top_nouns'] = self.extract_top_nouns(df['combined'].tolist(), 10)
+
+        return df
     
     def get_college_colors(self):
         session = self.Session()
@@ -203,7 +330,7 @@ class DatabaseManager:
 
     def get_unique_values(self, column_name):
         if self.df is not None and column_name in self.df.columns:
-            unique_values = self.df[column_name].dropna().unique()
+            unique_values = np.asarray(self.df[column_name].dropna().unique())  # categoricals -> ndarray
             if len(unique_values) == 0:
                 print(f"Warning: Column '{column_name}' exists but contains no values.")
             return unique_values
@@ -261,46 +388,44 @@ class DatabaseManager:
 
     def get_min_value(self, column_name):
         if self.df is not None and column_name in self.df.columns:
-            return self.df[column_name].min()
+            return to_python(self.df[column_name].min())
         else:
             raise ValueError(f"Column '{column_name}' does not exist in the DataFrame.")
 
     def get_max_value(self, column_name):
         if self.df is not None and column_name in self.df.columns:
-            return self.df[column_name].max()
+            return to_python(self.df[column_name].max())
         else:
             raise ValueError(f"Column '{column_name}' does not exist in the DataFrame.")
 
     def get_filtered_data(self, selected_colleges, selected_status, selected_years):
         if self.df is not None:
-            filtered_df = self.df[
-                (self.df['college_id'].isin(selected_colleges)) & 
-                (self.df['status'].isin(selected_status)) & 
-                (self.df['year'].between(selected_years[0], selected_years[1]))
-            ]
-            return filtered_df
+            return self.filter_index.select(
+                college_id=selected_colleges,
+                status=selected_status,
+                years=selected_years
+            )
         else:
             raise ValueError("Data not loaded. Please call 'get_all_data()' first.")
         
     def get_filtered_data_with_term(self, selected_colleges, selected_status, selected_years, selected_terms):
         if self.df is not None:
-            filtered_df = self.df[
-                (self.df['college_id'].isin(selected_colleges)) & 
-                (self.df['status'].isin(selected_status)) & 
-                (self.df['term'].isin(selected_terms)) & 
-                (self.df['year'].between(selected_years[0], selected_years[1]))
-            ]
-            return filtered_df
+            return self.filter_index.select(
+                college_id=selected_colleges,
+                status=selected_status,
+                term=selected_terms,
+                years=selected_years
+            )
         else:
             raise ValueError("Data not loaded. Please call 'get_all_data()' first.")
     
     def get_filtered_data_bycollege(self, selected_program, selected_status, selected_years):
         if self.df is not None:
-            filtered_df = self.df[
-                (self.df['program_id'].isin(selected_program)) & 
-                (self.df['status'].isin(selected_status)) & 
-                (self.df['year'].between(selected_years[0], selected_years[1]))
-            ]
+            filtered_df = self.filter_index.select(
+                program_id=selected_program,
+                status=selected_status,
+                years=selected_years
+            )
             print("Filtered by program:",filtered_df)
             return filtered_df
         else:
@@ -308,12 +433,12 @@ class DatabaseManager:
         
     def get_filtered_data_text_display(self, selected_colleges, selected_status, selected_years, selected_terms):
         if self.df is not None:
-            filtered_df = self.df[
-                (self.df['college_id'].isin(selected_colleges)) & 
-                (self.df['status'].isin(selected_status)) & 
-                (self.df['term'].isin(selected_terms)) & 
-                (self.df['year'].between(selected_years[0], selected_years[1]))
-            ]
+            filtered_df = self.filter_index.select(
+                college_id=selected_colleges,
+                status=selected_status,
+                term=selected_terms,
+                years=selected_years
+            )
             print("Filtered by program:",filtered_df)
             return filtered_df
         else:
@@ -321,12 +446,12 @@ class DatabaseManager:
         
     def get_filtered_data_bycollege_text_display(self, selected_programs, selected_status, selected_years, selected_terms):
         if self.df is not None:
-            filtered_df = self.df[
-                (self.df['program_id'].isin(selected_programs)) & 
-                (self.df['status'].isin(selected_status)) & 
-                (self.df['term'].isin(selected_terms)) & 
-                (self.df['year'].between(selected_years[0], selected_years[1]))
-            ]
+            filtered_df = self.filter_index.select(
+                program_id=selected_programs,
+                status=selected_status,
+                term=selected_terms,
+                years=selected_years
+            )
             #print("Filtered by program:",filtered_df)
             return filtered_df
         else:
@@ -334,54 +459,59 @@ class DatabaseManager:
         
     def get_filtered_data_bycollege_with_term(self, selected_program, selected_status, selected_years, selected_terms):
         if self.df is not None:
-            filtered_df = self.df[
-                (self.df['program_id'].isin(selected_program)) & 
-                (self.df['status'].isin(selected_status)) & 
-                (self.df['term'].isin(selected_terms)) & 
-                (self.df['year'].between(selected_years[0], selected_years[1]))
-            ]
+            filtered_df = self.filter_index.select(
+                program_id=selected_program,
+                status=selected_status,
+                term=selected_terms,
+                years=selected_years
+            )
             print("Filtered by program:",filtered_df)
             return filtered_df
         else:
             raise ValueError("Data not loaded. Please call 'get_all_data()' first.")
         
-    def top_nouns(self,text, top_n=10):
-        # Remove punctuation using regex
-        text = re.sub(r'[^\w\s]', '', text)  # This removes punctuation (e.g. % / \ < > etc.)
-
-        # Tokenize the text
-        words = word_tokenize(text.lower())  # Tokenize and convert to lowercase
-
-        # Remove stopwords and words with less than 3 letters
-        words = [word for word in words if word not in self.stop_words and len(word) >= 3]
-
-        # Get part-of-speech tags for the words
-        pos_tags = pos_tag(words)
-
-        # Filter for nouns (NN, NNS, NNP, NNPS)
-        nouns = [word for word, tag in pos_tags if tag in ['NN', 'NNS', 'NNP', 'NNPS']]
+    def set_frame(self, df, watermark):
+        """Adopt an already compact frame built elsewhere (e.g. by another worker)."""
+        self.filter_index = FilterIndex(df)
+        self.df = df
+        self.watermark = watermark
+
+    def compact(self, df, report=True):
+        """Apply the compact column layout (see services/frame_schema.py) and report the saving."""
+        df, before, after = compact_frame(df)
+        self.memory_usage = {'before_mb': before, 'after_mb': after}
+        if report:
+            print(f"Dashboard DataFrame memory: {before:.2f} MB -> {after:.2f} MB ({len(df)} rows)")
+
+        # The index keeps its own reference to df, so readers never mix two versions
+        self.filter_index = FilterIndex(df)
+        return df
+
+    def extract_top_nouns(self, texts, top_n=10):
+        """Return top_nouns for every text, served from the persistent cache where possible."""
+        keys = [self.noun_cache.make_key(text, top_n) for text in texts]
+        nouns_by_key = self.noun_cache.get_many(set(keys))
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in nouns_by_key}
+        if missing:
+            computed = dict(zip(missing.keys(), self.noun_extractor.extract(missing.values(), top_n)))
+            self.noun_cache.put_many(computed)
+            nouns_by_key.update(computed)
+
+        return [nouns_by_key[key] for key in keys]
 
-        # Count the occurrences of the nouns
-        word_counts = Counter(nouns)
-        top_n_words = word_counts.most_common(top_n)
-
-        # Convert the top_n_words to a nested list format [noun, count]
-        top_n_words_nested = [word for word, _ in top_n_words]
-
-        return top_n_words_nested # Return the top n most common nouns as a nested list
+    def top_nouns(self,text, top_n=10):
+        # Return the top n most common nouns of the text
+        return top_nouns(text, self.stop_words, top_n, self.noun_extractor.tagger)
     
 
     def get_words(self,selected_colleges, selected_status, selected_years):
         if self.df is not None:
-            df_copy = self.df.copy()
-
-            
-            filtered_df = df_copy[
-                (df_copy['college_id'].isin(selected_colleges)) & 
-                (df_copy['status'].isin(selected_status)) & 
-                (df_copy['year'].between(selected_years[0], selected_years[1]))
-            ]
-            return filtered_df
+            return self.filter_index.select(
+                college_id=selected_colleges,
+                status=selected_status,
+                years=selected_years
+            ).copy()
         else:
             raise ValueError("Data not loaded. Please call 'get_all_data()' first.")
 
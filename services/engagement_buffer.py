@@ -0,0 +1,179 @@
+import atexit
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+import pytz
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import OperationalError
+from models.user_engagement import UserEngagement
+from config import Config
+
+# Keys of a queued event that are user_engagement columns
+EVENT_COLUMNS = ('research_id', 'user_id', 'timestamp', 'view', 'download')
+
+class EngagementBuffer:
+    """
+    Write-behind buffer for view/download events.
+
+    add() only queues the event; a flusher thread writes queued events as one multi-row
+    INSERT once max_batch events are waiting or flush_interval seconds have passed.
+    Events still queued at interpreter shutdown are drained by stop().
+
+    When a batch insert fails its events are retried one by one, so a bad event cannot hold
+    back the others; an event that failed max_retries flushes is dropped and logged. A lost
+    connection retries the whole batch with the same cap.
+
+    Events land up to the flush delay after their timestamp; DatabaseManager looks back
+    ENGAGEMENT_WATERMARK_LAG seconds behind its engagement watermark to pick them up.
+    """
+    def __init__(self, database_uri, max_batch=500, flush_interval=2.0, max_retries=5):
+        self.engine = create_engine(database_uri)
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.pending_views = Counter()
+        self.pending_downloads = Counter()
+        self.pending_downloaders = set()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def add(self, research_id, user_id, view=0, download=0):
+        """Queue one engagement event, stamped now (Asia/Manila, stored naive like before)."""
+        event = {
+            'research_id': research_id,
+            'user_id': user_id,
+            'timestamp': datetime.now(pytz.timezone('Asia/Manila')).replace(tzinfo=None),
+            'view': view,
+            'download': download,
+            'attempts': 0
+        }
+        with self.lock:
+            self.pending_views[research_id] += view
+            self.pending_downloads[research_id] += download
+            if download:
+                self.pending_downloaders.add((research_id, user_id))
+            self.start()
+        self.queue.put(event)
+
+    def pending_totals(self, research_id):
+        """(views, downloads) queued for research_id but not written yet."""
+        with self.lock:
+            return self.pending_views[research_id], self.pending_downloads[research_id]
+
+    def has_pending_download(self, research_id, user_id):
+        with self.lock:
+            return (research_id, user_id) in self.pending_downloaders
+
+    def start(self):
+        # Started on first use so processes that never record engagement run no thread
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='engagement-flusher', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=10):
+        """Flush everything still queued and stop the flusher."""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def run(self):
+        while True:
+            batch = self.next_batch()
+            if batch:
+                self.flush(batch)
+            elif self.stop_event.is_set():
+                return
+
+    def next_batch(self):
+        """Wait for the first event, then collect until max_batch or flush_interval is reached."""
+        try:
+            batch = [self.queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.max_batch:
+            # Once the deadline passed (or while draining) only take what is already queued
+            remaining = 0 if self.stop_event.is_set() else deadline - time.monotonic()
+            try:
+                batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def insert(self, events):
+        with self.engine.begin() as conn:
+            # Duplicate (research_id, user_id, timestamp) keys are the same event; keep one
+            conn.execute(pg_insert(UserEngagement.__table__).on_conflict_do_nothing(),
+                         [{column: event[column] for column in EVENT_COLUMNS} for event in events])
+
+    def flush(self, batch):
+        retry = []
+        try:
+            self.insert(batch)
+            done = batch
+        except OperationalError as e:
+            # Connection or server trouble, not a bad event: retry the whole batch later
+            print(f"Error flushing {len(batch)} engagement events: {e}")
+            done, retry = self.count_attempt(batch)
+        except Exception as e:
+            print(f"Error flushing {len(batch)} engagement events, retrying them one by one: {e}")
+            done, failed = [], []
+            for event in batch:
+                try:
+                    self.insert([event])
+                    done.append(event)
+                except Exception as e:
+                    print(f"Error writing engagement event {self.describe(event)}: {e}")
+                    failed.append(event)
+            dropped, retry = self.count_attempt(failed)
+            done += dropped
+
+        if retry:
+            # Back off a little longer after every failed attempt
+            attempts = max(event['attempts'] for event in retry)
+            print(f"Requeueing {len(retry)} engagement events (attempt {attempts} of {self.max_retries})")
+            time.sleep(self.flush_interval * 2 ** (attempts - 1))
+            for event in retry:
+                self.queue.put(event)
+
+        # Written and dropped events are no longer pending
+        with self.lock:
+            for event in done:
+                self.pending_views[event['research_id']] -= event['view']
+                self.pending_downloads[event['research_id']] -= event['download']
+                if event['download']:
+                    self.pending_downloaders.discard((event['research_id'], event['user_id']))
+            self.pending_views += Counter()  # drop ids whose queued events were all written
+            self.pending_downloads += Counter()
+
+    def count_attempt(self, events):
+        """Count a failed attempt for events; returns (dropped, retry)."""
+        dropped, retry = [], []
+        for event in events:
+            event['attempts'] += 1
+            if self.stop_event.is_set() or event['attempts'] >= self.max_retries:
+                print(f"Dropping engagement event {self.describe(event)} after {event['attempts']} attempts")
+                dropped.append(event)
+            else:
+                retry.append(event)
+        return dropped, retry
+
+    @staticmethod
+    def describe(event):
+        return ', '.join(f"{column}={event[column]}" for column in EVENT_COLUMNS)
+
+engagement_buffer = EngagementBuffer(
+    Config.SQLALCHEMY_DATABASE_URI,
+    max_batch=Config.ENGAGEMENT_FLUSH_SIZE,
+    flush_interval=Config.ENGAGEMENT_FLUSH_INTERVAL,
+    max_retries=Config.ENGAGEMENT_FLUSH_RETRIES
+)
+atexit.register(engagement_buffer.stop)
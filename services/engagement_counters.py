@@ -0,0 +1,135 @@
+import threading
+from sqlalchemy import create_engine
+from services.engagement_buffer import engagement_buffer
+from services.engagement_rollup import engagement_totals
+
+# Increment only counters that already exist; missing ones are seeded from the database on read
+INCREMENT_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HINCRBY', KEYS[1], 'views', ARGV[1])
+    return redis.call('HINCRBY', KEYS[1], 'downloads', ARGV[2])
+end
+return nil
+"""
+
+# Raise the counters to the given totals; never lowers them, so increments of events that are
+# not in Postgres yet (buffered in any worker) are kept
+RAISE_TO = """
+for i, field in ipairs({'views', 'downloads'}) do
+    local current = tonumber(redis.call('HGET', KEYS[1], field))
+    if current == nil or current < tonumber(ARGV[i]) then
+        redis.call('HSET', KEYS[1], field, ARGV[i])
+    end
+end
+return redis.call('HMGET', KEYS[1], 'views', 'downloads')
+"""
+
+class EngagementCounters:
+    """
+    Per-paper view/download totals kept in Redis (hash engagement:totals:<research_id>).
+
+    Events increment the counters atomically and totals() reads them in O(1). A counter
+    missing from Redis is seeded from the Postgres totals. A background job periodically
+    raises every counter to at least the Postgres totals, correcting undercounts from Redis
+    restarts, seeding races or events written outside these endpoints; only one worker runs
+    it per interval (Redis lock). Counters are only ever raised: Postgres lags behind by the
+    events still buffered in every worker, so it is a lower bound, not the truth.
+
+    When Redis is unavailable the totals are read from Postgres directly.
+    """
+    KEY_PREFIX = 'engagement:totals:'
+    LOCK_KEY = 'engagement:reconcile:lock'
+    DOWNLOAD_PREFIX = 'engagement:downloaded:'
+    DOWNLOAD_TTL = 86400  # by then the download is in Postgres, which the caller checks too
+
+    def __init__(self, redis_client, database_uri, reconcile_interval=300, lateness_days=1):
+        self.redis_client = redis_client
+        self.engine = create_engine(database_uri)
+        self.reconcile_interval = reconcile_interval
+        self.lateness_days = lateness_days  # of the daily rollup, see engagement_totals()
+        self.increment_script = redis_client.register_script(INCREMENT_IF_EXISTS)
+        self.raise_script = redis_client.register_script(RAISE_TO)
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def key(self, research_id):
+        return f'{self.KEY_PREFIX}{research_id}'
+
+    def increment(self, research_id, views=0, downloads=0):
+        try:
+            self.increment_script(keys=[self.key(research_id)], args=[views, downloads])
+        except Exception as e:
+            print(f"Error incrementing engagement counters: {e}")
+
+    def claim_download(self, research_id, user_id):
+        """
+        True for the first download of research_id by user_id across all workers (SET NX).
+        Without Redis only this process's buffered downloads are checked.
+        """
+        try:
+            return bool(self.redis_client.set(f'{self.DOWNLOAD_PREFIX}{research_id}:{user_id}', 1,
+                                              nx=True, ex=self.DOWNLOAD_TTL))
+        except Exception as e:
+            print(f"Error claiming download, checking buffered downloads only: {e}")
+            return not engagement_buffer.has_pending_download(research_id, user_id)
+
+    def totals(self, research_id):
+        """Return (views, downloads) for research_id."""
+        try:
+            views, downloads = self.redis_client.hmget(self.key(research_id), 'views', 'downloads')
+            if views is not None and downloads is not None:
+                return int(views), int(downloads)
+        except Exception as e:
+            print(f"Error reading engagement counters, falling back to the database: {e}")
+            return self.database_totals(research_id)
+
+        views, downloads = self.stored_totals(research_id)
+        try:
+            # Raising keeps a higher value another worker seeded or incremented in the meantime
+            views, downloads = self.raise_script(keys=[self.key(research_id)], args=[views, downloads])
+        except Exception as e:
+            print(f"Error seeding engagement counters: {e}")
+        return int(views), int(downloads)
+
+    def stored_totals(self, research_id):
+        """Totals written to Postgres (daily rollup plus raw events, so compaction keeps them)."""
+        with self.engine.connect() as conn:
+            row = conn.execute(engagement_totals(self.lateness_days, research_id=research_id)).first()
+        return (int(row.total_views), int(row.total_downloads)) if row is not None else (0, 0)
+
+    def database_totals(self, research_id):
+        """Totals from Postgres plus the events still buffered in this process (used without Redis)."""
+        views, downloads = self.stored_totals(research_id)
+        pending_views, pending_downloads = engagement_buffer.pending_totals(research_id)
+        return views + pending_views, downloads + pending_downloads
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='engagement-reconciler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        while not self.stop_event.wait(self.reconcile_interval):
+            try:
+                self.reconcile()
+            except Exception as e:
+                print(f"Error reconciling engagement counters: {e}")
+
+    def reconcile(self):
+        """Raise every counter to at least its Postgres totals."""
+        if not self.redis_client.set(self.LOCK_KEY, 1, nx=True, ex=max(1, self.reconcile_interval - 1)):
+            return  # another worker reconciled this interval
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(engagement_totals(self.lateness_days)).all()
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for research_id, views, downloads in rows:
+            self.raise_script(keys=[self.key(research_id)], args=[int(views), int(downloads)], client=pipe)
+        pipe.execute()
+        print(f"Reconciled engagement counters for {len(rows)} research outputs")
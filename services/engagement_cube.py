@@ -0,0 +1,150 @@
+import threading
+from datetime import timedelta
+import pandas as pd
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from models import UserEngagement, ResearchOutput, ResearchTypes, Account
+from services.frame_loader import read_query_frame
+
+# Dimensions and measures of the cube
+DIMENSIONS = ['day', 'college_id', 'program_id', 'research_type', 'research_id', 'user_role']
+MEASURES = ['total_views', 'total_downloads', 'total_unique_views']
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+class EngagementCube:
+    """
+    In-memory engagement cube: (day, college_id, program_id, research_type, research_id,
+    user_role) -> total_views, total_downloads, total_unique_views.
+
+    total_unique_views counts distinct users per cell, so summed over cells it counts a
+    user once per paper, day and role (use UniqueViewers for exact distinct users over
+    a range). Charts slice the cube by date range and dimension values and group it by
+    one dimension instead of querying user_engagement per chart.
+
+    A background thread refreshes the cube every refresh_interval seconds by re-reading
+    only the days from (latest day - lateness_days) onwards; version increases whenever
+    the cube changes.
+    """
+    def __init__(self, database_uri, refresh_interval=60, lateness_days=1):
+        self.engine = create_engine(database_uri)
+        self.Session = sessionmaker(bind=self.engine)
+        self.refresh_interval = refresh_interval
+        self.lateness_days = lateness_days
+        self.df = pd.DataFrame(columns=DIMENSIONS + MEASURES)
+        self.version = 0
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        self.refresh()
+
+    def load_cells(self, from_day=None):
+        """Aggregate raw events into cube cells, optionally only from from_day onwards."""
+        session = self.Session()
+        try:
+            day = func.date(UserEngagement.timestamp)
+            query = session.query(
+                day.label('day'),
+                ResearchOutput.college_id,
+                ResearchOutput.program_id,
+                func.coalesce(ResearchTypes.research_type_name, 'Unknown Type').label('research_type'),
+                UserEngagement.research_id,
+                func.coalesce(Account.role_id, 'Unknown').label('user_role'),
+                func.coalesce(func.sum(UserEngagement.view), 0).label('total_views'),
+                func.coalesce(func.sum(UserEngagement.download), 0).label('total_downloads'),
+                func.count(func.distinct(UserEngagement.user_id)).label('total_unique_views')
+            ).join(ResearchOutput, UserEngagement.research_id == ResearchOutput.research_id) \
+                .outerjoin(ResearchTypes, ResearchOutput.research_type_id == ResearchTypes.research_type_id) \
+                .outerjoin(Account, UserEngagement.user_id == Account.user_id) \
+                .group_by(day, ResearchOutput.college_id, ResearchOutput.program_id,
+                          ResearchTypes.research_type_name, UserEngagement.research_id, Account.role_id)
+
+            if from_day is not None:
+                query = query.filter(UserEngagement.timestamp >= from_day)  # prunes old partitions
+
+            df = read_query_frame(session, query)
+        finally:
+            session.close()
+
+        df['day'] = pd.to_datetime(df['day'])
+        for column in MEASURES:
+            df[column] = pd.to_numeric(df[column]).astype('int64')
+        return df
+
+    def refresh(self):
+        """Re-read the recent days (everything on the first load) and swap in the new cube."""
+        current = self.df
+        from_day = None
+        if not current.empty:
+            from_day = (current['day'].max() - timedelta(days=self.lateness_days)).date()
+
+        fresh = self.load_cells(from_day)
+        if from_day is not None:
+            fresh = pd.concat([current[current['day'] < pd.Timestamp(from_day)], fresh], ignore_index=True)
+
+        for column in DIMENSIONS[1:]:
+            fresh[column] = fresh[column].astype('category')
+
+        with self.lock:
+            unchanged = self.version > 0 and fresh.equals(self.df)
+            if not unchanged:
+                self.df = fresh
+                self.version += 1
+        return self.version
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='engagement-cube', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        while not self.stop_event.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing engagement cube: {e}")
+
+    def slice(self, start_date=None, end_date=None, **filters):
+        """
+        Cells between start_date and end_date (inclusive) whose dimensions match filters,
+        e.g. slice('2025-01-01', '2025-01-31', college_id=['CCS'], user_role=['06']).
+        A filter value of None or an empty list leaves that dimension unfiltered.
+        """
+        df = self.df
+        mask = pd.Series(True, index=df.index)
+        if start_date is not None:
+            mask &= df['day'] >= pd.Timestamp(start_date).normalize()
+        if end_date is not None:
+            mask &= df['day'] <= pd.Timestamp(end_date).normalize()
+        for column, values in filters.items():
+            if values is None or len(values) == 0:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            mask &= df[column].isin(list(values))
+        return df[mask]
+
+    def rollup(self, by, start_date=None, end_date=None, **filters):
+        """Sum the measures of the sliced cells grouped by one or more dimensions (or 'weekday')."""
+        df = self.slice(start_date, end_date, **filters)
+        if by == 'weekday':
+            keys = pd.Categorical(df['day'].dt.day_name(), categories=WEEKDAYS, ordered=True)
+            return df.groupby(keys, observed=True)[MEASURES].sum().rename_axis('day_of_week').reset_index()
+        return df.groupby(by, observed=True)[MEASURES].sum().reset_index()
+
+    def totals(self, start_date=None, end_date=None, **filters):
+        """Measure totals of the sliced cells as a dict."""
+        sums = self.slice(start_date, end_date, **filters)[MEASURES].sum()
+        return {column: int(sums[column]) for column in MEASURES}
+
+    def top(self, measure, by='research_id', n=10, start_date=None, end_date=None, **filters):
+        """The n values of dimension `by` with the highest measure total."""
+        grouped = self.rollup(by, start_date, end_date, **filters)
+        grouped = grouped[grouped[measure] > 0]
+        return grouped.nlargest(n, measure)[[by, measure]]
@@ -0,0 +1,97 @@
+from datetime import date
+from sqlalchemy import text
+
+# user_engagement is range-partitioned by month on timestamp (see models/user_engagement.py)
+PARENT_TABLE = 'user_engagement'
+DEFAULT_PARTITION = 'user_engagement_default'
+
+# Postgres advisory lock id, so concurrent workers never create the same partition at once
+PARTITION_LOCK_ID = 7402302
+
+def month_start(day, offset=0):
+    """First day of the month offset months after day's month."""
+    month_index = day.year * 12 + (day.month - 1) + offset
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+def partition_name(month):
+    return f'{PARENT_TABLE}_y{month.year}m{month.month:02d}'
+
+def ensure_partitions(conn, months_ahead=3, since=None):
+    """
+    Create the monthly partitions from since (default: this month) through months_ahead
+    months ahead, plus a DEFAULT partition for anything outside them. Existing partitions
+    are left alone, so this is safe to run repeatedly. Returns the names created.
+
+    Postgres refuses a new partition while the DEFAULT partition holds rows of its range,
+    so once DEFAULT exists the month is created detached, those rows are moved into it
+    and it is attached afterwards, all in the caller's transaction.
+    """
+    today = date.today()
+    month = month_start(since or today)
+    last = month_start(today, months_ahead)
+
+    existing = set(conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :parent
+    """), {'parent': PARENT_TABLE}).scalars())
+
+    created = []
+    while month <= last:
+        name = partition_name(month)
+        if name not in existing:
+            bounds = f"FROM ('{month.isoformat()}') TO ('{month_start(month, 1).isoformat()}')"
+            if DEFAULT_PARTITION in existing:
+                moved = create_from_default(conn, name, month, month_start(month, 1), bounds)
+                if moved:
+                    print(f"Moved {moved} engagement rows from {DEFAULT_PARTITION} to {name}")
+            else:
+                conn.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} FOR VALUES {bounds}"))
+            created.append(name)
+        month = month_start(month, 1)
+
+    if DEFAULT_PARTITION not in existing:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+        created.append(DEFAULT_PARTITION)
+
+    return created
+
+def create_from_default(conn, name, start, end, bounds):
+    """Create partition name, moving its rows out of the DEFAULT partition first. Returns the rows moved."""
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    moved = conn.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE timestamp >= :start AND timestamp < :end
+            RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), {'start': start, 'end': end}).rowcount
+    # Attaching creates the parent's indexes on the new partition
+    conn.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+    return moved
+
+def is_partitioned(conn):
+    return conn.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_partitioned_table
+            JOIN pg_class ON pg_class.oid = pg_partitioned_table.partrelid
+            WHERE pg_class.relname = :parent
+        )
+    """), {'parent': PARENT_TABLE}).scalar()
+
+def maintain_partitions(engine, months_ahead=3):
+    """Scheduled job: pre-create the upcoming monthly partitions of user_engagement."""
+    try:
+        with engine.begin() as conn:
+            conn.execute(text('SELECT pg_advisory_xact_lock(:id)'), {'id': PARTITION_LOCK_ID})
+            if not is_partitioned(conn):
+                print(f"{PARENT_TABLE} is not partitioned yet; run the database migrations first.")
+                return
+            created = ensure_partitions(conn, months_ahead=months_ahead)
+        if created:
+            print(f"Created engagement partitions: {', '.join(created)}")
+    except Exception as e:
+        print(f"Error maintaining engagement partitions: {e}")
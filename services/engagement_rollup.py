@@ -0,0 +1,115 @@
+import threading
+from datetime import timedelta
+from sqlalchemy import create_engine, delete, func, insert, or_, select, text, union_all
+from models.user_engagement import UserEngagement
+from models.user_engagement_daily import UserEngagementDaily
+
+# Postgres advisory lock id, so concurrent workers never rebuild the same days at once
+ROLLUP_LOCK_ID = 7402301
+
+class EngagementRollup:
+    """
+    Maintains the daily per-paper rollup of user_engagement in user_engagement_daily,
+    a table only this class writes.
+
+    The watermark is the latest day already in the rollup. Each run rebuilds the days
+    from (watermark - lateness_days) onwards from the raw events: those days are deleted
+    and re-inserted in one transaction, so runs are idempotent and rows written late
+    (e.g. by the engagement buffer) are still folded in. Older days are never re-read.
+
+    With retention_days set, raw events older than that (and already rolled up) are
+    deleted. Per-paper totals (engagement_totals below) stay complete; everything else
+    still reading raw user_engagement (the dashboard frame, the engagement cube, the
+    per-user engagement charts) then only sees the retained window, so compaction is
+    off unless configured.
+    """
+    def __init__(self, database_uri, interval=300, lateness_days=1, retention_days=None):
+        self.engine = create_engine(database_uri)
+        self.interval = interval
+        self.lateness_days = lateness_days
+        self.retention_days = retention_days
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='engagement-rollup', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.roll_up()
+            except Exception as e:
+                print(f"Error rolling up user engagement: {e}")
+
+    def roll_up(self):
+        """Fold new raw events into the rollup. Returns the first rebuilt day (None for a full build)."""
+        with self.engine.begin() as conn:
+            if not conn.execute(text('SELECT pg_try_advisory_xact_lock(:id)'), {'id': ROLLUP_LOCK_ID}).scalar():
+                return None  # another worker is rolling up
+
+            watermark = conn.execute(select(func.max(UserEngagementDaily.day))).scalar()
+            from_day = watermark - timedelta(days=self.lateness_days) if watermark is not None else None
+
+            day = func.date(UserEngagement.timestamp)
+            daily = select(
+                UserEngagement.research_id,
+                day,
+                func.sum(UserEngagement.view),
+                func.sum(UserEngagement.download),
+                func.count(func.distinct(UserEngagement.user_id))
+            ).group_by(UserEngagement.research_id, day)
+
+            clear = delete(UserEngagementDaily)
+            if from_day is not None:
+                daily = daily.where(UserEngagement.timestamp >= from_day)
+                clear = clear.where(UserEngagementDaily.day >= from_day)
+
+            conn.execute(clear)
+            inserted = conn.execute(insert(UserEngagementDaily).from_select(
+                ['research_id', 'day', 'total_views', 'total_downloads', 'unique_views'], daily
+            )).rowcount
+
+            if self.retention_days and from_day is not None:
+                cutoff = min(from_day, watermark - timedelta(days=self.retention_days))
+                compacted = conn.execute(delete(UserEngagement).where(UserEngagement.timestamp < cutoff)).rowcount
+                if compacted:
+                    print(f"Compacted {compacted} raw engagement rows before {cutoff}")
+
+        print(f"Rolled up user engagement from {from_day or 'the first event'}: {inserted} paper-days")
+        return from_day
+
+def engagement_totals(lateness_days, research_id=None):
+    """
+    Select of (research_id, total_views, total_downloads) per paper. Each day is read from
+    exactly one source: the rollup for the days it no longer rebuilds, raw events from
+    there on (compaction never deletes those), so the totals survive compaction and are
+    never double counted. Archived aggr_user_engagement rows are not included.
+    """
+    boundary = select(func.max(UserEngagementDaily.day) - lateness_days).scalar_subquery()
+    rolled = select(
+        UserEngagementDaily.research_id,
+        UserEngagementDaily.total_views.label('views'),
+        UserEngagementDaily.total_downloads.label('downloads')
+    ).where(UserEngagementDaily.day < boundary)
+    raw = select(
+        UserEngagement.research_id,
+        UserEngagement.view.label('views'),
+        UserEngagement.download.label('downloads')
+    ).where(or_(boundary.is_(None), UserEngagement.timestamp >= boundary))
+    if research_id is not None:
+        rolled = rolled.where(UserEngagementDaily.research_id == research_id)
+        raw = raw.where(UserEngagement.research_id == research_id)
+
+    events = union_all(rolled, raw).subquery()
+    return select(
+        events.c.research_id,
+        func.coalesce(func.sum(events.c.views), 0).label('total_views'),
+        func.coalesce(func.sum(events.c.downloads), 0).label('total_downloads')
+    ).group_by(events.c.research_id)
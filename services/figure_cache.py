@@ -0,0 +1,154 @@
+import functools
+import hashlib
+import inspect
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import plotly.io as pio
+from services.frame_schema import to_python
+
+def normalize(value):
+    """Hashable, order-insensitive form of a chart argument (filter lists, arrays, color maps)."""
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), normalize(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(sorted((normalize(item) for item in value), key=repr))
+    return to_python(value)
+
+class FigureCache:
+    """
+    Serialized Plotly figures keyed by (chart id, normalized arguments, data version).
+
+    Identical filters produce identical figures until the dashboard data changes, so a
+    figure is built once per data version and served from an in-process LRU (and, when
+    a Redis client is attached, from Redis for the other workers). A version bump
+    drops the local entries; Redis entries carry the version in their key and expire
+    after redis_ttl seconds.
+
+    The Redis tier must only be enabled when every worker sees the same version for the
+    same data, i.e. when the workers share one snapshot store.
+
+    The data version only tracks the dashboard snapshot. Charts that query the database
+    themselves are cached with a ttl: their key also carries the ttl-second time bucket,
+    so such a figure is rebuilt at least every ttl seconds.
+    """
+    KEY_PREFIX = 'figure:'
+
+    def __init__(self, version_source, max_entries=256, redis_client=None, redis_ttl=3600):
+        self.version_source = version_source
+        self.max_entries = max_entries
+        self.redis_client = redis_client
+        self.redis_ttl = redis_ttl
+        self.entries = OrderedDict()
+        self.ttls = {}  # chart_id -> seconds, for charts not derived from the snapshot
+        self.version = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def use_redis(self, redis_client, ttl=None):
+        self.redis_client = redis_client
+        if ttl is not None:
+            self.redis_ttl = ttl
+
+    def redis_key(self, version, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return f'{self.KEY_PREFIX}{version}:{key[0]}:{digest}'
+
+    def get(self, chart_id, build, *args, **kwargs):
+        """Figure for build(*args, **kwargs), built only on a miss."""
+        version = self.version_source()
+        key = (chart_id, normalize(args), normalize(kwargs))
+        ttl = self.ttls.get(chart_id)
+        if ttl:
+            key += (int(time.time() // ttl),)
+
+        with self.lock:
+            if version != self.version:
+                self.entries.clear()  # figures of older versions can never hit again
+                self.version = version
+            figure_json = self.entries.get(key)
+            if figure_json is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+
+        if figure_json is None and self.redis_client is not None:
+            try:
+                figure_json = self.redis_client.get(self.redis_key(version, key))
+            except Exception as e:
+                print(f"Error reading figure cache from Redis: {e}")
+            if figure_json is not None:
+                with self.lock:
+                    self.redis_hits += 1
+                self.store(version, key, figure_json)
+
+        if figure_json is not None:
+            return pio.from_json(figure_json)
+
+        with self.lock:
+            self.misses += 1
+        figure = build(*args, **kwargs)
+        figure_json = pio.to_json(figure)
+        self.store(version, key, figure_json)
+        if self.redis_client is not None:
+            try:
+                self.redis_client.set(self.redis_key(version, key), figure_json,
+                                      ex=min(self.redis_ttl, ttl) if ttl else self.redis_ttl)
+            except Exception as e:
+                print(f"Error writing figure cache to Redis: {e}")
+        return figure
+
+    def store(self, version, key, figure_json):
+        with self.lock:
+            if version != self.version:
+                return  # the data changed while this figure was built
+            self.entries[key] = figure_json
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def cached(self, chart_id, ttl=None):
+        """
+        Decorator caching a chart builder's figures under chart_id. Arguments are bound to
+        the builder's signature first, so positional and keyword calls share entries; on
+        methods the instance is left out of the key. Builders that read the database
+        instead of the snapshot must pass ttl (seconds).
+        """
+        if ttl:
+            self.ttls[chart_id] = ttl
+
+        def decorator(build):
+            signature = inspect.signature(build)
+            is_method = next(iter(signature.parameters), None) == 'self'
+
+            @functools.wraps(build)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = dict(bound.arguments)
+                instance = arguments.pop('self', None) if is_method else None
+
+                def build_figure(**arguments):
+                    if is_method:
+                        return build(instance, **arguments)
+                    return build(**arguments)
+
+                return self.get(chart_id, build_figure, **arguments)
+            return wrapper
+        return decorator
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.redis_hits + self.misses
+            return {
+                'version': self.version,
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'redis_hits': self.redis_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.redis_hits) / lookups, 4) if lookups else None
+            }
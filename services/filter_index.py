@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+class FilterIndex:
+    """
+    Precomputed filter masks for one version of the dashboard DataFrame.
+
+    Every value of the indexed columns gets a packed bitset (one bit per row) and the
+    year column is kept as a sorted array, so any filter combination is a few bitwise
+    ORs/ANDs plus two binary searches. Recent filter tuples are kept in a small LRU so
+    the callbacks fired by one filter change share the same mask.
+    """
+    COLUMNS = ['college_id', 'program_id', 'status', 'term', 'journal']
+
+    def __init__(self, df, cache_size=128):
+        self.df = df
+        self.size = len(df)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.bitsets = {}
+        for column in self.COLUMNS:
+            if column not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[column])
+            self.bitsets[column] = {
+                value: np.packbits(codes == code) for code, value in enumerate(uniques)
+            }
+
+        # Sorted years and the row positions they came from
+        years = pd.to_numeric(df['year'].astype(object), errors='coerce').to_numpy(dtype=float) \
+            if 'year' in df.columns else np.full(self.size, np.nan)
+        self.year_order = np.argsort(years, kind='stable')  # NaN years sort last
+        self.sorted_years = years[self.year_order]
+
+    def all_bits(self):
+        return np.packbits(np.ones(self.size, dtype=bool))
+
+    def column_bits(self, column, values):
+        """Bitset of rows where column is in values (pandas isin semantics)."""
+        bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        for value in values:
+            value_bits = self.bitsets[column].get(value)
+            if value_bits is not None:
+                bits |= value_bits
+        return bits
+
+    def year_bits(self, start, end):
+        """Bitset of rows whose year is between start and end (inclusive)."""
+        low = np.searchsorted(self.sorted_years, float(start), side='left')
+        high = np.searchsorted(self.sorted_years, float(end), side='right')
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.year_order[low:high]] = True
+        return np.packbits(mask)
+
+    def mask(self, years=None, **filters):
+        """
+        Boolean row mask for the given filters, e.g. mask(college_id=[...], status=[...], years=[2019, 2024]).
+        Filters that are None are ignored.
+        """
+        key = (
+            tuple(years) if years is not None else None,
+            tuple(sorted(
+                (column, tuple(sorted(set(values), key=str)))
+                for column, values in filters.items() if values is not None
+            ))
+        )
+
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+
+        bits = self.all_bits()
+        for column, values in key[1]:
+            bits &= self.column_bits(column, values)
+        if years is not None:
+            bits &= self.year_bits(years[0], years[1])
+
+        mask = np.unpackbits(bits, count=self.size).astype(bool)
+        mask.setflags(write=False)  # shared between callbacks
+
+        with self.lock:
+            self.cache[key] = mask
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        return mask
+
+    def select(self, years=None, **filters):
+        """Rows of the indexed DataFrame matching the filters."""
+        return self.df[self.mask(years=years, **filters)]
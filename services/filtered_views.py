@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+import pandas as pd
+from services.frame_schema import to_python
+
+# Columns the institutional performance charts group by
+VIEW_COLUMNS = ['research_id', 'college_id', 'program_id', 'year', 'term', 'status',
+                'research_type', 'journal', 'scopus', 'sdg']
+
+class FilteredViews:
+    """
+    Per-process memo of the filtered dashboard frame for one filter combination.
+
+    A filter change fires every chart callback of a dashboard with the same filters.
+    The first callback filters the shared frame (one FilterIndex mask) and the others
+    reuse that result for ttl seconds instead of each re-filtering or re-querying.
+
+    Entries belong to the FilterIndex they were computed from, so a new snapshot
+    invalidates them immediately. The view has plain (non-categorical) columns so chart
+    groupbys only produce observed combinations. Callers must not modify it in place.
+    """
+    def __init__(self, manager, ttl=10, max_entries=64):
+        self.manager = manager
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.computing = {}  # key -> lock held while that view is being computed
+
+    @staticmethod
+    def key(years=None, **filters):
+        return (
+            tuple(years) if years is not None else None,
+            tuple(sorted(
+                (column, tuple(sorted(set(values), key=str)))
+                for column, values in filters.items() if values is not None
+            ))
+        )
+
+    def cached(self, key, index):
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] is index and time.monotonic() - entry[1] <= self.ttl:
+            self.entries.move_to_end(key)
+            return entry[2]
+        return None
+
+    def get(self, years=None, **filters):
+        """
+        Filtered view for the given filters, e.g.
+        get(college_id=[...], status=[...], term=[...], years=[2019, 2024]).
+        """
+        index = self.manager.filter_index
+        if index is None:
+            raise ValueError("Data not loaded. Please call 'get_all_data()' first.")
+
+        key = self.key(years=years, **filters)
+        with self.lock:
+            view = self.cached(key, index)
+            if view is not None:
+                return view
+            key_lock = self.computing.setdefault(key, threading.Lock())
+
+        # Callbacks fired by the same filter change wait for the first one's result
+        with key_lock:
+            with self.lock:
+                view = self.cached(key, index)
+            if view is not None:
+                return view
+
+            try:
+                view = self.compute(index, years, filters)
+                with self.lock:
+                    self.entries[key] = (index, time.monotonic(), view)
+                    self.entries.move_to_end(key)
+                    while len(self.entries) > self.max_entries:
+                        self.entries.popitem(last=False)
+            finally:
+                with self.lock:
+                    self.computing.pop(key, None)
+
+        return view
+
+    @staticmethod
+    def handle(version, years=None, **filters):
+        """
+        JSON handle for a filtered view: the snapshot version it was taken on plus the
+        filter state. Dashboards keep this in their dcc.Store instead of the rows.
+        """
+        return {
+            'version': to_python(version),
+            'years': [to_python(year) for year in years] if years is not None else None,
+            'filters': {
+                column: [to_python(value) for value in values]
+                for column, values in filters.items() if values is not None
+            }
+        }
+
+    def resolve(self, handle):
+        """Filtered view a handle refers to, on the current snapshot."""
+        return self.get(years=handle.get('years'), **handle.get('filters', {}))
+
+    def compute(self, index, years, filters):
+        df = index.select(years=years, **filters)
+        view = df[[column for column in VIEW_COLUMNS if column in df.columns]].copy()
+        for column in view.columns:
+            if isinstance(view[column].dtype, pd.CategoricalDtype):
+                view[column] = view[column].astype(object)
+        return view
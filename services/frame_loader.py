@@ -0,0 +1,29 @@
+import pandas as pd
+
+def read_query_frame(session, query, chunk_size=5000):
+    """
+    Stream a query's rows into a DataFrame.
+
+    Rows are read through a server-side cursor chunk_size at a time and converted to
+    columnar chunks, so no ORM row objects or per-row dicts are built.
+    """
+    connection = session.connection(execution_options={'stream_results': True})
+    chunks = list(pd.read_sql(query.statement, connection, chunksize=chunk_size))
+    if not chunks:
+        return pd.DataFrame(columns=[column['name'] for column in query.column_descriptions])
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+def fill_defaults(df, defaults):
+    """Replace missing values column by column with the given {column: default} values."""
+    for column, default in defaults.items():
+        if column in df.columns:
+            df[column] = df[column].where(df[column].notna(), default)
+    return df
+
+def venue_country(venues):
+    """Country of each conference venue (the text after its last comma)."""
+    return venues.astype(object).str.split(',').str[-1].str.strip()
+
+def year_of(dates):
+    """Year of each date, NaN where the date is missing."""
+    return pd.to_datetime(dates, errors='coerce').dt.year
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+# Low-cardinality labels stored as pandas categoricals
+CATEGORICAL_COLUMNS = ['college_id', 'program_id', 'status', 'term', 'journal', 'research_type', 'country', 'scopus']
+
+# Counters and years down-cast to the smallest (nullable) integer type that fits
+INTEGER_COLUMNS = ['views', 'downloads', 'unique_views', 'year']
+
+# Large text columns only used for top-noun extraction; no chart reads them, so they are dropped
+LAZY_TEXT_COLUMNS = ['abstract', 'combined']
+
+def memory_usage_mb(df):
+    return df.memory_usage(deep=True).sum() / (1024 ** 2)
+
+def smallest_int_dtype(values):
+    """Return the smallest nullable integer dtype that can hold the given values."""
+    if values.notna().any():
+        low, high = values.min(), values.max()
+        for dtype in ('Int8', 'Int16', 'Int32'):
+            info = np.iinfo(dtype.lower())
+            if info.min <= low and high <= info.max:
+                return dtype
+        return 'Int64'
+    return 'Int8'
+
+def compact_frame(df):
+    """
+    Convert the dashboard frame to its compact layout.
+
+    Returns (compact_df, memory_before_mb, memory_after_mb). Safe to call on a frame
+    that is already compact, e.g. after merging incrementally refreshed rows.
+    """
+    before = memory_usage_mb(df)
+    df = apply_layout(df)
+    return df, before, memory_usage_mb(df)
+
+def apply_layout(df):
+    """
+    Apply the compact column dtypes (categoricals, smallest nullable integers) without
+    measuring memory. Also restores them on frames read back from another format, e.g.
+    the Arrow snapshot files shared between workers.
+    """
+    df = df.drop(columns=[column for column in LAZY_TEXT_COLUMNS if column in df.columns])
+
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+
+    for column in INTEGER_COLUMNS:
+        if column in df.columns:
+            values = pd.to_numeric(df[column].astype(object), errors='coerce')
+            df[column] = values.astype(smallest_int_dtype(values))
+
+    return df
+
+def to_python(value):
+    """Convert numpy/pandas scalars to plain Python values (for Dash props and SQL parameters)."""
+    if value is pd.NA:
+        return None
+    return value.item() if isinstance(value, np.generic) else value
@@ -0,0 +1,136 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import networkx as nx
+import numpy as np
+
+def structure_hash(G):
+    """Digest of a graph's node and edge sets (attributes are ignored)."""
+    nodes = sorted(map(repr, G.nodes()))
+    edges = sorted(tuple(sorted((repr(u), repr(v)))) for u, v in G.edges())
+    return hashlib.sha1(repr((nodes, edges)).encode()).hexdigest()
+
+def fruchterman_reingold(n, edges, pos=None, iterations=50, k=None, temperature=0.1, seed=42, chunk=512):
+    """
+    Vectorized Fruchterman-Reingold layout of n nodes with edges given as an (m, 2) array of
+    node positions. Repulsion is computed in blocks of chunk rows so memory stays at
+    chunk * n per step. Starts from pos when given (warm start), random positions otherwise.
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2)) if pos is None else np.array(pos, dtype=float)
+    if n <= 1:
+        return pos
+
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    k = k or np.sqrt(1.0 / n)
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        displacement = np.zeros((n, 2))
+        x, y = pos[:, 0], pos[:, 1]
+        for start in range(0, n, chunk):
+            dx = x[start:start + chunk, None] - x[None, :]
+            dy = y[start:start + chunk, None] - y[None, :]
+            repulsion = k * k / np.maximum(dx * dx + dy * dy, 1e-4)
+            displacement[start:start + chunk, 0] = (dx * repulsion).sum(axis=1)
+            displacement[start:start + chunk, 1] = (dy * repulsion).sum(axis=1)
+
+        if len(edges):
+            delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+            distance = np.maximum(np.linalg.norm(delta, axis=1), 0.01)
+            attraction = delta * (distance / k)[:, None]
+            np.add.at(displacement, edges[:, 0], -attraction)
+            np.add.at(displacement, edges[:, 1], attraction)
+
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 0.01)
+        pos += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    return pos
+
+class LayoutCache:
+    """
+    Node positions keyed by (graph structure hash, layout method, parameters).
+
+    A graph that was laid out before with the same parameters is served from the LRU.
+    On a miss, when the previous graph laid out with those parameters shares all but
+    warm_fraction of the nodes, its positions seed the new layout (new nodes start next
+    to their placed neighbours) and only a short refinement runs. Graphs with more than
+    fast_layout_nodes nodes use the vectorized Fruchterman-Reingold above instead of
+    networkx's Kamada-Kawai / spring layouts.
+    """
+    METHODS = ('kamada_kawai', 'spring')
+
+    def __init__(self, max_entries=64, fast_layout_nodes=300, warm_fraction=0.2, seed=42):
+        self.max_entries = max_entries
+        self.fast_layout_nodes = fast_layout_nodes
+        self.warm_fraction = warm_fraction
+        self.seed = seed
+        self.entries = OrderedDict()
+        self.latest = {}  # (method, params) -> positions of the last graph laid out with them
+        self.lock = threading.Lock()
+
+    def layout(self, G, method='kamada_kawai', **params):
+        """Positions {node: np.array([x, y])} of G, scaled to [-1, 1] like the networkx layouts."""
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown layout method: {method}")
+
+        settings = (method, tuple(sorted(params.items())))
+        key = (structure_hash(G), settings)
+        with self.lock:
+            pos = self.entries.get(key)
+            if pos is not None:
+                self.entries.move_to_end(key)
+                return dict(pos)
+            previous = self.latest.get(settings)
+
+        pos = self.compute(G, method, params, self.warm_start(G, previous))
+
+        with self.lock:
+            self.entries[key] = pos
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.latest[settings] = pos
+        return dict(pos)
+
+    def warm_start(self, G, previous):
+        """Seed positions from the previous layout when the graph changed only a little."""
+        if not previous or len(G) == 0:
+            return None
+        new_nodes = [node for node in G if node not in previous]
+        if len(new_nodes) > self.warm_fraction * len(G):
+            return None
+
+        rng = np.random.default_rng(self.seed)
+        seed_pos = {node: previous[node] for node in G if node in previous}
+        for node in new_nodes:
+            placed = [seed_pos[neighbor] for neighbor in G.neighbors(node) if neighbor in seed_pos]
+            center = np.mean(placed, axis=0) if placed else np.zeros(2)
+            seed_pos[node] = center + rng.normal(scale=0.05, size=2)
+        return seed_pos
+
+    def compute(self, G, method, params, seed_pos):
+        nodes = list(G)
+        if len(nodes) <= 1:
+            return {node: np.zeros(2) for node in nodes}
+
+        if len(nodes) > self.fast_layout_nodes:
+            position = {node: i for i, node in enumerate(nodes)}
+            edges = np.array([(position[u], position[v]) for u, v in G.edges()], dtype=np.int64)
+            start = np.array([seed_pos[node] for node in nodes]) if seed_pos else None
+            # A warm start only needs a few low-temperature steps
+            coords = fruchterman_reingold(
+                len(nodes), edges, pos=start,
+                iterations=15 if seed_pos else params.get('iterations', 50),
+                k=params.get('k'), temperature=0.02 if seed_pos else 0.1, seed=self.seed
+            )
+            coords = nx.rescale_layout(coords - coords.mean(axis=0))
+            return dict(zip(nodes, coords))
+
+        if method == 'kamada_kawai':
+            return nx.kamada_kawai_layout(G, pos=seed_pos, **params)
+        params = dict(params)
+        if seed_pos:
+            params['iterations'] = min(params.get('iterations', 50), 15)
+        return nx.spring_layout(G, pos=seed_pos, seed=self.seed, **params)
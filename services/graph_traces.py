@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+def graph_arrays(G, pos, edges=None):
+    """
+    Node order, positions array (n, 2) and edge index array (m, 2) of a laid-out graph.
+    edges defaults to all edges of G. Nodes without a position are left out, as are
+    their edges.
+    """
+    nodes = [node for node in G.nodes() if node in pos]
+    index = {node: i for i, node in enumerate(nodes)}
+    positions = np.array([pos[node] for node in nodes], dtype=float).reshape(-1, 2)
+    edge_index = np.array(
+        [(index[u], index[v]) for u, v in (G.edges() if edges is None else edges) if u in index and v in index],
+        dtype=np.int64
+    ).reshape(-1, 2)
+    return nodes, positions, edge_index
+
+def edge_coordinates(positions, edge_index):
+    """
+    x and y arrays of all edges for a single 'lines' trace, as [x0, x1, NaN, x0, x1, NaN, ...].
+    Plotly serializes NaN as null, so the segments are separated like with None.
+    """
+    segments = np.full((len(edge_index), 3, 2), np.nan)
+    segments[:, 0] = positions[edge_index[:, 0]]
+    segments[:, 1] = positions[edge_index[:, 1]]
+    segments = segments.reshape(-1, 2)
+    return segments[:, 0], segments[:, 1]
+
+def node_frame(G, nodes, positions, columns=()):
+    """
+    One row per node (in nodes' order) with the node key in 'node', its position in 'x'
+    and 'y' and its attributes as columns; the given columns always exist (NaN if unset).
+    """
+    frame = pd.DataFrame.from_records([G.nodes[node] for node in nodes], index=range(len(nodes)))
+    frame = frame.reindex(columns=list(dict.fromkeys([*frame.columns, *columns])))
+    frame.insert(0, 'node', pd.Series(nodes, dtype=object))
+    frame['x'] = positions[:, 0]
+    frame['y'] = positions[:, 1]
+    return frame
@@ -0,0 +1,180 @@
+import threading
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Columns of get_program_research_aggregation() the index reads
+ROW_COLUMNS = ['program_name', 'college_id', 'school_year', 'color_code', 'research_count',
+               'concatenated_keywords']
+
+def normalize_keywords(keywords):
+    """Lower-cased, whitespace-collapsed tokens of '; '-joined keyword lists, indexed by row."""
+    tokens = keywords.dropna().astype(str).str.split(';').explode()
+    tokens = tokens.str.strip().str.lower().str.replace(r'\s+', ' ', regex=True)
+    return tokens[tokens.notna() & (tokens != '')]
+
+class KeywordUsage:
+    """
+    Program × keyword usage counts of one year/college selection. Keywords are columns,
+    so per-keyword tests are column operations on the sparse matrix.
+    """
+    def __init__(self, index, counts, mask):
+        self.index = index
+        self.counts = counts.tocsc()
+        self.mask = mask
+
+    @property
+    def keywords(self):
+        return self.index.keywords
+
+    @property
+    def programs(self):
+        return self.index.programs
+
+    @property
+    def colors(self):
+        return self.index.colors
+
+    @property
+    def years(self):
+        """(min, max) school year of the selected rows, None when nothing is selected."""
+        years = self.index.years[self.mask]
+        years = years[~np.isnan(years)]
+        return (int(years.min()), int(years.max())) if len(years) else None
+
+    @property
+    def research_counts(self):
+        """Research count per program over the selected rows."""
+        return np.bincount(self.index.row_programs[self.mask],
+                           weights=self.index.research_counts[self.mask],
+                           minlength=len(self.programs))
+
+    def keyword_position(self, keyword):
+        if keyword is None:
+            return None
+        position = self.keywords.get_indexer([keyword])[0]
+        return position if position >= 0 else None
+
+    def at_least(self, threshold):
+        """Sparse 0/1 matrix of the (program, keyword) cells used at least threshold times."""
+        return (self.counts >= max(threshold, 1)).astype(np.int32)
+
+    def programs_meeting(self, threshold):
+        """Per keyword, the number of programs that used it at least threshold times."""
+        return np.asarray(self.at_least(threshold).sum(axis=0)).ravel()
+
+    def usage_counts(self, threshold):
+        """Per keyword, its total uses by the programs meeting threshold."""
+        return np.asarray(self.counts.multiply(self.at_least(threshold)).sum(axis=0)).ravel()
+
+    def keyword_programs(self, position, threshold):
+        """Program positions and counts of the programs that used a keyword at least threshold times."""
+        column = self.counts.getcol(position).tocoo()
+        keep = column.data >= threshold
+        return column.row[keep], column.data[keep].astype(int)
+
+    def kth_largest(self, k):
+        """Per keyword, the k-th largest program count (0 when fewer than k programs used it)."""
+        counts = self.counts.copy()
+        counts.eliminate_zeros()
+        lengths = np.diff(counts.indptr)
+        columns = np.repeat(np.arange(counts.shape[1]), lengths)
+        # Sort every column's counts in descending order, then take the k-th entry of each
+        order = np.lexsort((-counts.data, columns))
+        ranks = np.arange(len(order)) - np.repeat(counts.indptr[:-1], lengths)
+        picked = ranks == k - 1
+        result = np.zeros(counts.shape[1], dtype=np.int64)
+        result[columns[order][picked]] = counts.data[order][picked]
+        return result
+
+    def threshold_histogram(self, min_programs=2):
+        """
+        keywords[t] = number of keywords used at least t times by min_programs programs,
+        for t = 0 .. max_threshold. A keyword qualifies at t exactly when its
+        min_programs-th largest program count is >= t.
+        """
+        counts = np.bincount(self.kth_largest(min_programs), minlength=2)
+        return counts[::-1].cumsum()[::-1]
+
+    def max_threshold(self, min_programs=2):
+        """Highest threshold at which some keyword is still used that often by min_programs programs."""
+        return max(int(self.kth_largest(min_programs).max(initial=0)), 1)
+
+class KeywordCoUsage:
+    """
+    Sparse keyword usage of the program research aggregation rows (one row per program,
+    college and school year): usage[row, keyword] counts how often the row's papers list
+    the keyword. A year/college selection is a masked sum of rows into programs.
+    """
+    def __init__(self, rows):
+        rows = rows.reindex(columns=ROW_COLUMNS)
+        rows = rows[rows['program_name'].notna()].reset_index(drop=True)
+        self.rows = rows
+
+        tokens = normalize_keywords(rows['concatenated_keywords'])
+        keyword_codes, self.keywords = pd.factorize(tokens)
+        self.row_programs, self.programs = pd.factorize(rows['program_name'])
+        self.keywords = pd.Index(self.keywords)
+        self.programs = pd.Index(self.programs)
+
+        self.usage = sparse.csr_matrix(
+            (np.ones(len(tokens), dtype=np.int32), (tokens.index.to_numpy(), keyword_codes)),
+            shape=(len(rows), len(self.keywords))
+        )
+        self.membership = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (self.row_programs, np.arange(len(rows)))),
+            shape=(len(self.programs), len(rows))
+        )
+        self.total = self.membership @ self.usage
+
+        self.years = pd.to_numeric(rows['school_year'], errors='coerce').to_numpy(dtype=float)
+        self.research_counts = pd.to_numeric(rows['research_count'], errors='coerce').fillna(0).to_numpy(dtype=float)
+        self.colors = rows.drop_duplicates('program_name', keep='last') \
+            .set_index('program_name')['color_code'].reindex(self.programs).to_numpy()
+
+    def select(self, start_year=None, end_year=None, colleges=None):
+        """Usage counts of the rows within the year range and (when given) the colleges."""
+        mask = np.ones(len(self.rows), dtype=bool)
+        if start_year is not None:
+            mask &= self.years >= float(start_year)
+        if end_year is not None:
+            mask &= self.years <= float(end_year)
+        if colleges:
+            mask &= self.rows['college_id'].isin(list(colleges)).to_numpy()
+
+        if mask.all():
+            return KeywordUsage(self, self.total, mask)
+        return KeywordUsage(self, self.membership[:, mask] @ self.usage[mask], mask)
+
+class KeywordUsageIndex:
+    """
+    KeywordCoUsage of the current data version. The aggregation is queried and indexed
+    once per version; callbacks only slice the matrices.
+    """
+    def __init__(self, loader, version_source):
+        self.loader = loader
+        self.version_source = version_source
+        self.co_usage = None
+        self.version = None
+        self.lock = threading.Lock()
+
+    def current(self):
+        version = self.version_source()
+        co_usage = self.co_usage
+        if co_usage is not None and version == self.version:
+            return co_usage
+
+        with self.lock:
+            if self.co_usage is None or version != self.version:
+                rows = self.loader()
+                if rows.empty:
+                    # Query failed (or no data yet): keep the previous version and retry next call
+                    return self.co_usage if self.co_usage is not None else KeywordCoUsage(rows)
+                self.co_usage = KeywordCoUsage(rows)
+                self.version = version
+                print(f"Keyword co-usage index built: {len(self.co_usage.keywords)} keywords, "
+                      f"{len(self.co_usage.programs)} programs (data version {version})")
+            return self.co_usage
+
+    def select(self, start_year=None, end_year=None, colleges=None):
+        return self.current().select(start_year, end_year, colleges)
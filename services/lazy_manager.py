@@ -0,0 +1,77 @@
+import threading
+import time
+
+class LazyManager:
+    """
+    Stand-in for a data manager that is built in a background thread.
+
+    Construction returns immediately and loading starts right away. Attribute access
+    is forwarded to the built instance and blocks until it is ready, so code paths that
+    must not block should check is_ready() or register with when_ready() instead.
+    A failed build is retried every retry_interval seconds.
+    """
+    def __init__(self, factory, name, retry_interval=30):
+        self.factory = factory
+        self.name = name
+        self.retry_interval = retry_interval
+        self.instance = None
+        self.ready_event = threading.Event()
+        self.lock = threading.Lock()
+        self.callbacks = []
+
+        self.thread = threading.Thread(target=self.load, name=f'{name}-loader', daemon=True)
+        self.thread.start()
+
+    def load(self):
+        started = time.monotonic()
+        while True:
+            try:
+                instance = self.factory()
+                break
+            except Exception as e:
+                print(f"Error loading {self.name}, retrying in {self.retry_interval}s: {e}")
+                time.sleep(self.retry_interval)
+
+        with self.lock:
+            self.instance = instance
+            callbacks, self.callbacks = self.callbacks, []
+        self.ready_event.set()
+        print(f"{self.name} ready after {time.monotonic() - started:.1f}s")
+
+        for callback in callbacks:
+            self.run_callback(callback)
+
+    def run_callback(self, callback):
+        try:
+            callback()
+        except Exception as e:
+            print(f"Error in {self.name} ready callback: {e}")
+
+    def is_ready(self):
+        return self.ready_event.is_set()
+
+    def when_ready(self, callback):
+        """Run callback once loaded (immediately if already loaded)."""
+        with self.lock:
+            if self.instance is None:
+                self.callbacks.append(callback)
+                return
+        self.run_callback(callback)
+
+    def wait(self, timeout=None):
+        if not self.ready_event.wait(timeout):
+            raise TimeoutError(f"{self.name} is still loading")
+        return self.instance
+
+    def __getattr__(self, name):
+        # Only called for attributes not defined on the proxy itself
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.wait(), name)
+
+def when_all_ready(managers, callback):
+    """Run callback once every manager in the list has loaded."""
+    if not managers:
+        callback()
+        return
+    managers[0].when_ready(lambda: when_all_ready(managers[1:], callback))
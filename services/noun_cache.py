@@ -0,0 +1,53 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+# Bump when the noun extraction logic changes so stale entries are ignored
+EXTRACTOR_VERSION = 1
+
+class NounCache:
+    """
+    Persistent SQLite cache of top_nouns results keyed by a hash of the combined text.
+
+    The key also covers the stop-word set and extractor version, so changing either one
+    simply misses the old entries instead of returning stale nouns.
+    """
+    def __init__(self, path, stop_words):
+        self.path = path
+        self.stop_words_version = hashlib.sha1('\n'.join(sorted(stop_words)).encode('utf-8')).hexdigest()[:12]
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS top_nouns (key TEXT PRIMARY KEY, nouns TEXT NOT NULL)')
+            self.conn.commit()
+
+    def make_key(self, text, top_n):
+        raw = f'{EXTRACTOR_VERSION}:{self.stop_words_version}:{top_n}:{text}'
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get_many(self, keys, chunk_size=500):
+        """Return {key: nouns} for the keys that are cached."""
+        keys = list(keys)
+        found = {}
+        with self.lock:
+            # SQLite limits the number of bound parameters per statement
+            for i in range(0, len(keys), chunk_size):
+                chunk = keys[i:i + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self.conn.execute(f'SELECT key, nouns FROM top_nouns WHERE key IN ({placeholders})', chunk)
+                found.update({key: json.loads(nouns) for key, nouns in rows})
+        return found
+
+    def put_many(self, items):
+        """Store {key: nouns} entries."""
+        with self.lock:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO top_nouns (key, nouns) VALUES (?, ?)',
+                [(key, json.dumps(nouns)) for key, nouns in items.items()]
+            )
+            self.conn.commit()
@@ -0,0 +1,74 @@
+import multiprocessing
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from nltk.tokenize import word_tokenize
+from nltk.tag.perceptron import PerceptronTagger
+
+NOUN_TAGS = {'NN', 'NNS', 'NNP', 'NNPS'}
+
+# Per-process state, loaded once by init_worker (or lazily in the parent process)
+worker_tagger = None
+worker_stop_words = None
+
+def init_worker(stop_words):
+    """Load the perceptron tagger once per worker process."""
+    global worker_tagger, worker_stop_words
+    worker_tagger = PerceptronTagger()
+    worker_stop_words = stop_words
+
+def top_nouns(text, stop_words, top_n=10, tagger=None):
+    # Remove punctuation using regex
+    text = re.sub(r'[^\w\s]', '', text)  # This removes punctuation (e.g. % / \ < > etc.)
+
+    # Tokenize the text
+    words = word_tokenize(text.lower())  # Tokenize and convert to lowercase
+
+    # Remove stopwords and words with less than 3 letters
+    words = [word for word in words if word not in stop_words and len(word) >= 3]
+
+    # Get part-of-speech tags for the words
+    pos_tags = (tagger or PerceptronTagger()).tag(words)
+
+    # Filter for nouns (NN, NNS, NNP, NNPS)
+    nouns = [word for word, tag in pos_tags if tag in NOUN_TAGS]
+
+    # Count the occurrences of the nouns and keep the top n
+    return [word for word, _ in Counter(nouns).most_common(top_n)]
+
+def extract_chunk(texts, top_n):
+    """Worker entry point: extract top nouns for one chunk of texts."""
+    return [top_nouns(text, worker_stop_words, top_n, worker_tagger) for text in texts]
+
+class NounExtractor:
+    """
+    Batch top-noun extraction sharded across a ProcessPoolExecutor.
+
+    Batches smaller than one chunk (or workers <= 1) run in-process so that
+    incremental refreshes do not pay the cost of starting a pool.
+
+    The pool is started from the snapshot loader thread, so its workers are spawned
+    (fresh interpreters) rather than forked: a fork would copy locks held by the other
+    threads. Spawned workers re-import the main module, so the pool is only meant for
+    gunicorn, whose main module does nothing on import, not for `python server.py`.
+    """
+    def __init__(self, stop_words, workers=1, chunk_size=200):
+        self.stop_words = stop_words
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.tagger = None
+
+    def extract(self, texts, top_n=10):
+        texts = list(texts)
+        if self.workers == 1 or len(texts) <= self.chunk_size:
+            if self.tagger is None:
+                self.tagger = PerceptronTagger()
+            return [top_nouns(text, self.stop_words, top_n, self.tagger) for text in texts]
+
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        workers = min(self.workers, len(chunks))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=init_worker, initargs=(self.stop_words,)) as pool:
+            results = pool.map(extract_chunk, chunks, repeat(top_n))
+            return [nouns for chunk in results for nouns in chunk]
@@ -0,0 +1,152 @@
+import json
+import os
+import time
+from datetime import datetime
+import pandas as pd
+from services.frame_schema import apply_layout
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional, without it every worker builds its own frame
+    pa = None
+
+try:
+    import fcntl
+except ImportError:  # Windows, no writer lock so the store is unavailable
+    fcntl = None
+
+class SharedSnapshotStore:
+    """
+    Dashboard snapshots shared by all worker processes through Arrow IPC files.
+
+    One worker (the holder of the writer lock) builds the frame and publishes it as
+    snapshot-v<version>.arrow, then atomically renames a CURRENT pointer file onto it.
+    The other workers memory-map the published file read-only; string and list columns
+    stay backed by the mapped file, so N workers share one copy in the page cache.
+    write() returns the frame as the readers will see it and the writer adopts that
+    frame, so every worker runs the dashboards on identical dtypes.
+
+    Needs pyarrow and fcntl (POSIX file locks); without a lock every process would act
+    as the writer, so the store is unavailable there.
+    """
+    POINTER = 'CURRENT'
+    KEEP_FILES = 3
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.lock_file = None
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def available(cls):
+        return pa is not None and fcntl is not None
+
+    def acquire_writer(self):
+        """Try to become the single writer for this directory (held for the process lifetime)."""
+        if self.lock_file is not None:
+            return True
+
+        lock_file = open(os.path.join(self.directory, 'writer.lock'), 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        self.lock_file = lock_file
+        return True
+
+    def current_version(self):
+        try:
+            with open(os.path.join(self.directory, self.POINTER)) as f:
+                return json.load(f)['version']
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def write(self, df, version, watermark):
+        """Publish df as the given version and return it as the readers load it."""
+        file_name = f'snapshot-v{version}.arrow'
+        path = os.path.join(self.directory, file_name)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+
+        table = pa.Table.from_pandas(apply_layout(df), preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b'watermark': json.dumps(serialize_watermark(watermark)).encode('utf-8')
+        })
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+        # Swap the pointer atomically so readers never see a half-written snapshot
+        pointer_tmp = os.path.join(self.directory, f'{self.POINTER}.{os.getpid()}.tmp')
+        with open(pointer_tmp, 'w') as f:
+            json.dump({'version': version, 'file': file_name}, f)
+        os.replace(pointer_tmp, os.path.join(self.directory, self.POINTER))
+
+        self.cleanup(version)
+        return self.load(file_name)[0]
+
+    def read(self, newer_than=0):
+        """Return (df, version, watermark) of the published snapshot, or None if there is none newer."""
+        try:
+            with open(os.path.join(self.directory, self.POINTER)) as f:
+                pointer = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if pointer['version'] <= newer_than:
+            return None
+
+        df, watermark = self.load(pointer['file'])
+        return df, pointer['version'], watermark
+
+    def load(self, file_name):
+        """Memory-map a snapshot file; returns (df, watermark) with the compact dtypes restored."""
+        source = pa.memory_map(os.path.join(self.directory, file_name), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        df = apply_layout(table.to_pandas(types_mapper=arrow_backed_types))
+
+        metadata = table.schema.metadata or {}
+        watermark = parse_watermark(json.loads(metadata[b'watermark'])) if b'watermark' in metadata else None
+        return df, watermark
+
+    def wait_for_snapshot(self, timeout):
+        """Wait for the writer to publish a first snapshot."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            published = self.read()
+            if published is not None:
+                return published
+            time.sleep(1)
+        return None
+
+    def cleanup(self, version):
+        # Older files can be unlinked safely, readers that still map them keep their pages
+        for file_name in os.listdir(self.directory):
+            if file_name.startswith('snapshot-v') and file_name.endswith('.arrow'):
+                file_version = int(file_name[len('snapshot-v'):-len('.arrow')])
+                if file_version <= version - self.KEEP_FILES:
+                    try:
+                        os.remove(os.path.join(self.directory, file_name))
+                    except OSError:
+                        pass
+
+def arrow_backed_types(arrow_type):
+    """Keep strings and lists in Arrow memory (zero-copy from the mapped file)."""
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type) or pa.types.is_list(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+def serialize_watermark(watermark):
+    if watermark is None:
+        return None
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in watermark.items()}
+
+def parse_watermark(data):
+    if data is None:
+        return None
+    return {
+        key: datetime.fromisoformat(value) if isinstance(value, str) else value
+        for key, value in data.items()
+    }
@@ -0,0 +1,121 @@
+import threading
+from datetime import datetime
+
+class DataSnapshot:
+    """A versioned, read-only view of the dashboard dataset."""
+    def __init__(self, version, df, watermark=None):
+        self.version = version
+        self.df = df
+        self.watermark = watermark
+        self.created_at = datetime.now()
+
+class SnapshotRefresher:
+    """
+    Refreshes a DatabaseManager in one background thread per process and publishes
+    each result as a new DataSnapshot.
+
+    Dashboard callbacks only read current(); they never query the database themselves.
+    Refreshes are single-flight: a refresh requested while another one is running
+    returns the current snapshot instead of starting a second query.
+
+    With a SharedSnapshotStore only the worker holding the writer lock queries the
+    database; the other workers load each version the writer publishes.
+    """
+    def __init__(self, manager, interval=30, store=None, wait_timeout=120):
+        self.manager = manager
+        self.interval = interval
+        self.store = store
+        self.refresh_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        if manager.df is None:
+            self.load_initial(wait_timeout)
+        self.snapshot = DataSnapshot(self.initial_version, manager.df, manager.watermark)
+
+    def load_initial(self, wait_timeout):
+        """Load the first frame, from the shared store when another worker already built it."""
+        self.initial_version = 1
+        published = None
+        if self.store is not None:
+            published = self.store.read()
+            if published is None and not self.store.acquire_writer():
+                published = self.store.wait_for_snapshot(wait_timeout)
+
+        if published is not None:
+            df, self.initial_version, watermark = published
+            self.manager.set_frame(df, watermark)
+            return
+
+        self.manager.get_all_data()
+        if self.store is not None and self.store.acquire_writer():
+            self.initial_version = self.store.current_version() + 1
+            self.publish(self.initial_version)
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='snapshot-refresher', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing dashboard snapshot: {e}")
+
+    def refresh(self):
+        """Refresh the manager and swap in a new snapshot if anything changed."""
+        if not self.refresh_lock.acquire(blocking=False):
+            return self.snapshot  # another refresh is already in flight
+
+        try:
+            if self.store is not None and not self.store.acquire_writer():
+                self.load_published()
+            else:
+                self.refresh_from_database()
+        finally:
+            self.refresh_lock.release()
+
+        return self.snapshot
+
+    def refresh_from_database(self):
+        changed_ids = self.manager.refresh_data()
+        if not changed_ids:
+            return
+
+        version = self.snapshot.version + 1
+        if self.store is not None:
+            version = max(version, self.store.current_version() + 1)
+            self.publish(version)
+
+        # Swapping the reference is atomic, readers see either the old or the new snapshot
+        self.snapshot = DataSnapshot(version, self.manager.df, self.manager.watermark)
+        print(f"Dashboard snapshot v{version}: {len(changed_ids)} research output(s) refreshed")
+
+    def publish(self, version):
+        """Write the manager's frame to the shared store and adopt the published copy."""
+        watermark = self.manager.watermark
+        df = self.store.write(self.manager.df, version, watermark)
+        self.manager.set_frame(df, watermark)
+
+    def load_published(self):
+        published = self.store.read(newer_than=self.snapshot.version)
+        if published is None:
+            return
+
+        df, version, watermark = published
+        self.manager.set_frame(df, watermark)
+        self.snapshot = DataSnapshot(version, df, watermark)
+
+    def current(self):
+        return self.snapshot
+
+    @property
+    def version(self):
+        return self.snapshot.version
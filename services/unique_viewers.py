@@ -0,0 +1,157 @@
+import threading
+import uuid
+from datetime import datetime, time, timedelta
+import pytz
+from sqlalchemy import create_engine, func, select
+from models.user_engagement import UserEngagement
+from models.research_outputs import ResearchOutput
+
+class UniqueViewers:
+    """
+    Approximate unique-viewer counts from Redis HyperLogLog sketches.
+
+    Every engagement event adds its user_id to one sketch per day for the paper, its
+    college and the whole repository. A unique-viewer count for any date range and set of
+    papers or colleges is a PFCOUNT over the union of the matching daily sketches
+    (about 0.81% standard error) instead of a COUNT(DISTINCT user_id) over raw rows.
+
+    Sketches expire retention_days after their day, which must cover the longest date
+    range the dashboard offers; count() returns None for ranges reaching further back.
+
+    Sketches for events recorded before this existed are built once by backfill();
+    count() returns None until then (or when Redis is unavailable) so callers can fall
+    back to their SQL query.
+    """
+    KEY_PREFIX = 'engagement:uv:'
+    BACKFILL_KEY = 'engagement:uv:backfilled:v2'  # v2: sketches expire
+    MERGE_CHUNK = 500  # keys per PFMERGE when a range spans many sketches
+
+    def __init__(self, redis_client, database_uri, retention_days=190):
+        self.redis_client = redis_client
+        self.engine = create_engine(database_uri)
+        self.retention_days = retention_days
+        self.thread = None
+
+    def paper_key(self, research_id, day):
+        return f'{self.KEY_PREFIX}paper:{research_id}:{day.isoformat()}'
+
+    def college_key(self, college_id, day):
+        return f'{self.KEY_PREFIX}college:{college_id}:{day.isoformat()}'
+
+    def all_key(self, day):
+        return f'{self.KEY_PREFIX}all:{day.isoformat()}'
+
+    def today(self):
+        return datetime.now(pytz.timezone('Asia/Manila')).date()
+
+    def add(self, research_id, college_id, user_id, day=None, pipe=None):
+        """Record user_id as a viewer of research_id on day (today in Asia/Manila by default)."""
+        day = day or self.today()
+        expires = datetime.combine(day + timedelta(days=self.retention_days + 1), time())
+        try:
+            target = pipe if pipe is not None else self.redis_client.pipeline(transaction=False)
+            for key in (self.paper_key(research_id, day), self.college_key(college_id, day), self.all_key(day)):
+                target.pfadd(key, user_id)
+                target.expireat(key, expires)
+            if pipe is None:
+                target.execute()
+        except Exception as e:
+            print(f"Error recording unique viewer: {e}")
+
+    def is_ready(self):
+        try:
+            return self.redis_client.get(self.BACKFILL_KEY) == 'done'
+        except Exception:
+            return False
+
+    def count(self, start_date, end_date, college_ids=None, research_ids=None):
+        """
+        Unique viewers between start_date and end_date (inclusive), optionally restricted
+        to research_ids or college_ids (an empty college_ids means all colleges, as in the
+        engagement cube). Returns None when the sketches cannot be used.
+        """
+        if not self.is_ready() or start_date < self.today() - timedelta(days=self.retention_days):
+            return None
+
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        if research_ids is not None:
+            keys = [self.paper_key(research_id, day) for research_id in research_ids for day in days]
+        elif college_ids:
+            keys = [self.college_key(college_id, day) for college_id in college_ids for day in days]
+        else:
+            keys = [self.all_key(day) for day in days]
+
+        if not keys:
+            return 0
+
+        try:
+            if len(keys) <= self.MERGE_CHUNK:
+                return self.redis_client.pfcount(*keys)
+
+            # Fold long key lists into a temporary sketch chunk by chunk
+            merged_key = f'{self.KEY_PREFIX}tmp:{uuid.uuid4().hex}'
+            pipe = self.redis_client.pipeline()
+            for i in range(0, len(keys), self.MERGE_CHUNK):
+                pipe.pfmerge(merged_key, *keys[i:i + self.MERGE_CHUNK])
+            pipe.pfcount(merged_key)
+            pipe.delete(merged_key)
+            return pipe.execute()[-2]
+        except Exception as e:
+            print(f"Error counting unique viewers: {e}")
+            return None
+
+    def expire_existing(self):
+        """Set the expiry of sketches written without one (days already past retention are deleted)."""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in self.redis_client.scan_iter(match=f'{self.KEY_PREFIX}*:????-??-??', count=1000):
+            day = datetime.strptime(key.rsplit(':', 1)[1], '%Y-%m-%d').date()
+            pipe.expireat(key, datetime.combine(day + timedelta(days=self.retention_days + 1), time()))
+            if len(pipe) >= 1000:
+                pipe.execute()
+        pipe.execute()
+
+    def start(self):
+        """Build the historical sketches in the background (once per Redis database)."""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self.backfill, name='unique-viewers-backfill', daemon=True)
+        self.thread.start()
+
+    def backfill(self, chunk_size=5000):
+        try:
+            # Only one worker backfills; a stale 'running' marker expires after an hour
+            if not self.redis_client.set(self.BACKFILL_KEY, 'running', nx=True, ex=3600):
+                return
+
+            query = select(
+                UserEngagement.research_id,
+                ResearchOutput.college_id,
+                func.date(UserEngagement.timestamp),
+                UserEngagement.user_id
+            ).join(ResearchOutput, UserEngagement.research_id == ResearchOutput.research_id) \
+                .where(UserEngagement.timestamp >= self.today() - timedelta(days=self.retention_days)) \
+                .distinct()
+
+            self.expire_existing()
+
+            added = 0
+            with self.engine.connect() as conn:
+                result = conn.execution_options(stream_results=True).execute(query)
+                while True:
+                    rows = result.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    for research_id, college_id, day, user_id in rows:
+                        self.add(research_id, college_id, user_id, day=day, pipe=pipe)
+                    pipe.execute()
+                    added += len(rows)
+
+            self.redis_client.set(self.BACKFILL_KEY, 'done')
+            print(f"Unique viewer sketches backfilled from {added} engagement rows")
+        except Exception as e:
+            print(f"Error backfilling unique viewer sketches: {e}")
+            try:
+                self.redis_client.delete(self.BACKFILL_KEY)
+            except Exception:
+                pass
@@ -1,11 +1,38 @@
 import pandas as pd
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine, func, desc
-from models import College, Program, ResearchOutput, Publication, Status, Conference, ResearchOutputAuthor, Account, UserProfile, Keywords, SDG, ResearchArea, ResearchOutputArea, ResearchTypes, PublicationFormat, UserEngagement
+from models import College, Program, ResearchOutput, Publication, Status, Conference, ResearchOutputAuthor, Account, UserProfile, Keywords, SDG, ResearchArea, ResearchOutputArea, ResearchTypes, PublicationFormat, UserEngagement, UserEngagementDaily
 from services.data_fetcher import ResearchDataFetcher
+from services.frame_loader import read_query_frame, fill_defaults, year_of
+from config import Config
 from collections import Counter
 import re
 
+# Values used where the query returned NULL
+ENGAGEMENT_DEFAULTS = {
+    'total_views': 0,
+    'total_unique_views': 0,
+    'total_downloads': 0,
+    'college_id': 'Unknown',
+    'program_name': 'N/A',
+    'concatenated_sdg': 'Not Specified',
+    'title': 'Untitled',
+    'research_type_name': 'Unknown Type',
+    'concatenated_authors': 'Unknown Authors',
+    'concatenated_keywords': 'No Keywords',
+    'publication_name': 'unpublished',
+    'pub_format_name': 'unpublished',
+    'status': 'READY',
+    'concatenated_areas': 'No Research Areas'
+}
+
+# Column order of the engagement frame
+ENGAGEMENT_COLUMNS = ['research_id', 'date', 'total_views', 'total_unique_views', 'total_downloads',
+                      'college_id', 'program_id', 'program_name', 'concatenated_sdg', 'title',
+                      'year', 'term', 'research_type_name', 'concatenated_authors', 'concatenated_keywords',
+                      'publication_name', 'pub_format_name', 'date_published', 'published_year', 'status',
+                      'concatenated_areas']
+
 class UserEngagementManager:
     def __init__(self, database_uri):
         self.engine = create_engine(database_uri)
@@ -66,15 +93,13 @@ class UserEngagementManager:
             ).join(ResearchArea, ResearchOutputArea.research_area_id == ResearchArea.research_area_id) \
             .group_by(ResearchOutputArea.research_id).subquery()
 
+            # Daily per-paper engagement from the rollup (see services/engagement_rollup.py)
             agg_user_engage = session.query(
-                UserEngagement.research_id,
-                func.date(UserEngagement.timestamp).label('date'),  # Ensure 'date' is explicitly labeled
-                func.sum(UserEngagement.view).label('total_views'),
-                func.count(func.distinct(UserEngagement.user_id)).label('total_unique_views'),
-                func.sum(UserEngagement.download).label('total_downloads')
-            ).group_by(
-                UserEngagement.research_id,
-                func.date(UserEngagement.timestamp)
+                UserEngagementDaily.research_id,
+                UserEngagementDaily.day.label('date'),  # Ensure 'date' is explicitly labeled
+                UserEngagementDaily.total_views,
+                UserEngagementDaily.unique_views.label('total_unique_views'),
+                UserEngagementDaily.total_downloads
             ).subquery()
 
 
@@ -113,55 +138,22 @@ class UserEngagementManager:
                 .outerjoin(PublicationFormat, Publication.pub_format_id == PublicationFormat.pub_format_id) \
                 .distinct()
 
-            result = query.all()
+            df = read_query_frame(session, query, Config.QUERY_CHUNK_SIZE)
 
             # Add this check for empty results
-            if not result:
+            if df.empty:
                 print("Warning: UserEngagementManager query returned no results. Creating empty DataFrame.")
-                # Create an empty DataFrame with all expected columns
-                columns = ['research_id', 'date', 'total_views', 'total_unique_views', 'total_downloads',
-                          'college_id', 'program_id', 'program_name', 'concatenated_sdg', 'title',
-                          'year', 'term', 'research_type_name', 'concatenated_authors', 'concatenated_keywords',
-                          'publication_name', 'pub_format_name', 'date_published', 'published_year', 'status',
-                          'concatenated_areas']
-                
-                self.df = pd.DataFrame(columns=columns)
-                return self.df
-
-            # Formatting results into a list of dictionaries with safe handling for missing data
-            data = [{
-                'research_id': row.research_id if pd.notnull(row.research_id) else 'Unknown',
-                'date': row.date if pd.notnull(row.date) else None,
-                'total_views': row.total_views if pd.notnull(row.total_views) else 0,
-                'total_unique_views': row.total_unique_views if pd.notnull(row.total_unique_views) else 0,
-                'total_downloads': row.total_downloads if pd.notnull(row.total_downloads) else 0,
-                'college_id': row.college_id if pd.notnull(row.college_id) else 'Unknown',
-                'program_id': row.program_id if pd.notnull(row.program_id) else None,
-                'program_name': row.program_name if pd.notnull(row.program_name) else 'N/A',
-                'concatenated_sdg': row.concatenated_sdg if pd.notnull(row.concatenated_sdg) else 'Not Specified',
-                'title': row.title if pd.notnull(row.title) else 'Untitled',
-                'year': row.school_year if pd.notnull(row.school_year) else None,
-                'term': row.term if pd.notnull(row.term) else None,
-                'research_type_name': row.research_type_name if pd.notnull(row.research_type_name) else 'Unknown Type',
-                'concatenated_authors': row.concatenated_authors if pd.notnull(row.concatenated_authors) else 'Unknown Authors',
-                'concatenated_keywords': row.concatenated_keywords if pd.notnull(row.concatenated_keywords) else 'No Keywords',
-                'publication_name': row.publication_name if pd.notnull(row.publication_name) else 'unpublished',
-                'pub_format_name': row.pub_format_name if pd.notnull(row.pub_format_name) else 'unpublished',
-                'date_published': row.date_published,
-                'published_year': int(row.date_published.year) if pd.notnull(row.date_published) else None,
-                'status': row.status if pd.notnull(row.status) else "READY",
-                'concatenated_areas': row.concatenated_areas if pd.notnull(row.concatenated_areas) else 'No Research Areas',
-            } for row in result]
-
-
-            # Convert the list of dictionaries to a DataFrame
-            self.df = pd.DataFrame(data)
-            # Assuming self.df is your DataFrame
-            self.df = self.df.dropna(subset=['research_id'])  # Drops rows where 'research_id' is NaN or None
-            self.df = self.df[self.df['research_id'] != 'Unknown']  # Drops rows where 'research_id' is 'Unknown'
+
+            # Safe handling for missing data, applied column by column
+            df = df.rename(columns={'school_year': 'year'})
+            df['published_year'] = year_of(df['date_published'])
+            df = fill_defaults(df, ENGAGEMENT_DEFAULTS)[ENGAGEMENT_COLUMNS]
+
+            # Drop rows without a research_id
+            df = df[df['research_id'].notna() & (df['research_id'] != 'Unknown')]
 
             # Optional: Reset index if needed
-            self.df = self.df.reset_index(drop=True)
+            self.df = df.reset_index(drop=True)
 
         finally:
             session.close()